@@ -0,0 +1,381 @@
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# Benchmark suite for xolana.py. Every command path runs in-process against
+# the local mock validator (mock_xolana.py) at increasing data sizes, with
+# optional injected latency and errors. Each run is saved as JSON under
+# bench_results/ so results can be compared between versions.
+#
+#   python bench_xolana.py                          # all benchmarks, sizes 1..100k
+#   python bench_xolana.py --bench scan --bench validators --sizes 1000,100000
+#   python bench_xolana.py --latency 20 --jitter 10 --error-rate 0.01
+#   python bench_xolana.py --compare latest         # show change against the previous run
+
+DEFAULT_SIZES = (1, 10, 100, 1000, 10000, 100000)
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_results")
+# Sizes above these take minutes (confirmation polling, or one command per
+# item); --full lifts them
+SIZE_LIMITS = {"payout": 10000, "balance-table": 10000, "tx": 10000, "send": 1000, "details": 1000, "probe": 10000}
+
+# Set up on first use, after HOME points at the scratch directory, so that
+# caches and indexes of earlier runs never leak into a measurement
+xolana = None
+workdir = None
+
+def mock_pubkey(kind, i):
+    from mock_xolana import mock_pubkey
+    return mock_pubkey(kind, i)
+
+def write_lines(name, lines):
+    path = os.path.join(workdir, name)
+    with open(path, "w") as outfile:
+        outfile.writelines(f"{line}\n" for line in lines)
+    return path
+
+def configure_mock(**settings):
+    response_json = xolana.rpc_client.request("mock_configure", [settings])
+    if "error" in response_json:
+        raise RuntimeError(f"Endpoint is not the mock validator: {response_json['error']}")
+
+# Run a subcommand the way the CLI would, with its output discarded
+def run_command(argv):
+    args = xolana.parse_args(argv)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+        return args.func(args)
+
+# Each benchmark prepares its inputs for `size` (untimed) and returns a
+# callable for the timed part, which returns the command's exit status
+
+def bench_balance(size):
+    addresses = [mock_pubkey("address", i) for i in range(size)]
+    return lambda: run_command(["balance", *addresses, "--json"])
+
+# The table view, which also lists recent signatures (getConfirmedSignaturesForAddress2)
+def bench_balance_table(size):
+    addresses = [mock_pubkey("address", i) for i in range(size)]
+    return lambda: run_command(["balance", *addresses])
+
+def bench_scan(size):
+    path = write_lines("addresses.txt", (mock_pubkey("address", i) for i in range(size)))
+    output = os.path.join(workdir, "scan.csv")
+    return lambda: run_command(["scan", path, "--output", output])
+
+def bench_history(size):
+    configure_mock(size=size)
+    address = mock_pubkey("history-address", time.monotonic_ns())  # fresh address: a full sync every run
+    return lambda: run_command(["history", "sync", address])
+
+def bench_txcache(size):
+    from mock_xolana import mock_signature
+    path = write_lines("signatures.txt", (mock_signature("bench", i) for i in range(size)))
+    run_command(["txcache", "clear"])
+    return lambda: run_command(["txcache", "prefetch", path])
+
+# One `tx` command per signature, table view, starting from an empty cache
+def bench_tx(size):
+    from mock_xolana import mock_signature
+    signatures = [mock_signature("bench-tx", i) for i in range(size)]
+    run_command(["txcache", "clear"])
+
+    def run():
+        return max(run_command(["tx", signature]) for signature in signatures)
+    return run
+
+def bench_validators(size):
+    configure_mock(size=size)
+    return lambda: run_command(["validators", "--json"])
+
+def bench_gossip(size):
+    configure_mock(size=size)
+    return lambda: run_command(["gossip", "--json"])
+
+# Fixed fee payer / stake authority, written to the scratch directory
+def bench_keypair():
+    from solders.keypair import Keypair
+    keypair = Keypair.from_seed(hashlib.sha256(b"bench payer").digest())
+    keypair_path = os.path.join(workdir, "payer.json")
+    with open(keypair_path, "w") as keypair_file:
+        json.dump(list(bytes(keypair)), keypair_file)
+    return keypair, keypair_path
+
+# One `send` per recipient, each waiting for confirmation
+def bench_send(size):
+    _, keypair_path = bench_keypair()
+    recipients = [mock_pubkey("recipient", i) for i in range(size)]
+
+    def run():
+        return max(run_command(["send", recipient, "0.000001", "--keypair", keypair_path, "--json"])
+                   for recipient in recipients)
+    return run
+
+def bench_payout(size):
+    _, keypair_path = bench_keypair()
+    path = write_lines("payouts.csv", (f"{mock_pubkey('payee', i)},0.000001" for i in range(size)))
+    journal = os.path.join(workdir, "payouts.journal")
+    if os.path.exists(journal):
+        os.remove(journal)
+    return lambda: run_command(["payout", path, "--keypair", keypair_path, "--journal", journal, "--skip-preflight"])
+
+def bench_stake(size):
+    keypair, keypair_path = bench_keypair()
+    configure_mock(size=size, stake_authority=str(keypair.pubkey()))
+    validators = [arg for i in range(min(size, 4)) for arg in ("--validator", mock_pubkey("vote", i))]
+    return lambda: run_command(["stake", "rebalance", *validators, "--keypair", keypair_path, "--json"])
+
+def bench_monitor(size):
+    configure_mock(size=size)
+
+    def run():
+        async def consume():
+            stats = xolana.LogStreamStats()
+            stream = asyncio.create_task(xolana.stream_logs(
+                xolana.ws_url_for(xolana.rpc_client.url), stats, lambda entry: None))
+            try:
+                while stats.transactions < size and not stream.done():
+                    await asyncio.sleep(0.005)
+            finally:
+                stream.cancel()
+                await asyncio.gather(stream, return_exceptions=True)
+            return 0 if stats.transactions >= size else 1
+        return asyncio.run(consume())
+    return run
+
+# `details` run `size` times in a row, as --watch refreshes it
+def bench_details(size):
+    def run():
+        return max(run_command(["details", "--no-wallet", "--json"]) for _ in range(size))
+    return run
+
+def bench_probe(size):
+    return lambda: run_command(["probe", "--mode", "rpc", "--count", str(size), "--concurrency", "16", "--json"])
+
+# The mock streams slots in real time (one per 400 ms), so this measures the
+# telemetry windows instead: `size` slot and root notifications, with an
+# export row every 100 slots
+def bench_telemetry(size):
+    def run():
+        telemetry = xolana.NetworkTelemetry()
+        now = time.monotonic()
+        for slot in range(size):
+            telemetry.on_slot(slot + 32, now + slot * 0.4)
+            telemetry.on_root(slot, now + slot * 0.4)
+            if slot % 100 == 0:
+                telemetry.snapshot()
+        return 0 if telemetry.notifications == 2 * size else 1
+    return run
+
+BENCHMARKS = {
+    "balance": (bench_balance, "addresses"),
+    "balance-table": (bench_balance_table, "addresses"),
+    "scan": (bench_scan, "addresses"),
+    "history": (bench_history, "signatures"),
+    "tx": (bench_tx, "transactions"),
+    "txcache": (bench_txcache, "transactions"),
+    "validators": (bench_validators, "validators"),
+    "gossip": (bench_gossip, "nodes"),
+    "details": (bench_details, "refreshes"),
+    "probe": (bench_probe, "probes"),
+    "send": (bench_send, "transfers"),
+    "payout": (bench_payout, "payouts"),
+    "stake": (bench_stake, "stake accounts"),
+    "monitor": (bench_monitor, "log messages"),
+    "telemetry": (bench_telemetry, "slots"),
+}
+
+# Per-method RPC latency of the last run, from xolana's instrumentation
+def rpc_breakdown():
+    breakdown = {}
+    for method, stats in xolana.metrics.rpc_totals().items():
+        if method == "mock_configure" or not stats.calls:
+            continue
+        breakdown[method] = {
+            "calls": stats.calls,
+            "p50_ms": stats.histogram.percentile(50) * 1000,
+            "p99_ms": stats.histogram.percentile(99) * 1000,
+            "errors": sum(stats.errors.values()),
+            "kb_in": stats.bytes_in / 1024,
+        }
+    return breakdown
+
+def run_benchmark(name, size, repeat, timeout):
+    prepare, unit = BENCHMARKS[name]
+    samples = []
+    record = {"bench": name, "size": size, "unit": unit}
+    for _ in range(repeat):
+        run = prepare(size)
+        xolana.rpc_client.cache.clear()  # Measure cold runs; repeats would otherwise hit the RPC cache
+        xolana.metrics = xolana.Metrics()
+        start = time.perf_counter()
+        try:
+            status = run()
+        except Exception as e:
+            record.update(status=None, error=f"{type(e).__name__}: {e}")
+            break
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed)
+        record.update(status=status, rpc=rpc_breakdown())
+        if elapsed > timeout:
+            break
+    if samples:
+        record["seconds"] = min(samples)
+        record["samples"] = samples
+        record["throughput"] = size / record["seconds"] if record["seconds"] else None
+    return record
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def load_previous(compare):
+    if compare != "latest":
+        with open(compare, "r") as infile:
+            return json.load(infile)
+    runs = sorted(name for name in os.listdir(RESULTS_DIR) if name.endswith(".json")) if os.path.isdir(RESULTS_DIR) else []
+    if not runs:
+        return None
+    with open(os.path.join(RESULTS_DIR, runs[-1]), "r") as infile:
+        return json.load(infile)
+
+def render_results(results, previous=None):
+    from rich.console import Console
+    from rich.table import Table
+    from rich import box
+
+    baseline = {}
+    if previous:
+        baseline = {(r["bench"], r["size"]): r for r in previous["results"] if r.get("seconds")}
+
+    table = Table(title="Benchmark Results", box=box.ROUNDED, border_style="green")
+    table.add_column("Benchmark", style="bold cyan")
+    table.add_column("Size", justify="right")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Items/s", justify="right")
+    table.add_column("RPC p99 ms", justify="right")
+    table.add_column("Status")
+    if previous:
+        table.add_column(f"vs {previous['meta'].get('revision') or 'previous'}", justify="right")
+    for record in results:
+        rpc = record.get("rpc") or {}
+        slowest = max((stats["p99_ms"] for stats in rpc.values()), default=None)
+        row = [
+            record["bench"],
+            f"{record['size']:,}",
+            f"{record['seconds']:.3f}" if record.get("seconds") is not None else "-",
+            f"{record['throughput']:,.0f}" if record.get("throughput") else "-",
+            f"{slowest:.1f}" if slowest is not None else "-",
+            "ok" if record.get("status") == 0 else f"[bold red]{record.get('error') or 'exit ' + str(record.get('status'))}[/bold red]",
+        ]
+        if previous:
+            before = baseline.get((record["bench"], record["size"]))
+            if before and record.get("seconds"):
+                change = (before["seconds"] / record["seconds"] - 1) * 100
+                row.append(f"[{'green' if change >= 0 else 'red'}]{change:+.0f}%[/]")
+            else:
+                row.append("-")
+        table.add_row(*row)
+    Console().print(table)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark xolana.py command paths against a local mock validator.")
+    parser.add_argument("--bench", action="append", choices=sorted(BENCHMARKS), help="Benchmark to run; repeatable (default: all)")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="Comma-separated data sizes (default: %(default)s)")
+    parser.add_argument("--max-size", type=int, help="Skip sizes above this")
+    parser.add_argument("--full", action="store_true", help="Run every size even where it takes minutes (%s)" %
+                        ", ".join(f"{name} > {limit:,}" for name, limit in SIZE_LIMITS.items()))
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per benchmark and size; the fastest is kept")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Skip repeats and larger sizes of a benchmark after a run this slow (seconds)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mock: milliseconds added to every HTTP request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Mock: up to this many extra random milliseconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Mock: fraction of HTTP requests that fail")
+    parser.add_argument("--error-kind", choices=["rpc", "http"], default="rpc", help="Mock: JSON-RPC -32005 or HTTP 503 failures")
+    parser.add_argument("--port", type=int, default=18999, help="Port for the in-process mock (PubSub on port + 1)")
+    parser.add_argument("--url", help="Use an already running mock_xolana.py at this URL instead")
+    parser.add_argument("--output", "-o", help="Results file (default: bench_results/<time>-<revision>.json)")
+    parser.add_argument("--no-save", action="store_true", help="Do not write a results file")
+    parser.add_argument("--compare", help="Results file to compare against, or 'latest'")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    global xolana, workdir
+    args = parse_args(argv)
+    sizes = sorted({int(size) for size in args.sizes.split(",") if size.strip()})
+    if args.max_size is not None:
+        sizes = [size for size in sizes if size <= args.max_size]
+    names = args.bench or list(BENCHMARKS)
+    previous = load_previous(args.compare) if args.compare else None
+
+    workdir = tempfile.mkdtemp(prefix="xolana-bench-")
+    os.environ["HOME"] = workdir
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import xolana as xolana_module
+    from mock_xolana import MockValidator
+    xolana = xolana_module
+
+    mock_config = {"latency": args.latency / 1000, "jitter": args.jitter / 1000,
+                   "error_rate": args.error_rate, "error_kind": args.error_kind}
+    mock = None
+    if args.url:
+        url = args.url
+    else:
+        mock = MockValidator(**mock_config)
+        url, _ = mock.start(port=args.port)
+    xolana.rpc_client.set_endpoints([url])
+    configure_mock(**mock_config)
+
+    results = []
+    try:
+        for name in names:
+            for size in sizes:
+                if not args.full and size > SIZE_LIMITS.get(name, size):
+                    continue
+                print(f"{name} @ {size:,} ...", file=sys.stderr, flush=True)
+                record = run_benchmark(name, size, max(1, args.repeat), args.timeout)
+                results.append(record)
+                if record.get("error") or record.get("seconds", 0) > args.timeout:
+                    break
+    except KeyboardInterrupt:
+        print("Interrupted; keeping the results so far.", file=sys.stderr)
+    finally:
+        xolana.rpc_client.close()
+        if mock:
+            mock.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    run = {
+        "meta": {
+            "time": time.time(),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "mock": mock_config if not args.url else dict(mock_config, url=args.url),
+            "sizes": sizes,
+        },
+        "results": results,
+    }
+    render_results(results, previous)
+    if not args.no_save:
+        path = args.output
+        if not path:
+            os.makedirs(RESULTS_DIR, exist_ok=True)
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            path = os.path.join(RESULTS_DIR, f"{stamp}-{run['meta']['revision'] or 'unknown'}.json")
+        with open(path, "w") as outfile:
+            json.dump(run, outfile, indent=1)
+        print(f"Saved results to {path}", file=sys.stderr)
+    return 0 if all(record.get("status") == 0 for record in results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,651 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import socket
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import websockets
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import MessageV0
+from solders.pubkey import Pubkey
+from solders.signature import Signature
+from solders.system_program import TransferParams, transfer
+from solders.transaction import VersionedTransaction
+
+# Local stand-in for a Xolana validator's JSON-RPC and PubSub endpoints, for
+# benchmarks and offline development. Data is canned and deterministic, and
+# scales with `size`: the number of validators, gossip nodes, history entries
+# per address and log notifications per logsSubscribe. Latency and errors can
+# be injected. PubSub is served on the RPC port + 1, like a real validator.
+#
+#   python mock_xolana.py --port 8899 --size 10000 --latency 20 --error-rate 0.01
+#   python xolana.py --url http://127.0.0.1:8899 validators
+#
+# Settings can be changed on a running server with the non-standard
+# `mock_configure` method, e.g. {"method": "mock_configure", "params": [{"size": 100}]}.
+
+SLOT_TIME = 0.4
+SLOTS_PER_EPOCH = 432000
+GENESIS_SLOT = 100 * SLOTS_PER_EPOCH + 1000  # The clock starts here, in epoch 100
+LAMPORTS_PER_SOL = 10**9
+SYSTEM_PROGRAM_ID = "11111111111111111111111111111111"
+STAKE_PROGRAM_ID = "Stake11111111111111111111111111111111111111"
+STAKE_ACCOUNT_SIZE = 200
+STAKE_RENT_EXEMPT_RESERVE = 2282880
+DEFAULT_CONFIG = {
+    "size": 100,            # Validators, gossip nodes, history entries, stake accounts and log notifications
+    "latency": 0.0,         # Seconds added to every HTTP request
+    "jitter": 0.0,          # Up to this many extra seconds, uniformly random
+    "error_rate": 0.0,      # Fraction of HTTP requests that fail
+    "error_kind": "rpc",    # "rpc": JSON-RPC -32005 node unhealthy; "http": 503 response
+    "log_rate": 0.0,        # Log notifications per second (0: as fast as possible)
+    "confirm_delay": 0.0,   # Seconds before a sent transaction shows up as finalized
+    "status_cache_ttl": None,  # Seconds a landed transaction stays in the recent status cache (None: forever)
+    "stake_authority": None,  # Staker and withdrawer of the stake accounts (default: a fixed mock key)
+    "seed": 1,
+}
+
+# Deterministic base58 pubkey for the i-th item of a kind
+def mock_pubkey(kind, i):
+    return str(Pubkey(hashlib.sha256(f"{kind}:{i}".encode()).digest()))
+
+def mock_signature(kind, i):
+    return str(Signature(hashlib.sha512(f"{kind}:{i}".encode()).digest()))
+
+class MockValidator:
+    def __init__(self, **config):
+        self.config = dict(DEFAULT_CONFIG, **config)
+        self.started = time.time()
+        self.sent = {}  # signature -> (slot, time sent)
+        self.requests = 0
+        self._datasets = {}
+        self._lock = threading.Lock()
+        self._random = random.Random(self.config["seed"])
+        self.http_server = None
+        self.ws_server = None
+        self.loop = None
+        self.url = None
+        self.ws_url = None
+        self._build_transaction_templates()
+
+    # Clock
+
+    def slot(self):
+        return GENESIS_SLOT + int((time.time() - self.started) / SLOT_TIME)
+
+    def block_height(self):
+        return self.slot() - 50
+
+    # Datasets, built once per size
+
+    def dataset(self, name, build):
+        key = (name, self.config["size"], self.config["seed"])
+        with self._lock:
+            data = self._datasets.get(key)
+        if data is None:
+            data = build(self.config["size"], random.Random(f"{self.config['seed']}:{name}"))
+            with self._lock:
+                self._datasets[key] = data
+        return data
+
+    def vote_accounts(self):
+        def build(size, rng):
+            slot, epoch = self.slot(), self.slot() // SLOTS_PER_EPOCH
+            accounts = []
+            for i in range(size):
+                credits = 0
+                history = []
+                for e in range(epoch - 4, epoch + 1):
+                    earned = rng.randint(300000, 432000)
+                    history.append([e, credits + earned, credits])
+                    credits += earned
+                accounts.append({
+                    "votePubkey": mock_pubkey("vote", i),
+                    "nodePubkey": mock_pubkey("node", i),
+                    "activatedStake": rng.randint(1, 2_000_000) * LAMPORTS_PER_SOL,
+                    "commission": rng.choice((0, 5, 7, 10, 100)),
+                    "epochVoteAccount": True,
+                    "epochCredits": history,
+                    "lastVote": slot - rng.randint(0, 3),
+                    "rootSlot": slot - 32,
+                })
+            delinquent = max(0, size // 100)
+            return {"current": accounts[:size - delinquent], "delinquent": accounts[size - delinquent:]}
+        return self.dataset("vote_accounts", build)
+
+    def block_production(self):
+        def build(size, rng):
+            by_identity = {}
+            for i in range(size):
+                leader_slots = rng.randint(0, 400) * 4
+                by_identity[mock_pubkey("node", i)] = [leader_slots, leader_slots - rng.randint(0, leader_slots // 20)]
+            return by_identity
+        return self.dataset("block_production", build)
+
+    def cluster_nodes(self):
+        def build(size, rng):
+            nodes = []
+            for i in range(size):
+                port = 10000 + (i * 10) % 50000
+                nodes.append({
+                    "pubkey": mock_pubkey("node", i),
+                    "gossip": f"127.0.0.1:{port}",
+                    "tpu": f"127.0.0.1:{port + 1}",
+                    "tpuQuic": f"127.0.0.1:{port + 7}",
+                    "rpc": None,
+                    "pubsub": None,
+                    "version": "1.18.0",
+                    "featureSet": 4215500110,
+                    "shredVersion": 1,
+                })
+            if nodes and self.url:
+                nodes[0]["rpc"] = self.url.split("://", 1)[1]
+            return nodes
+        return self.dataset("cluster_nodes", build)
+
+    # Signature history shared by every address: `size` entries, newest first
+    def history(self):
+        def build(size, rng):
+            signatures = [mock_signature("history", i) for i in range(size - 1, -1, -1)]
+            return signatures, {signature: index for index, signature in enumerate(signatures)}
+        return self.dataset("history", build)
+
+    # `size` stake accounts of the stake authority, cycling through every
+    # status, delegated to the first eight validators; raw 200-byte accounts
+    def stake_accounts(self):
+        authority = bytes(Pubkey.from_string(self.config["stake_authority"] or mock_pubkey("stake-authority", 0)))
+
+        def build(size, rng):
+            epoch = self.slot() // SLOTS_PER_EPOCH
+            accounts = []
+            for i in range(size):
+                kind = i % 5
+                voter = bytes(Pubkey.from_string(mock_pubkey("vote", i % 8)))
+                activation, deactivation = {
+                    0: (0, 0),                         # undelegated
+                    1: (epoch - 10, 2**64 - 1),        # active
+                    2: (epoch, 2**64 - 1),             # activating
+                    3: (epoch - 10, epoch),            # deactivating
+                    4: (epoch - 10, epoch - 3),        # inactive
+                }[kind]
+                lamports = rng.randint(1, 1000) * LAMPORTS_PER_SOL + STAKE_RENT_EXEMPT_RESERVE
+                data = struct.pack("<IQ32s32sqQ32s", 1 if kind == 0 else 2, STAKE_RENT_EXEMPT_RESERVE,
+                                   authority, authority, 0, 0, bytes(32))
+                if kind:
+                    data += struct.pack("<32sQQQdQB", voter, lamports - STAKE_RENT_EXEMPT_RESERVE,
+                                        activation, deactivation, 0.09, 0, 0)
+                accounts.append((mock_pubkey("stake", i), lamports, data.ljust(STAKE_ACCOUNT_SIZE, b"\0")))
+            return accounts
+        return self.dataset(("stake_accounts", authority), build)
+
+    def _build_transaction_templates(self):
+        payer = Keypair.from_seed(bytes(32))
+        recipient = Pubkey.from_string(mock_pubkey("recipient", 0))
+        message = MessageV0.try_compile(payer.pubkey(), [transfer(TransferParams(
+            from_pubkey=payer.pubkey(), to_pubkey=recipient, lamports=5000,
+        ))], [], Hash.default())
+        tx = VersionedTransaction(message, [payer])
+        self._tx_base64 = base64.b64encode(bytes(tx)).decode()
+        self._tx_message = {
+            "accountKeys": [
+                {"pubkey": str(payer.pubkey()), "writable": True, "signer": True, "source": "transaction"},
+                {"pubkey": str(recipient), "writable": True, "signer": False, "source": "transaction"},
+                {"pubkey": SYSTEM_PROGRAM_ID, "writable": False, "signer": False, "source": "transaction"},
+            ],
+            "recentBlockhash": str(Hash.default()),
+            "instructions": [{
+                "program": "system",
+                "programId": SYSTEM_PROGRAM_ID,
+                "parsed": {"type": "transfer", "info": {
+                    "source": str(payer.pubkey()), "destination": str(recipient), "lamports": 5000,
+                }},
+                "stackHeight": None,
+            }],
+        }
+        self._tx_meta = {
+            "err": None,
+            "status": {"Ok": None},
+            "fee": 5000,
+            "preBalances": [10 * LAMPORTS_PER_SOL, 0, 1],
+            "postBalances": [10 * LAMPORTS_PER_SOL - 10000, 5000, 1],
+            "innerInstructions": [],
+            "logMessages": [
+                f"Program {SYSTEM_PROGRAM_ID} invoke [1]",
+                f"Program {SYSTEM_PROGRAM_ID} success",
+            ],
+            "preTokenBalances": [],
+            "postTokenBalances": [],
+            "rewards": [],
+            "computeUnitsConsumed": 150,
+        }
+
+    # JSON-RPC methods
+
+    def lamports_for(self, address):
+        return int.from_bytes(hashlib.sha256(address.encode()).digest()[:4], "little") * 1000
+
+    def get_balance(self, params):
+        return {"context": {"slot": self.slot()}, "value": self.lamports_for(params[0])}
+
+    def get_multiple_accounts(self, params):
+        values = []
+        for address in params[0]:
+            lamports = self.lamports_for(address)
+            if lamports % 7 == 0:
+                values.append(None)
+                continue
+            values.append({"lamports": lamports, "owner": SYSTEM_PROGRAM_ID, "data": ["", "base64"],
+                           "executable": False, "rentEpoch": 18446744073709551615, "space": 0})
+        return {"context": {"slot": self.slot()}, "value": values}
+
+    def get_signatures_for_address(self, params):
+        options = params[1] if len(params) > 1 and params[1] else {}
+        signatures, index = self.history()
+        start = index[options["before"]] + 1 if options.get("before") in index else 0
+        end = index[options["until"]] if options.get("until") in index else len(signatures)
+        end = min(end, start + min(options.get("limit") or 1000, 1000))
+        newest_slot = self.slot() - 1
+        return [{
+            "signature": signatures[i],
+            "slot": newest_slot - i,
+            "err": None,
+            "memo": None,
+            "blockTime": int(self.started + (newest_slot - i - GENESIS_SLOT) * SLOT_TIME),
+            "confirmationStatus": "finalized",
+        } for i in range(start, end)]
+
+    def get_transaction(self, params):
+        options = params[1] if len(params) > 1 and params[1] else {}
+        result = {"slot": self.slot() - 100, "blockTime": int(time.time()) - 40, "version": 0,
+                  "meta": dict(self._tx_meta)}
+        if options.get("encoding") == "base64":
+            result["transaction"] = [self._tx_base64, "base64"]
+            result["meta"]["loadedAddresses"] = {"writable": [], "readonly": []}
+        else:
+            result["transaction"] = {"signatures": [params[0]], "message": self._tx_message}
+        return result
+
+    def get_vote_accounts(self, params):
+        return self.vote_accounts()
+
+    def get_block_production(self, params):
+        slot = self.slot()
+        return {"context": {"slot": slot}, "value": {
+            "byIdentity": self.block_production(),
+            "range": {"firstSlot": slot - slot % SLOTS_PER_EPOCH, "lastSlot": slot},
+        }}
+
+    def get_epoch_info(self, params):
+        slot = self.slot()
+        return {"absoluteSlot": slot, "blockHeight": self.block_height(), "epoch": slot // SLOTS_PER_EPOCH,
+                "slotIndex": slot % SLOTS_PER_EPOCH, "slotsInEpoch": SLOTS_PER_EPOCH, "transactionCount": slot * 1000}
+
+    def get_cluster_nodes(self, params):
+        return self.cluster_nodes()
+
+    def get_latest_blockhash(self, params):
+        height = self.block_height()
+        blockhash = self.blockhash_at(height)
+        return {"context": {"slot": self.slot()}, "value": {
+            "blockhash": str(blockhash), "lastValidBlockHeight": height + 150,
+        }}
+
+    # The blockhash getLatestBlockhash hands out at a block height
+    @staticmethod
+    def blockhash_at(height):
+        return Hash(hashlib.sha256(str(height // 10).encode()).digest())
+
+    # Accepts any well-formed transaction with a blockhash from the last 150
+    # blocks and reports it finalized after `confirm_delay`
+    def send_transaction(self, params):
+        options = params[1] if len(params) > 1 and params[1] else {}
+        try:
+            if options.get("encoding") == "base64":
+                raw = base64.b64decode(params[0])
+            else:
+                import base58
+                raw = base58.b58decode(params[0])
+            tx = VersionedTransaction.from_bytes(raw)
+        except (ValueError, IndexError, TypeError):
+            raise MockError(-32602, "invalid transaction: failed to deserialize")
+        height = self.block_height()
+        if tx.message.recent_blockhash not in {self.blockhash_at(h) for h in range(height - 150, height + 1, 10)}:
+            raise MockError(-32002, "Transaction simulation failed: Blockhash not found")
+        signature = str(tx.signatures[0])
+        with self._lock:
+            self.sent.setdefault(signature, (self.slot(), time.monotonic()))
+        return signature
+
+    # Past `status_cache_ttl` a transaction is only found with searchTransactionHistory
+    def get_signature_statuses(self, params):
+        search_history = len(params) > 1 and bool((params[1] or {}).get("searchTransactionHistory"))
+        ttl = self.config["status_cache_ttl"]
+        now = time.monotonic()
+        values = []
+        with self._lock:
+            for signature in params[0]:
+                sent = self.sent.get(signature)
+                if (sent is None or now - sent[1] < self.config["confirm_delay"]
+                        or (ttl is not None and not search_history and now - sent[1] > ttl)):
+                    values.append(None)
+                    continue
+                values.append({"slot": sent[0], "confirmations": None, "err": None,
+                               "status": {"Ok": None}, "confirmationStatus": "finalized"})
+        return {"context": {"slot": self.slot()}, "value": values}
+
+    def request_airdrop(self, params):
+        return mock_signature("airdrop", self._random.random())
+
+    def get_supply(self, params):
+        return {"context": {"slot": self.slot()}, "value": {
+            "total": 500_000_000 * LAMPORTS_PER_SOL, "circulating": 400_000_000 * LAMPORTS_PER_SOL,
+            "nonCirculating": 100_000_000 * LAMPORTS_PER_SOL, "nonCirculatingAccounts": [],
+        }}
+
+    def get_block_time(self, params):
+        return int(self.started + (params[0] - GENESIS_SLOT) * SLOT_TIME)
+
+    def get_recent_performance_samples(self, params):
+        limit = params[0] if params else 720
+        slot = self.slot()
+        return [{"slot": slot - i * 150, "numSlots": 150, "numTransactions": 150 * 3000 + i,
+                 "numNonVoteTransactions": 150 * 500 + i, "samplePeriodSecs": 60} for i in range(min(limit, 720))]
+
+    # Stake program only; dataSize and memcmp filters (32-byte keys) and dataSlice
+    def get_program_accounts(self, params):
+        options = params[1] if len(params) > 1 and params[1] else {}
+        if params[0] != STAKE_PROGRAM_ID:
+            return []
+        if options.get("encoding", "base64") != "base64":
+            raise MockError(-32602, "mock supports base64 encoding only")
+        matches = []
+        for filter_ in options.get("filters") or []:
+            if "dataSize" in filter_ and filter_["dataSize"] != STAKE_ACCOUNT_SIZE:
+                return []
+            if "memcmp" in filter_:
+                matches.append((filter_["memcmp"]["offset"], bytes(Pubkey.from_string(filter_["memcmp"]["bytes"]))))
+        data_slice = options.get("dataSlice")
+        result = []
+        for address, lamports, data in self.stake_accounts():
+            if any(data[offset:offset + len(value)] != value for offset, value in matches):
+                continue
+            if data_slice:
+                data = data[data_slice["offset"]:data_slice["offset"] + data_slice["length"]]
+            result.append({"pubkey": address, "account": {
+                "lamports": lamports, "owner": STAKE_PROGRAM_ID, "data": [base64.b64encode(data).decode(), "base64"],
+                "executable": False, "rentEpoch": 18446744073709551615, "space": STAKE_ACCOUNT_SIZE,
+            }})
+        return result
+
+    def mock_configure(self, params):
+        changes = params[0] if params else {}
+        unknown = set(changes) - set(DEFAULT_CONFIG)
+        if unknown:
+            raise MockError(-32602, f"unknown settings: {sorted(unknown)}")
+        self.config.update(changes)
+        return dict(self.config)
+
+    METHODS = {
+        "getBalance": get_balance,
+        "getMultipleAccounts": get_multiple_accounts,
+        "getSignaturesForAddress": get_signatures_for_address,
+        "getConfirmedSignaturesForAddress2": get_signatures_for_address,
+        "getTransaction": get_transaction,
+        "getVoteAccounts": get_vote_accounts,
+        "getBlockProduction": get_block_production,
+        "getEpochInfo": get_epoch_info,
+        "getClusterNodes": get_cluster_nodes,
+        "getLatestBlockhash": get_latest_blockhash,
+        "sendTransaction": send_transaction,
+        "getSignatureStatuses": get_signature_statuses,
+        "requestAirdrop": request_airdrop,
+        "getSupply": get_supply,
+        "getBlockTime": get_block_time,
+        "getRecentPerformanceSamples": get_recent_performance_samples,
+        "getProgramAccounts": get_program_accounts,
+        "getMinimumBalanceForRentExemption": lambda self, params: 6960 * (128 + (params[0] if params else 0)),
+        "getSlot": lambda self, params: self.slot(),
+        "getBlockHeight": lambda self, params: self.block_height(),
+        "getHealth": lambda self, params: "ok",
+        "getGenesisHash": lambda self, params: str(Hash(hashlib.sha256(b"mock genesis").digest())),
+        "getVersion": lambda self, params: {"solana-core": "1.18.0", "feature-set": 4215500110},
+        "mock_configure": mock_configure,
+    }
+
+    def handle_call(self, call, fail=False):
+        response = {"jsonrpc": "2.0", "id": call.get("id")}
+        method = self.METHODS.get(call.get("method"))
+        if method is None:
+            response["error"] = {"code": -32601, "message": "Method not found"}
+        elif fail and call.get("method") != "mock_configure":
+            response["error"] = {"code": -32005, "message": "Node is unhealthy (injected by mock)"}
+        else:
+            try:
+                response["result"] = method(self, call.get("params") or [])
+            except MockError as e:
+                response["error"] = {"code": e.code, "message": str(e)}
+        return response
+
+    # Latency and error injection apply per HTTP request; mock_configure is exempt
+    def handle_body(self, body):
+        calls = body if isinstance(body, list) else [body]
+        control = all(isinstance(call, dict) and call.get("method") == "mock_configure" for call in calls)
+        self.requests += 1
+        fail = False
+        if not control:
+            delay = self.config["latency"] + self._random.uniform(0, self.config["jitter"])
+            if delay > 0:
+                time.sleep(delay)
+            fail = self._random.random() < self.config["error_rate"]
+            if fail and self.config["error_kind"] == "http":
+                return 503, None
+        responses = [self.handle_call(call, fail) for call in calls]
+        return 200, responses if isinstance(body, list) else responses[0]
+
+    # PubSub
+
+    async def _ws_handler(self, ws):
+        tasks = {}
+        subscription_ids = iter(range(1, 1 << 31))
+        try:
+            async for raw in ws:
+                message = json.loads(raw)
+                method, params = message.get("method", ""), message.get("params") or []
+                if method.endswith("Unsubscribe"):
+                    task = tasks.pop(params[0] if params else None, None)
+                    if task:
+                        task.cancel()
+                    await ws.send(json.dumps({"jsonrpc": "2.0", "id": message.get("id"), "result": task is not None}))
+                    continue
+                stream = {
+                    "logsSubscribe": self._stream_logs,
+                    "slotSubscribe": self._stream_slots,
+                    "rootSubscribe": self._stream_roots,
+                    "signatureSubscribe": self._stream_signature,
+                }.get(method)
+                if stream is None:
+                    await ws.send(json.dumps({"jsonrpc": "2.0", "id": message.get("id"),
+                                              "error": {"code": -32601, "message": "Method not found"}}))
+                    continue
+                subscription = next(subscription_ids)
+                await ws.send(json.dumps({"jsonrpc": "2.0", "id": message.get("id"), "result": subscription}))
+                tasks[subscription] = asyncio.ensure_future(stream(ws, subscription, params))
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+    @staticmethod
+    def _notification(method, subscription, result):
+        return json.dumps({"jsonrpc": "2.0", "method": method, "params": {"subscription": subscription, "result": result}})
+
+    # `size` logsNotifications, spread over a few dozen programs, then silence
+    async def _stream_logs(self, ws, subscription, params):
+        programs = [mock_pubkey("program", i) for i in range(40)]
+        rate = self.config["log_rate"]
+        started = time.monotonic()
+        slot = self.slot()
+        for i in range(self.config["size"]):
+            if rate:
+                await asyncio.sleep(max(0.0, started + i / rate - time.monotonic()))
+            elif i % 256 == 255:
+                await asyncio.sleep(0)
+            program = programs[(i * 7919) % len(programs)]
+            slot += i % 3 == 0
+            await ws.send(self._notification("logsNotification", subscription, {
+                "context": {"slot": slot},
+                "value": {
+                    "signature": mock_signature("logs", i),
+                    "err": {"InstructionError": [0, "Custom"]} if i % 50 == 49 else None,
+                    "logs": [
+                        f"Program {program} invoke [1]",
+                        "Program log: Instruction: Transfer",
+                        f"Program log: mock notification {i}",
+                        f"Program {program} consumed 2000 of 200000 compute units",
+                        f"Program {program} success",
+                    ],
+                },
+            }))
+
+    async def _stream_slots(self, ws, subscription, params):
+        slot = self.slot()
+        while True:
+            await ws.send(self._notification("slotNotification", subscription,
+                                              {"parent": slot - 1, "root": slot - 32, "slot": slot}))
+            await asyncio.sleep(SLOT_TIME)
+            slot = max(slot + 1, self.slot())
+
+    # Every root is notified, one message each, as a validator does
+    async def _stream_roots(self, ws, subscription, params):
+        root = self.slot() - 32
+        while True:
+            await ws.send(self._notification("rootNotification", subscription, root))
+            while root >= self.slot() - 32:
+                await asyncio.sleep(SLOT_TIME / 4)
+            root += 1
+
+    async def _stream_signature(self, ws, subscription, params):
+        signature = params[0] if params else None
+        while True:
+            with self._lock:
+                sent = self.sent.get(signature)
+            if sent is not None and time.monotonic() - sent[1] >= self.config["confirm_delay"]:
+                break
+            await asyncio.sleep(0.05)
+        await ws.send(self._notification("signatureNotification", subscription,
+                                          {"context": {"slot": sent[0]}, "value": {"err": None}}))
+
+    # Servers
+
+    def start(self, host="127.0.0.1", port=18999):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # Answer small requests immediately instead of waiting on delayed ACKs
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def do_POST(self):
+                try:
+                    body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                except ValueError:
+                    status, reply = 200, {"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "Parse error"}}
+                else:
+                    status, reply = mock.handle_body(body)
+                if status != 200:
+                    self.send_error(status)
+                    return
+                data = json.dumps(reply, separators=(",", ":")).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.http_server = ThreadingHTTPServer((host, port), Handler)
+        self.http_server.daemon_threads = True
+        port = self.http_server.server_port
+        threading.Thread(target=self.http_server.serve_forever, name="mock-http", daemon=True).start()
+
+        self.loop = asyncio.new_event_loop()
+        started = threading.Event()
+        failure = []
+
+        def run_websocket():
+            asyncio.set_event_loop(self.loop)
+            try:
+                self.ws_server = self.loop.run_until_complete(
+                    websockets.serve(self._ws_handler, host, port + 1, max_size=None))
+            except OSError as e:
+                failure.append(e)
+                started.set()
+                return
+            started.set()
+            self.loop.run_forever()
+
+        threading.Thread(target=run_websocket, name="mock-ws", daemon=True).start()
+        started.wait()
+        if failure:
+            self.http_server.shutdown()
+            raise failure[0]
+        self.url = f"http://{host}:{port}"
+        self.ws_url = f"ws://{host}:{port + 1}"
+        return self.url, self.ws_url
+
+    def stop(self):
+        if self.http_server:
+            self.http_server.shutdown()
+            self.http_server.server_close()
+        if self.loop:
+            async def shutdown():
+                self.ws_server.close()
+                await self.ws_server.wait_closed()
+            asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result(timeout=5)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+class MockError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Mock Xolana JSON-RPC and PubSub server for benchmarks and offline use.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8899, help="JSON-RPC port; PubSub listens on port + 1")
+    parser.add_argument("--size", type=int, default=DEFAULT_CONFIG["size"], help="Validators, gossip nodes, history entries and log notifications")
+    parser.add_argument("--latency", type=float, default=0.0, help="Milliseconds added to every HTTP request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra random milliseconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of HTTP requests that fail")
+    parser.add_argument("--error-kind", choices=["rpc", "http"], default="rpc", help="Fail with JSON-RPC -32005 or HTTP 503")
+    parser.add_argument("--log-rate", type=float, default=0.0, help="Log notifications per second (0: as fast as possible)")
+    parser.add_argument("--confirm-delay", type=float, default=0.0, help="Seconds before sent transactions are finalized")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the generated data")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    mock = MockValidator(
+        size=args.size, latency=args.latency / 1000, jitter=args.jitter / 1000, error_rate=args.error_rate,
+        error_kind=args.error_kind, log_rate=args.log_rate, confirm_delay=args.confirm_delay, seed=args.seed,
+    )
+    url, ws_url = mock.start(args.host, args.port)
+    print(f"Mock validator listening on {url} (PubSub {ws_url}), size {args.size}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        mock.stop()
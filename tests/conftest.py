@@ -0,0 +1,37 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mock_xolana
+import xolana
+
+# Start a mock validator on a free port pair (JSON-RPC on `port`, PubSub on port + 1)
+def start_mock(**config):
+    mock = mock_xolana.MockValidator(**config)
+    for _ in range(50):
+        try:
+            mock.start(port=random.randrange(20000, 60000, 2))
+            return mock
+        except OSError:
+            continue
+    raise RuntimeError("no free port for the mock validator")
+
+@pytest.fixture
+def mock():
+    validator = start_mock()
+    xolana.rpc_client.set_endpoints([validator.url])
+    yield validator
+    validator.stop()
+    xolana.rpc_client.set_endpoints([xolana.RPC_URL])
+
+# A transaction cache in a temporary directory in place of the on-disk default
+@pytest.fixture
+def tx_cache(tmp_path, monkeypatch):
+    cache = xolana.TransactionCache(str(tmp_path / "txcache.sqlite"))
+    monkeypatch.setattr(xolana, "_tx_cache", cache)
+    yield cache
+    xolana.close_tx_cache()
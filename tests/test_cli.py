@@ -0,0 +1,50 @@
+import pytest
+
+import mock_xolana
+import xolana
+
+SIGNATURE = mock_xolana.mock_signature("history", 0)
+
+def test_global_no_cache_survives_subcommand_flag_of_the_same_name():
+    args = xolana.parse_args(["--no-cache", "tx", "abc"])
+    assert args.no_rpc_cache and not args.no_cache
+    args = xolana.parse_args(["tx", "abc", "--no-cache"])
+    assert args.no_cache and not args.no_rpc_cache
+
+def test_global_options_and_defaults():
+    args = xolana.parse_args(["--url", "http://a:8899", "--url", "http://b:8899", "--profile", "balance"])
+    assert args.url == ["http://a:8899", "http://b:8899"]
+    assert args.profile and not args.discover and not args.no_rpc_cache
+    assert args.command == "balance" and args.func is xolana.balance_command
+
+def test_no_command_runs_the_menu():
+    args = xolana.parse_args([])
+    assert args.command is None
+
+def test_payout_and_probe_options():
+    args = xolana.parse_args(["payout", "list.csv", "--inflight", "32", "--dry-run"])
+    assert args.file == "list.csv" and args.inflight == 32 and args.dry_run
+    args = xolana.parse_args(["probe", "--mode", "rpc", "--count", "5"])
+    assert args.mode == "rpc" and args.count == 5
+
+@pytest.mark.parametrize("argv", [["tx", SIGNATURE], ["tx", SIGNATURE, "--json"]])
+def test_tx_reads_the_transaction_cache(mock, tx_cache, argv):
+    xolana.fetch_transaction(SIGNATURE)
+    requests = mock.requests
+    args = xolana.parse_args(argv)
+    assert args.func(args) == 0
+    assert mock.requests == requests
+
+@pytest.mark.parametrize("argv", [
+    ["tx", SIGNATURE, "--no-cache"],
+    ["tx", SIGNATURE, "--no-cache", "--json"],
+    ["--no-cache", "tx", SIGNATURE],
+    ["--no-cache", "tx", SIGNATURE, "--json"],
+])
+def test_tx_no_cache_asks_the_node_with_and_without_json(mock, tx_cache, capsys, argv):
+    xolana.fetch_transaction(SIGNATURE)
+    requests = mock.requests
+    args = xolana.parse_args(argv)
+    assert args.func(args) == 0
+    assert mock.requests == requests + 1
+    assert "finalized" in capsys.readouterr().out.lower()
@@ -0,0 +1,48 @@
+import base64
+import struct
+
+from solders.hash import Hash
+from solders.instruction import Instruction
+from solders.keypair import Keypair
+from solders.message import MessageV0
+from solders.pubkey import Pubkey
+from solders.system_program import TransferParams, transfer
+from solders.transaction import VersionedTransaction
+
+import mock_xolana
+import xolana
+
+def encode(payer, instructions):
+    message = MessageV0.try_compile(payer.pubkey(), instructions, [], Hash.default())
+    return base64.b64encode(bytes(VersionedTransaction(message, [payer]))).decode()
+
+def decode(payer, instructions):
+    tx_data = {"slot": 1, "transaction": [encode(payer, instructions), "base64"], "meta": {"fee": 5000}}
+    return xolana.decode_transaction(tx_data)["transaction"]
+
+def test_transaction_decoder_matches_jsonparsed_layout(mock):
+    tx_data = xolana.rpc_client.request("getTransaction", [mock_xolana.mock_signature("history", 0),
+                                                           {"encoding": "base64"}])["result"]
+    decoded = xolana.decode_transaction(tx_data)
+    assert decoded["transaction"]["message"]["accountKeys"] == mock._tx_message["accountKeys"]
+    assert decoded["transaction"]["message"]["instructions"] == mock._tx_message["instructions"]
+    assert decoded["meta"] == tx_data["meta"]
+
+def test_system_compute_budget_and_memo_instructions():
+    payer, recipient = Keypair(), Keypair().pubkey()
+    memo = Instruction(Pubkey.from_string(xolana.MEMO_PROGRAM_IDS[0]), b"hello", [])
+    price = Instruction(Pubkey.from_string(xolana.COMPUTE_BUDGET_PROGRAM_ID), b"\x03" + struct.pack("<Q", 7), [])
+    transfer_ix = transfer(TransferParams(from_pubkey=payer.pubkey(), to_pubkey=recipient, lamports=42))
+    instructions = decode(payer, [price, transfer_ix, memo])["message"]["instructions"]
+    assert [ix["parsed"] for ix in instructions] == [
+        {"type": "setComputeUnitPrice", "info": {"microLamports": 7}},
+        {"type": "transfer", "info": {"source": str(payer.pubkey()), "destination": str(recipient), "lamports": 42}},
+        {"type": "memo", "info": {"memo": "hello"}},
+    ]
+
+def test_unknown_instructions_keep_raw_data():
+    payer = Keypair()
+    program = Keypair().pubkey()
+    [instruction] = decode(payer, [Instruction(program, b"\x01\x02", [])])["message"]["instructions"]
+    assert instruction["program"] == "unknown" and instruction["programId"] == str(program)
+    assert instruction["data"] == xolana.b58encode(b"\x01\x02").decode()
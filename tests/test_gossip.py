@@ -0,0 +1,45 @@
+import xolana
+from conftest import start_mock
+
+def sweep(path, **options):
+    return xolana.gossip_sweep(timeout=0.5, path=str(path), **options)
+
+def test_cached_sweep_is_shown_without_a_network_call(mock, tmp_path):
+    mock.config["size"] = 5
+    path = tmp_path / "gossip_sweep.json"
+    results, age, _ = sweep(path)
+    assert len(results) == 5 and age == 0.0
+
+    xolana.rpc_client.cache.clear()  # as in a new process
+    requests = mock.requests
+    cached, age, _ = sweep(path)
+    assert cached == results and age > 0.0
+    assert mock.requests == requests
+
+    sweep(path, refresh=True)
+    assert mock.requests > requests
+
+def test_endpoint_sets_of_one_cluster_share_the_sweep(mock, tmp_path):
+    mock.config["size"] = 5
+    path = tmp_path / "gossip_sweep.json"
+    results, _, _ = sweep(path)
+    other = start_mock(size=5)
+    try:
+        xolana.rpc_client.set_endpoints([mock.url, other.url])
+        cached, age, _ = sweep(path)  # asks for the genesis hash once
+        assert cached == results and age > 0.0
+        requests = other.requests + mock.requests
+        sweep(path)
+        assert other.requests + mock.requests == requests
+    finally:
+        other.stop()
+
+def test_sweep_falls_back_to_the_endpoints_without_a_genesis_hash(mock, tmp_path):
+    mock.config["size"] = 3
+    mock.METHODS = dict(mock.METHODS)
+    del mock.METHODS["getGenesisHash"]
+    path = tmp_path / "gossip_sweep.json"
+    sweep(path)
+    requests = mock.requests
+    assert sweep(path)[1] > 0.0
+    assert mock.requests == requests
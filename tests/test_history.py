@@ -0,0 +1,63 @@
+import mock_xolana
+import xolana
+
+ADDRESS = mock_xolana.mock_pubkey("history-address", 0)
+
+def test_incremental_sync_fetches_only_new_entries(mock, tmp_path):
+    mock.config["size"] = 2500
+    index = xolana.HistoryIndex(str(tmp_path / "history.sqlite"))
+    try:
+        first = index.sync(xolana.rpc_client, ADDRESS)
+        assert first["new"] == 2500 and first["requests"] == 3
+        assert index.state(ADDRESS)["complete"] == 1
+
+        unchanged = index.sync(xolana.rpc_client, ADDRESS)
+        assert unchanged["new"] == 0 and unchanged["requests"] == 1
+
+        mock.config["size"] = 2600  # 100 newer signatures
+        grown = index.sync(xolana.rpc_client, ADDRESS)
+        assert grown["new"] == 100 and grown["requests"] == 1
+        assert index.count(ADDRESS) == 2600
+        assert index.state(ADDRESS)["newest_signature"] == mock_xolana.mock_signature("history", 2599)
+    finally:
+        index.close()
+
+def test_interrupted_backfill_resumes_from_oldest_stored(mock, tmp_path, monkeypatch):
+    mock.config["size"] = 2500
+    index = xolana.HistoryIndex(str(tmp_path / "history.sqlite"))
+    fetch_page = xolana.HistoryIndex._fetch_page
+    pages = []
+
+    def interrupted(self, client, address, **options):
+        if len(pages) == 2:
+            raise RuntimeError("interrupted")
+        pages.append(options)
+        return fetch_page(self, client, address, **options)
+
+    try:
+        monkeypatch.setattr(xolana.HistoryIndex, "_fetch_page", interrupted)
+        try:
+            index.sync(xolana.rpc_client, ADDRESS)
+        except RuntimeError:
+            pass
+        assert index.count(ADDRESS) == 2000 and not index.state(ADDRESS)["complete"]
+
+        monkeypatch.setattr(xolana.HistoryIndex, "_fetch_page", fetch_page)
+        resumed = index.sync(xolana.rpc_client, ADDRESS)
+        assert resumed["new"] == 500
+        assert index.count(ADDRESS) == 2500 and index.state(ADDRESS)["complete"] == 1
+    finally:
+        index.close()
+
+def test_query_filters_by_slot_and_limit(mock, tmp_path):
+    mock.config["size"] = 50
+    index = xolana.HistoryIndex(str(tmp_path / "history.sqlite"))
+    try:
+        index.sync(xolana.rpc_client, ADDRESS)
+        rows = index.query(ADDRESS)
+        assert len(rows) == 50 and rows == sorted(rows, key=lambda row: -row["slot"])
+        newest, oldest = rows[0]["slot"], rows[-1]["slot"]
+        assert len(index.query(ADDRESS, from_slot=oldest + 10, to_slot=oldest + 19)) == 10
+        assert [row["slot"] for row in index.query(ADDRESS, limit=3)] == [newest, newest - 1, newest - 2]
+    finally:
+        index.close()
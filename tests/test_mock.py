@@ -0,0 +1,34 @@
+import base64
+
+import pytest
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import MessageV0
+from solders.system_program import TransferParams, transfer
+from solders.transaction import VersionedTransaction
+
+import xolana
+
+def test_datasets_follow_the_configured_size(mock):
+    mock.config["size"] = 7
+    assert len(xolana.rpc_client.request("getClusterNodes", [])["result"]) == 7
+    vote_accounts = xolana.rpc_client.request("getVoteAccounts", [])["result"]
+    assert len(vote_accounts["current"]) + len(vote_accounts["delinquent"]) == 7
+
+def test_sent_transaction_is_reported_finalized(mock):
+    payer = Keypair()
+    blockhash = xolana.rpc_client.request("getLatestBlockhash", [])["result"]["value"]["blockhash"]
+    message = MessageV0.try_compile(payer.pubkey(), [transfer(TransferParams(
+        from_pubkey=payer.pubkey(), to_pubkey=Keypair().pubkey(), lamports=1,
+    ))], [], Hash.from_string(blockhash))
+    tx = base64.b64encode(bytes(VersionedTransaction(message, [payer]))).decode()
+    signature = xolana.rpc_client.request("sendTransaction", [tx, {"encoding": "base64"}])["result"]
+    [status] = xolana.rpc_client.request("getSignatureStatuses", [[signature]])["result"]["value"]
+    assert status["confirmationStatus"] == "finalized"
+
+def test_injected_errors_and_unknown_methods(mock):
+    mock.config["error_rate"] = 1.0
+    with pytest.raises(xolana.RpcTransportError, match="unhealthy"):
+        xolana.rpc_client.request("getSlot", [])
+    mock.config["error_rate"] = 0.0
+    assert xolana.rpc_client.request("mock_unknown", [])["error"]["code"] == -32601
@@ -0,0 +1,127 @@
+import base64
+import json
+import time
+
+import pytest
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.transaction import VersionedTransaction
+
+import xolana
+
+RECIPIENT = "11111111111111111111111111111112"
+
+def make_payouts(count):
+    return [{"line": i + 2, "recipient": str(Keypair().pubkey()), "lamports": 1000 + i} for i in range(count)]
+
+def journaled_batch(journal, keypair, items, *events, last_valid_block_height=1):
+    tx = VersionedTransaction(xolana.build_transfer_message(keypair.pubkey(), items, Hash.default()), [keypair])
+    signature = str(tx.signatures[0])
+    journal.record("sent", signature=signature, items=items, last_valid_block_height=last_valid_block_height,
+                   tx=base64.b64encode(bytes(tx)).decode("ascii"))
+    for event in events:
+        journal.record(event, signature=signature)
+    return signature
+
+def paid_lines(path):
+    with open(path) as journal_file:
+        entries = [json.loads(line) for line in journal_file]
+    return [item["line"] for entry in entries if entry["event"] == "sent" for item in entry["items"]]
+
+def run(keypair, payouts, path):
+    journal = xolana.PayoutJournal(path)
+    try:
+        return xolana.run_payouts(keypair, payouts, journal, poll_interval=0.05)
+    finally:
+        journal.close()
+
+def test_load_payout_list_reports_invalid_rows(tmp_path):
+    path = tmp_path / "payouts.csv"
+    path.write_text("\n".join([
+        "recipient,amount",
+        f"{RECIPIENT},1.5",
+        f"{RECIPIENT},NaN",
+        f"{RECIPIENT},Infinity",
+        f"{RECIPIENT},-2",
+        f"{RECIPIENT},0.0000000001",
+        f"{RECIPIENT},1e30",
+        "not-a-key,1",
+        f"{RECIPIENT}",
+        "# comment",
+        "",
+        f"{RECIPIENT},0.000000001",
+        f"{RECIPIENT},0.0000000015",
+        f"{RECIPIENT},2.0000000000",
+    ]) + "\n")
+    payouts, errors = xolana.load_payout_list(str(path))
+    assert payouts == [
+        {"line": 2, "recipient": RECIPIENT, "lamports": 1_500_000_000},
+        {"line": 12, "recipient": RECIPIENT, "lamports": 1},
+        {"line": 14, "recipient": RECIPIENT, "lamports": 2_000_000_000},
+    ]
+    assert [error.split(":")[0] for error in errors] == [f"line {n}" for n in (3, 4, 5, 6, 7, 8, 9, 13)]
+    assert "whole number of lamports" in errors[-1]
+
+def test_payouts_pay_everyone_once(mock, tmp_path):
+    keypair, payouts = Keypair(), make_payouts(50)
+    summary = run(keypair, payouts, str(tmp_path / "journal"))
+    assert summary["paid"] == 50 and summary["failed"] == 0
+    assert sorted(paid_lines(tmp_path / "journal")) == [item["line"] for item in payouts]
+    assert len(mock.sent) == summary["transactions"]
+
+def test_resume_does_not_resend_pending_batch_that_landed(mock, tmp_path):
+    keypair, payouts = Keypair(), make_payouts(20)
+    path = str(tmp_path / "journal")
+    journal = xolana.PayoutJournal(path)
+    signature = journaled_batch(journal, keypair, payouts[:8], last_valid_block_height=10**12)
+    journal.close()
+    mock.sent[signature] = (mock.slot(), time.monotonic())
+
+    summary = run(keypair, payouts, path)
+    assert summary["paid"] == 20
+    assert sorted(paid_lines(path)) == [item["line"] for item in payouts]
+
+@pytest.mark.parametrize("event", ["expired", "rejected"])
+def test_resume_finds_landed_batch_that_aged_out_of_status_cache(mock, tmp_path, event):
+    # Landed before the crash, journaled as expired/rejected, and gone from the
+    # node's recent status cache: only a history search still finds it
+    mock.config["status_cache_ttl"] = 30.0
+    keypair, payouts = Keypair(), make_payouts(20)
+    path = str(tmp_path / "journal")
+    journal = xolana.PayoutJournal(path)
+    signature = journaled_batch(journal, keypair, payouts[:8], event)
+    journal.close()
+    mock.sent[signature] = (mock.slot(), time.monotonic() - 60)
+
+    summary = run(keypair, payouts, path)
+    assert summary["paid"] == 20
+    lines = paid_lines(path)
+    assert sorted(lines) == [item["line"] for item in payouts]  # no line sent twice
+
+def test_resume_repacks_batch_that_never_landed(mock, tmp_path):
+    keypair, payouts = Keypair(), make_payouts(20)
+    path = str(tmp_path / "journal")
+    journal = xolana.PayoutJournal(path)
+    signature = journaled_batch(journal, keypair, payouts[:8])
+    journal.close()
+
+    summary = run(keypair, payouts, path)
+    assert summary["paid"] == 20
+    assert signature not in mock.sent
+    with open(path) as journal_file:
+        expired = [json.loads(line)["signature"] for line in journal_file if '"expired"' in line]
+    assert expired == [signature]
+    # The expired batch's payees went out once more, everyone else once
+    assert sorted(paid_lines(path)) == sorted([item["line"] for item in payouts[:8]] + [item["line"] for item in payouts])
+
+def test_resume_skips_batches_whose_payees_are_paid(tmp_path):
+    keypair, payouts = Keypair(), make_payouts(4)
+    journal = xolana.PayoutJournal(str(tmp_path / "journal"))
+    first = journaled_batch(journal, keypair, payouts, "expired")
+    second = journaled_batch(journal, keypair, payouts[:2], "confirmed")
+    third = journaled_batch(journal, keypair, payouts[2:])
+    paid, unsettled = journal.state()
+    journal.close()
+    assert paid == {2, 3}
+    assert set(unsettled) == {first, third}
+    assert second not in unsettled
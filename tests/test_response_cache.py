@@ -0,0 +1,150 @@
+import threading
+import time
+
+import xolana
+
+def response(result, slot=None):
+    if slot is not None:
+        result = {"context": {"slot": slot}, "value": result}
+    return {"jsonrpc": "2.0", "id": 1, "result": result}
+
+def test_hit_returns_a_copy():
+    cache = xolana.ResponseCache()
+    cache.put("getVoteAccounts", [], response({"current": [{"votePubkey": "a"}], "delinquent": []}))
+    first = cache.get("getVoteAccounts", [])
+    first["result"]["current"].clear()
+    assert cache.get("getVoteAccounts", [])["result"]["current"] == [{"votePubkey": "a"}]
+
+def test_params_are_part_of_the_key_and_uncached_methods_miss():
+    cache = xolana.ResponseCache()
+    cache.put("getBalance", ["a"], response(1, slot=10))
+    assert cache.get("getBalance", ["a"])["result"]["value"] == 1
+    assert cache.get("getBalance", ["b"]) is None
+    cache.put("getSlot", [], response(10))
+    assert cache.get("getSlot", []) is None
+
+def test_slot_scoped_entry_expires_when_observed_slots_pass_its_ttl():
+    cache = xolana.ResponseCache()
+    cache.observe("getSlot", response(1000))
+    cache.put("getBalance", ["a"], response(5, slot=1000))
+    cache.observe("getSlot", response(1003))
+    assert cache.get("getBalance", ["a"]) is not None
+    cache.observe("getSlot", response(1000 + xolana.RPC_CACHE_POLICIES["getBalance"][1]))
+    assert cache.get("getBalance", ["a"]) is None
+
+def test_slot_scoped_entry_expires_by_wall_clock(monkeypatch):
+    cache = xolana.ResponseCache()
+    now = time.monotonic()
+    cache.put("getEpochInfo", [], response({"absoluteSlot": 1, "slotIndex": 1, "slotsInEpoch": 10}))
+    monkeypatch.setattr(xolana.time, "monotonic", lambda: now + 10 * xolana.SLOT_TIME)
+    assert cache.get("getEpochInfo", []) is None
+
+def test_epoch_scoped_entry_lives_until_the_epoch_ends():
+    cache = xolana.ResponseCache()
+    cache.observe("getEpochInfo", response({"absoluteSlot": 990, "slotIndex": 90, "slotsInEpoch": 100}))
+    assert cache.epoch_end == 1000
+    cache.put("getVersion", [], response({"solana-core": "1.18.0"}))
+    cache.observe("getSlot", response(999))
+    assert cache.get("getVersion", []) is not None
+    cache.observe("getSlot", response(1000))
+    assert cache.get("getVersion", []) is None
+
+def test_least_recently_used_entries_are_evicted():
+    cache = xolana.ResponseCache(max_entries=2)
+    for address in "abc":
+        cache.put("getBalance", [address], response(1))
+        if address == "b":
+            cache.get("getBalance", ["a"])
+    assert cache.get("getBalance", ["a"]) is not None
+    assert cache.get("getBalance", ["b"]) is None
+    assert cache.stats()["evictions"] == 1
+
+def test_successful_send_invalidates_balances():
+    cache = xolana.ResponseCache()
+    cache.put("getBalance", ["a"], response(1))
+    cache.put("sendTransaction", ["tx"], {"jsonrpc": "2.0", "id": 1, "error": {"code": -32002, "message": "rejected"}})
+    assert cache.get("getBalance", ["a"]) is not None
+    cache.put("sendTransaction", ["tx"], response("signature"))
+    assert cache.get("getBalance", ["a"]) is None
+
+# Block until `count` callers have joined the in-flight call for `label`
+def wait_for_coalesced(label, count):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        if xolana.metrics.cache.get((label, "coalesced"), 0) >= count:
+            return
+        time.sleep(0.01)
+    raise AssertionError("callers did not join the flight")
+
+def test_single_flight_runs_one_fetch_and_hands_out_copies():
+    cache = xolana.ResponseCache()
+    release, calls, results = threading.Event(), [], []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return response({"nodes": [1, 2]})
+
+    threads = [threading.Thread(target=lambda: results.append(cache.single_flight("k", "test-fetch", fetch)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    wait_for_coalesced("test-fetch", 7)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(calls) == 1
+    assert len(results) == 8 and all(result == results[0] for result in results)
+    assert len({id(result) for result in results}) == 8
+
+def test_single_flight_shares_the_exception():
+    cache = xolana.ResponseCache()
+    release, errors = threading.Event(), []
+
+    def fetch():
+        release.wait(5)
+        raise xolana.RpcTransportError("down")
+
+    def call():
+        try:
+            cache.single_flight("k", "test-error", fetch)
+        except xolana.RpcTransportError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    wait_for_coalesced("test-error", 2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(errors) == 3
+
+def test_pool_serves_repeats_from_cache_and_refresh_bypasses_it(mock):
+    pool = xolana.rpc_client
+    first = pool.request("getVoteAccounts", [])
+    requests = mock.requests
+    assert pool.request("getVoteAccounts", []) == first
+    assert mock.requests == requests
+    pool.request("getVoteAccounts", [], refresh=True)
+    assert mock.requests == requests + 1
+
+def test_pool_batch_sends_only_misses(mock):
+    pool = xolana.rpc_client
+    pool.request("getVersion", [])
+    requests = mock.requests
+    version, slot = pool.batch([("getVersion", []), ("getSlot", [])])
+    assert "solana-core" in version["result"] and isinstance(slot["result"], int)
+    assert mock.requests == requests + 1
+
+def test_disabled_cache_neither_caches_nor_coalesces(mock):
+    pool = xolana.rpc_client
+    pool.cache.enabled = False
+    try:
+        pool.request("getClusterNodes", [])
+        requests = mock.requests
+        pool.request("getClusterNodes", [])
+        assert mock.requests == requests + 1
+        assert pool.cache.get("getClusterNodes", []) is None
+    finally:
+        pool.cache.enabled = True
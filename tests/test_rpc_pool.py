@@ -0,0 +1,55 @@
+import pytest
+
+import mock_xolana
+import xolana
+from conftest import start_mock
+
+def failing(self, params):
+    raise mock_xolana.MockError(-32000, "failed")
+
+@pytest.fixture
+def pool():
+    fast, slow = start_mock(latency=0.05), start_mock(latency=0.3)
+    pool = xolana.RpcPool([fast.url, slow.url], min_hedge_delay=0.01, default_hedge_delay=0.01)
+    yield pool, fast, slow
+    pool.close()
+    fast.stop()
+    slow.stop()
+
+def test_hedge_is_won_by_a_success_not_an_error(pool):
+    pool, fast, slow = pool
+    fast.METHODS = dict(fast.METHODS, getVersion=failing)
+    answer = pool.request("getVersion", [], refresh=True)
+    assert "result" in answer
+    assert pool.hedged == 1
+
+def test_error_is_returned_when_no_endpoint_succeeds(pool):
+    pool, fast, slow = pool
+    fast.METHODS = dict(fast.METHODS, getVersion=failing)
+    slow.METHODS = dict(slow.METHODS, getVersion=failing)
+    assert pool.request("getVersion", [], refresh=True)["error"]["message"] == "failed"
+
+def test_send_transaction_is_never_duplicated(pool):
+    pool, fast, slow = pool
+    answer = pool.request("sendTransaction", ["bm90IGEgdHJhbnNhY3Rpb24=", {"encoding": "base64"}])
+    assert "error" in answer
+    assert pool.hedged == 0 and pool.failovers == 0
+    assert slow.requests == 0
+
+def test_send_transaction_does_not_fail_over():
+    slow = start_mock()
+    pool = xolana.RpcPool(["http://127.0.0.1:9", slow.url], timeout=1)
+    try:
+        with pytest.raises(xolana.RpcTransportError):
+            pool.request("sendTransaction", ["bm90IGEgdHJhbnNhY3Rpb24=", {"encoding": "base64"}])
+        assert slow.requests == 0
+    finally:
+        pool.close()
+        slow.stop()
+
+def test_resolve_expired_asks_one_node_for_status_and_height(mock):
+    signature = mock_xolana.mock_signature("payout", 0)
+    statuses, expired = xolana.resolve_expired({signature: {"last_valid_block_height": 1}})
+    assert statuses == {signature: None} and expired == {signature}
+    statuses, expired = xolana.resolve_expired({signature: {"last_valid_block_height": 10**12}})
+    assert expired == set()
@@ -0,0 +1,147 @@
+import base64
+
+import pytest
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import MessageV0
+from solders.pubkey import Pubkey
+from solders.transaction import VersionedTransaction
+
+import mock_xolana
+import xolana
+
+AUTHORITY = mock_xolana.mock_pubkey("stake-authority", 0)
+
+def encode(payer, instructions):
+    message = MessageV0.try_compile(payer.pubkey(), instructions, [], Hash.default())
+    return base64.b64encode(bytes(VersionedTransaction(message, [payer]))).decode()
+
+def decode(payer, instructions):
+    tx_data = {"slot": 1, "transaction": [encode(payer, instructions), "base64"], "meta": {"fee": 5000}}
+    return xolana.decode_transaction(tx_data)["transaction"]
+
+def test_stake_instructions_round_trip():
+    authority = Keypair()
+    stake, vote, split = (str(Keypair().pubkey()) for _ in range(3))
+    me = str(authority.pubkey())
+    instructions = decode(authority, [
+        xolana.initialize_stake_instruction(stake, me),
+        xolana.delegate_stake_instruction(stake, vote, me),
+        xolana.split_stake_instruction(stake, split, me, 5),
+        xolana.withdraw_stake_instruction(stake, me, me, 9),
+        xolana.deactivate_stake_instruction(stake, me),
+    ])["message"]["instructions"]
+    assert [ix["program"] for ix in instructions] == ["stake"] * 5
+    parsed = [ix["parsed"] for ix in instructions]
+    assert parsed[0] == {"type": "initialize", "info": {"stakeAccount": stake,
+                                                        "authorized": {"staker": me, "withdrawer": me}}}
+    assert parsed[1] == {"type": "delegate", "info": {"stakeAccount": stake, "voteAccount": vote, "stakeAuthority": me}}
+    assert parsed[2] == {"type": "split", "info": {"stakeAccount": stake, "newSplitAccount": split,
+                                                   "stakeAuthority": me, "lamports": 5}}
+    assert parsed[3] == {"type": "withdraw", "info": {"stakeAccount": stake, "destination": me,
+                                                      "withdrawAuthority": me, "lamports": 9}}
+    assert parsed[4] == {"type": "deactivate", "info": {"stakeAccount": stake, "stakeAuthority": me}}
+
+def test_stake_accounts_are_decoded_from_filtered_scan(mock):
+    authority = mock_xolana.mock_pubkey("stake-authority", 0)
+    mock.config["size"] = 10
+    accounts, epoch = xolana.fetch_stake_accounts(authority)
+    assert epoch == mock.slot() // mock_xolana.SLOTS_PER_EPOCH
+    assert len(accounts) == 10
+    by_address = {account["address"]: account for account in accounts}
+    statuses = [by_address[mock_xolana.mock_pubkey("stake", i)]["status"] for i in range(5)]
+    assert statuses == ["undelegated", "active", "activating", "deactivating", "inactive"]
+    active = by_address[mock_xolana.mock_pubkey("stake", 1)]
+    assert active["voter"] == mock_xolana.mock_pubkey("vote", 1)
+    assert active["stake"] == active["lamports"] - mock_xolana.STAKE_RENT_EXEMPT_RESERVE
+    assert active["staker"] == active["withdrawer"] == authority
+    assert not active["locked"]
+    assert xolana.fetch_stake_accounts(str(Keypair().pubkey()))[0] == []
+
+def test_short_or_uninitialized_stake_accounts_are_skipped():
+    account = {"lamports": 1, "data": [base64.b64encode(bytes(xolana.STAKE_ACCOUNT_SIZE)).decode(), "base64"]}
+    assert xolana.decode_stake_account("x", account, 10) is None
+    account["data"][0] = base64.b64encode(b"\x01\x00\x00\x00").decode()
+    assert xolana.decode_stake_account("x", account, 10) is None
+
+def stake(i):
+    return mock_xolana.mock_pubkey("stake", i)
+
+def vote(i):
+    return mock_xolana.mock_pubkey("vote", i)
+
+def plan(*argv, authority=AUTHORITY):
+    args = xolana.parse_args(["stake", *argv])
+    accounts, _ = xolana.fetch_stake_accounts(authority)
+    return xolana.STAKE_PLANNERS[args.action](args, Pubkey.from_string(authority), accounts)
+
+def test_stake_validators_accumulate():
+    args = xolana.parse_args(["stake", "rebalance", "-v", "vote1:2", "--validator", "vote2", "--dry-run"])
+    assert args.action == "rebalance" and args.validator == ["vote1:2", "vote2"] and args.dry_run
+
+def test_stake_rejects_unknown_action():
+    with pytest.raises(SystemExit):
+        xolana.parse_args(["stake", "explode"])
+
+def test_deactivate_by_validator_still_needs_all(mock):
+    mock.config["size"] = 40
+    with pytest.raises(RuntimeError, match="--all"):
+        plan("deactivate", "--validator", vote(1))
+    operations = plan("deactivate", "--validator", vote(1), "--all")
+    # Stake 1 is active and stake 17 activating with vote 1; the others are idle or elsewhere
+    assert {operation["stake"] for operation in operations} == {stake(1), stake(17)}
+    assert len(operations) == 2 and {operation["validator"] for operation in operations} == {vote(1)}
+
+def test_deactivate_all_takes_active_and_activating_accounts(mock):
+    mock.config["size"] = 10
+    operations = plan("deactivate", "--all")
+    assert {operation["stake"] for operation in operations} == {stake(1), stake(2), stake(6), stake(7)}
+
+def test_named_accounts_must_qualify(mock):
+    mock.config["size"] = 10
+    assert [operation["stake"] for operation in plan("deactivate", stake(6))] == [stake(6)]
+    with pytest.raises(RuntimeError, match="is inactive"):
+        plan("deactivate", stake(6), stake(4))
+    with pytest.raises(RuntimeError, match="is not a stake account"):
+        plan("withdraw", str(Keypair().pubkey()))
+
+def test_withdraw_takes_idle_accounts_and_caps_the_amount(mock):
+    mock.config["size"] = 10
+    accounts = {account["address"]: account for account in xolana.fetch_stake_accounts(AUTHORITY)[0]}
+    operations = plan("withdraw", "--all", "--amount", "5")
+    assert {operation["stake"] for operation in operations} == {stake(0), stake(4), stake(5), stake(9)}
+    for operation in operations:
+        assert operation["lamports"] == min(5 * xolana.LAMPORTS_PER_SOL, accounts[operation["stake"]]["lamports"])
+        assert operation["recipient"] == AUTHORITY
+
+def test_delegate_spreads_idle_stake_by_weight(mock):
+    mock.config["size"] = 40
+    current = [account["votePubkey"] for account in
+               xolana.rpc_client.request("getVoteAccounts", [])["result"]["current"]][:2]
+    operations = plan("delegate", "--all", "-v", f"{current[0]}:3", "-v", current[1])
+    assert len(operations) == 16
+    delegated = {vote: sum(operation["lamports"] for operation in operations if operation["validator"] == vote)
+                 for vote in current}
+    assert delegated[current[0]] > 2 * delegated[current[1]]
+    with pytest.raises(RuntimeError, match="Not a current"):
+        plan("delegate", "--all", "-v", str(Keypair().pubkey()))
+
+def test_create_derives_seeded_accounts(mock):
+    mock.config["size"] = 10
+    operations = plan("create", "--amount", "2", "--count", "3")
+    program = Pubkey.from_string(xolana.STAKE_PROGRAM_ID)
+    assert [operation["stake"] for operation in operations] == [
+        str(Pubkey.create_with_seed(Pubkey.from_string(AUTHORITY), f"{xolana.STAKE_SEED_PREFIX}{n}", program))
+        for n in range(3)
+    ]
+    assert all(operation["lamports"] == 2 * xolana.LAMPORTS_PER_SOL for operation in operations)
+
+def test_operations_are_packed_sent_and_confirmed(mock):
+    keypair = Keypair()
+    mock.config.update(size=100, stake_authority=str(keypair.pubkey()))
+    operations = plan("deactivate", "--all", authority=str(keypair.pubkey()))
+    batches = xolana.pack_stake_operations(keypair.pubkey(), operations)
+    assert len(batches) > 1 and sum(len(batch) for batch in batches) == len(operations) == 40
+    summary = xolana.run_stake_operations(keypair, batches, poll_interval=0.05)
+    assert summary == {"done": 40, "failed": 0, "transactions": len(batches), "failures": []}
+    assert len(mock.sent) == len(batches)
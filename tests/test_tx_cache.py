@@ -0,0 +1,45 @@
+import mock_xolana
+import xolana
+
+SIGNATURES = [mock_xolana.mock_signature("history", i) for i in range(30)]
+
+def test_finalized_transaction_is_served_from_the_cache(mock, tx_cache):
+    first = xolana.fetch_transaction(SIGNATURES[0])
+    assert first["result"]["confirmationStatus"] == "finalized"
+    requests = mock.requests
+    second = xolana.fetch_transaction(SIGNATURES[0])
+    assert mock.requests == requests
+    assert second["result"] == first["result"]
+    assert tx_cache.stats()["transactions"] == 1
+
+def test_entry_under_the_other_encoding_is_used(mock, tx_cache):
+    xolana.fetch_transaction(SIGNATURES[0], encoding="jsonParsed")
+    requests = mock.requests
+    assert xolana.fetch_transaction(SIGNATURES[0], encoding="base64")["result"]["slot"] > 0
+    assert mock.requests == requests
+
+def test_use_cache_false_always_asks_the_node(mock, tx_cache):
+    xolana.fetch_transaction(SIGNATURES[0])
+    requests = mock.requests
+    xolana.fetch_transaction(SIGNATURES[0], use_cache=False)
+    assert mock.requests == requests + 1
+
+def test_prefetch_fetches_only_missing_signatures(mock, tx_cache):
+    xolana.fetch_transaction(SIGNATURES[0])
+    summary = xolana.prefetch_transactions(SIGNATURES + SIGNATURES[:5], tx_cache, batch_size=10)
+    assert summary == {"requested": 30, "cached": 1, "fetched": 29, "not_found": 0, "failed": 0}
+    assert tx_cache.contains(SIGNATURES, xolana.TX_ENCODING) == set(SIGNATURES)
+
+def test_least_recently_used_transactions_are_evicted(tmp_path):
+    cache = xolana.TransactionCache(str(tmp_path / "txcache.sqlite"), max_bytes=250)
+    try:
+        payload = {"slot": 1, "data": "x" * 80}
+        cache.put("a", payload)
+        cache.put("b", payload)
+        assert cache.get("a") == payload  # "b" is now the least recently used
+        cache.put("c", payload)
+        assert cache.get("b") is None
+        assert cache.get("a") == payload and cache.get("c") == payload
+        assert cache.stats()["bytes"] <= 250
+    finally:
+        cache.close()
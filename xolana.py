@@ -1,60 +1,1100 @@
+import time
+_START_TIME = time.perf_counter()
+
 import os
+import sys
+import csv
 import json
-import subprocess
-import requests
-from solders.keypair import Keypair
-from solders.pubkey import Pubkey
-from solders.transaction import VersionedTransaction
-from solders.system_program import TransferParams, transfer
-from solders.message import MessageV0
-from solders.rpc.requests import GetBalance, GetLatestBlockhash
-from solders.hash import Hash
-from base58 import b58encode
-from rich.console import Console
-from rich.prompt import Prompt
-from rich.panel import Panel
-from rich.style import Style
-from rich import box
-from rich.table import Table
-import time
+import argparse
+import base64
+import struct
+import threading
+import math
+import heapq
+import itertools
+import importlib
+import http.client
+from collections import deque, OrderedDict
+from urllib.parse import urlsplit, urlunsplit
+from decimal import Decimal, InvalidOperation
 from time import sleep 
-console = Console()
+
+# Heavy modules (rich, solders, numpy, asyncio, ...) are bound to stand-ins that
+# import them on first use, so a scripted command only pays for what it touches.
+class LazyImport:
+    def __init__(self, load):
+        object.__setattr__(self, "_load", load)
+        object.__setattr__(self, "_value", None)
+
+    def _resolve(self):
+        value = object.__getattribute__(self, "_value")
+        if value is None:
+            value = object.__getattribute__(self, "_load")()
+            object.__setattr__(self, "_value", value)
+        return value
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._resolve(), name, value)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __str__(self):
+        return str(self._resolve())
+
+    def __format__(self, spec):
+        return format(self._resolve(), spec)
+
+    def __enter__(self):
+        return self._resolve().__enter__()
+
+    def __exit__(self, *exc_info):
+        return self._resolve().__exit__(*exc_info)
+
+def lazy_import(module, attr=None):
+    def load():
+        loaded = importlib.import_module(module)
+        return getattr(loaded, attr) if attr else loaded
+    return LazyImport(load)
+
+asyncio = lazy_import("asyncio")
+gzip = lazy_import("gzip")
+pickle = lazy_import("pickle")
+sqlite3 = lazy_import("sqlite3")
+np = lazy_import("numpy")
+futures = lazy_import("concurrent.futures")
+ThreadPoolExecutor = lazy_import("concurrent.futures", "ThreadPoolExecutor")
+as_completed = lazy_import("concurrent.futures", "as_completed")
+Keypair = lazy_import("solders.keypair", "Keypair")
+Pubkey = lazy_import("solders.pubkey", "Pubkey")
+VersionedTransaction = lazy_import("solders.transaction", "VersionedTransaction")
+TransferParams = lazy_import("solders.system_program", "TransferParams")
+transfer = lazy_import("solders.system_program", "transfer")
+MessageV0 = lazy_import("solders.message", "MessageV0")
+to_bytes_versioned = lazy_import("solders.message", "to_bytes_versioned")
+Instruction = lazy_import("solders.instruction", "Instruction")
+AccountMeta = lazy_import("solders.instruction", "AccountMeta")
+CreateAccountWithSeedParams = lazy_import("solders.system_program", "CreateAccountWithSeedParams")
+create_account_with_seed = lazy_import("solders.system_program", "create_account_with_seed")
+AllocateWithSeedParams = lazy_import("solders.system_program", "AllocateWithSeedParams")
+allocate_with_seed = lazy_import("solders.system_program", "allocate_with_seed")
+Hash = lazy_import("solders.hash", "Hash")
+b58encode = lazy_import("base58", "b58encode")
+Console = lazy_import("rich.console", "Console")
+Group = lazy_import("rich.console", "Group")
+Prompt = lazy_import("rich.prompt", "Prompt")
+Panel = lazy_import("rich.panel", "Panel")
+Style = lazy_import("rich.style", "Style")
+box = lazy_import("rich.box")
+Table = lazy_import("rich.table", "Table")
+Live = lazy_import("rich.live", "Live")
+# orjson parses RPC responses several times faster than the json module; it is
+# optional and looked up on the first call so startup does not pay for it
+def json_loads(data):
+    global json_loads
+    try:
+        from orjson import loads
+    except ImportError:
+        loads = json.loads
+    json_loads = loads
+    return loads(data)
+
+console = LazyImport(lambda: Console())
+err_console = LazyImport(lambda: Console(stderr=True))
 
 # Constants
 LAMPORTS_PER_SOL = 10**9  # 1 SOL = 1 billion lamports
+MAX_LAMPORTS = 2**64 - 1  # Lamport amounts are u64 on chain
+MAX_MULTIPLE_ACCOUNTS = 100  # getMultipleAccounts accepts at most 100 keys per call
+MAX_SIGNATURE_STATUSES = 256  # getSignatureStatuses accepts at most 256 signatures per call
+PACKET_DATA_SIZE = 1232  # Max serialized transaction size (IPv6 MTU minus headers)
 RPC_URL = "http://xolana.xen.network:8899"  # Xolana X1 testnet RPC URL
+WS_URL = "ws://xolana.xen.network:8900"  # Xolana X1 testnet websocket (PubSub) URL
+COMMITMENT_LEVELS = ("processed", "confirmed", "finalized")
+XOLANA_CONFIG_DIR = os.path.expanduser("~/.config/xolana")  # Shared with xolana.sh
+TX_CACHE_PATH = os.path.join(XOLANA_CONFIG_DIR, "transactions.sqlite")
+TX_CACHE_MAX_BYTES = 256 * 1024 * 1024
+HISTORY_DB_PATH = os.path.join(XOLANA_CONFIG_DIR, "history.sqlite")
+MAX_SIGNATURES_PAGE = 1000  # getSignaturesForAddress page size limit
+TX_ENCODING = "base64"  # Wire encoding for getTransaction; decoded locally (see decode_transaction)
+VALIDATOR_SNAPSHOT_DIR = os.path.join(XOLANA_CONFIG_DIR, "validators")
+SOLANA_CONFIG_PATH = os.path.expanduser("~/.config/solana/cli/config.yml")
+DEFAULT_KEYPAIR_PATH = os.path.expanduser("~/.config/solana/id.json")
+RPC_ENDPOINTS_PATH = os.path.join(XOLANA_CONFIG_DIR, "endpoints.txt")  # Shared with xolana.sh
+SLOT_TIME = 0.4  # Target slot duration in seconds
+NODE_UNHEALTHY = -32005  # JSON-RPC error code for a node that is behind or unhealthy
+GOSSIP_SWEEP_PATH = os.path.join(XOLANA_CONFIG_DIR, "gossip_sweep.json")
+GOSSIP_SWEEP_TTL = 120  # Seconds a reachability sweep is reused before probing again
+RPC_CACHE_MAX_ENTRIES = 1024  # Responses kept by the in-memory RPC cache (least recently used are evicted)
+RPC_CACHE_MAX_BYTES = 64 * 1024 * 1024  # ... and their total pickled size
 
 # Styles
-green_style = Style(color="green", bold=True)
-dim_green_style = Style(color="green", dim=True)
-bright_green_style = Style(color="bright_green")
+green_style = LazyImport(lambda: Style(color="green", bold=True))
+dim_green_style = LazyImport(lambda: Style(color="green", dim=True))
+bright_green_style = LazyImport(lambda: Style(color="bright_green"))
+
+# Transport-level RPC failure: connection, timeout, HTTP error status or a
+# body that is not JSON. `kind` is the short label metrics count it under.
+class RpcTransportError(IOError):
+    def __init__(self, message, kind="transport"):
+        super().__init__(message)
+        self.kind = kind
+
+# Upper bounds (seconds) of the latency buckets exported to Prometheus
+METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Counters for one RPC method on one endpoint, or for one command
+class CallStats:
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.errors = {}
+        self.retries = {}
+        self.histogram = LatencyHistogram()
+        self.buckets = [0] * (len(METRICS_BUCKETS) + 1)  # Last slot is +Inf
+
+    def record(self, seconds, bytes_out=0, bytes_in=0, error=None):
+        self.calls += 1
+        self.seconds += seconds
+        self.bytes_out += bytes_out
+        self.bytes_in += bytes_in
+        self.histogram.record(seconds)
+        self.buckets[next((i for i, bound in enumerate(METRICS_BUCKETS) if seconds <= bound), -1)] += 1
+        if error:
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+    def merge(self, other):
+        self.calls += other.calls
+        self.seconds += other.seconds
+        self.bytes_out += other.bytes_out
+        self.bytes_in += other.bytes_in
+        for bucket, count in other.histogram.buckets.items():
+            self.histogram.buckets[bucket] = self.histogram.buckets.get(bucket, 0) + count
+        self.histogram.count += other.histogram.count
+        self.histogram.total += other.histogram.total
+        self.histogram.min = min(self.histogram.min, other.histogram.min)
+        self.histogram.max = max(self.histogram.max, other.histogram.max)
+        for counts, other_counts in ((self.errors, other.errors), (self.retries, other.retries)):
+            for key, count in other_counts.items():
+                counts[key] = counts.get(key, 0) + count
+
+# Process-wide instrumentation of RPC calls and commands. Recording is always
+# on (a lock and a few counters per call); --profile prints a breakdown at
+# exit, --trace streams every event as JSON lines and --metrics-port serves
+# the counters in Prometheus text format.
+class Metrics:
+    def __init__(self):
+        self.started = time.time()
+        self.rpc = {}  # (method, endpoint) -> CallStats
+        self.commands = {}  # name -> CallStats
+        self.cache = {}  # (method, "hit" | "miss" | "coalesced") -> count
+        self.gauges = {}  # name -> (type, help, callable returning a number)
+        self._trace = None
+        self._lock = threading.Lock()
+
+    def open_trace(self, path):
+        self._trace = open(path, "a", buffering=1)
+
+    def _emit(self, event):
+        if self._trace is not None:
+            event["ts"] = time.time()
+            self._trace.write(json.dumps(event) + "\n")
+
+    # One HTTP round trip carrying `calls` (JSON-RPC payloads). Each call in a
+    # batch is counted under its own method with the round-trip latency and an
+    # equal share of the bytes; error responses are counted by JSON-RPC code.
+    def record_rpc(self, calls, endpoint, seconds, bytes_out, bytes_in, response=None, error=None):
+        methods = {call["id"]: call["method"] for call in calls}
+        failed = {}
+        if error is None:
+            for item in response if isinstance(response, list) else [response]:
+                if isinstance(item, dict) and isinstance(item.get("error"), dict):
+                    failed[item.get("id")] = f"rpc {item['error'].get('code')}"
+        share_out, share_in = bytes_out // len(calls), bytes_in // len(calls)
+        with self._lock:
+            for call_id, method in methods.items():
+                stats = self.rpc.get((method, endpoint))
+                if stats is None:
+                    stats = self.rpc[(method, endpoint)] = CallStats()
+                stats.record(seconds, share_out, share_in, error or failed.get(call_id))
+            self._emit({"type": "rpc", "methods": list(methods.values()), "endpoint": endpoint,
+                        "ms": seconds * 1000, "bytes_out": bytes_out, "bytes_in": bytes_in,
+                        "error": error or (sorted(set(failed.values())) or None)})
+
+    # A reconnect after a stale keep-alive, a pool failover or a hedged duplicate
+    def record_retry(self, method, endpoint, kind):
+        with self._lock:
+            stats = self.rpc.get((method, endpoint))
+            if stats is None:
+                stats = self.rpc[(method, endpoint)] = CallStats()
+            stats.retries[kind] = stats.retries.get(kind, 0) + 1
+            self._emit({"type": "retry", "method": method, "endpoint": endpoint, "kind": kind})
+
+    # A response served from the RPC cache, a cache miss, or a call that
+    # waited on an identical one already in flight
+    def record_cache(self, method, outcome):
+        with self._lock:
+            self.cache[(method, outcome)] = self.cache.get((method, outcome), 0) + 1
+            self._emit({"type": "cache", "method": method, "outcome": outcome})
+
+    def record_command(self, name, seconds, error=None):
+        with self._lock:
+            stats = self.commands.get(name)
+            if stats is None:
+                stats = self.commands[name] = CallStats()
+            stats.record(seconds, error=error)
+            self._emit({"type": "command", "name": name, "ms": seconds * 1000, "error": error})
+
+    # Per-method totals across endpoints (or per endpoint across methods)
+    def rpc_totals(self, by="method"):
+        totals = {}
+        with self._lock:
+            for (method, endpoint), stats in self.rpc.items():
+                key = method if by == "method" else endpoint
+                totals.setdefault(key, CallStats()).merge(stats)
+        return totals
+
+    def render_profile(self, target=None):
+        target = target or err_console
+
+        def ms(histogram, pct):
+            value = histogram.percentile(pct)
+            return f"{value * 1000:.1f}" if value is not None else "-"
+
+        def count_map(counts):
+            return ", ".join(f"{key}: {count}" for key, count in sorted(counts.items())) or "-"
+
+        table = Table(title="RPC Profile (by method)", box=box.ROUNDED, border_style="green")
+        table.add_column("Method", style="bold cyan")
+        for column in ("Calls", "Total s", "p50 ms", "p99 ms", "Max ms", "KB out/in"):
+            table.add_column(column, justify="right")
+        table.add_column("Errors / Retries", style="yellow")
+        totals = sorted(self.rpc_totals().items(), key=lambda item: -item[1].seconds)
+        for method, stats in totals:
+            issues = [count_map(counts) for counts in (stats.errors, stats.retries) if counts]
+            table.add_row(
+                method, str(stats.calls), f"{stats.seconds:.3f}", ms(stats.histogram, 50), ms(stats.histogram, 99),
+                f"{stats.histogram.max * 1000:.1f}" if stats.calls else "-",
+                f"{stats.bytes_out / 1024:.1f}/{stats.bytes_in / 1024:.1f}", "; ".join(issues) or "-",
+            )
+        renderables = [table] if totals else ["[dim green]No RPC calls were made.[/]"]
+
+        endpoints = self.rpc_totals(by="endpoint")
+        if len(endpoints) > 1:
+            by_endpoint = Table(title="RPC Profile (by endpoint)", box=box.ROUNDED, border_style="green")
+            by_endpoint.add_column("Endpoint", style="bold cyan")
+            for column in ("Calls", "Errors", "p50 ms", "p99 ms"):
+                by_endpoint.add_column(column, justify="right")
+            for endpoint, stats in sorted(endpoints.items(), key=lambda item: item[1].histogram.percentile(50) or 0):
+                by_endpoint.add_row(endpoint, str(stats.calls), str(sum(stats.errors.values())),
+                                    ms(stats.histogram, 50), ms(stats.histogram, 99))
+            renderables.append(by_endpoint)
+
+        with self._lock:
+            commands = list(self.commands.items())
+            cache = {}
+            for (method, outcome), count in self.cache.items():
+                cache.setdefault(method, {})[outcome] = count
+        if cache:
+            by_cache = Table(title="RPC Cache", box=box.ROUNDED, border_style="green")
+            by_cache.add_column("Method", style="bold cyan")
+            for column in ("Hits", "Misses", "Coalesced", "Hit %"):
+                by_cache.add_column(column, justify="right")
+            for method, counts in sorted(cache.items(), key=lambda item: -sum(item[1].values())):
+                hits, misses = counts.get("hit", 0), counts.get("miss", 0)
+                by_cache.add_row(method, str(hits), str(misses), str(counts.get("coalesced", 0)),
+                                 f"{100 * hits / (hits + misses):.0f}" if hits + misses else "-")
+            renderables.append(by_cache)
+        if commands:
+            by_command = Table(title="Commands", box=box.ROUNDED, border_style="green")
+            by_command.add_column("Command", style="bold cyan")
+            for column in ("Runs", "Total s", "Max s"):
+                by_command.add_column(column, justify="right")
+            by_command.add_column("Errors", style="bold red")
+            for name, stats in commands:
+                by_command.add_row(name, str(stats.calls), f"{stats.seconds:.3f}", f"{stats.histogram.max:.3f}",
+                                   count_map(stats.errors))
+            renderables.append(by_command)
+        target.print(Panel(Group(*renderables), title="Profile", border_style="green"))
+
+    # Prometheus text exposition format (version 0.0.4)
+    def prometheus(self):
+        def labels(**values):
+            escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+                       for value in values.values())
+            return "{" + ",".join(f'{key}="{value}"' for key, value in zip(values, escaped)) + "}"
+
+        lines = []
+        def family(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{name}{suffix} {value}" for suffix, value in samples)
+
+        with self._lock:
+            rpc = [(method, endpoint, stats) for (method, endpoint), stats in sorted(self.rpc.items())]
+            commands = sorted(self.commands.items())
+            family("xolana_rpc_requests_total", "counter", "JSON-RPC calls by method and endpoint",
+                   [(labels(method=m, endpoint=e), st.calls) for m, e, st in rpc])
+            family("xolana_rpc_errors_total", "counter", "Failed JSON-RPC calls by error type",
+                   [(labels(method=m, endpoint=e, type=kind), count) for m, e, st in rpc for kind, count in st.errors.items()])
+            family("xolana_rpc_retries_total", "counter", "Reconnects, failovers and hedged duplicates",
+                   [(labels(method=m, endpoint=e, kind=kind), count) for m, e, st in rpc for kind, count in st.retries.items()])
+            family("xolana_rpc_sent_bytes_total", "counter", "Request bytes sent",
+                   [(labels(method=m, endpoint=e), st.bytes_out) for m, e, st in rpc])
+            family("xolana_rpc_received_bytes_total", "counter", "Response bytes received (as sent on the wire)",
+                   [(labels(method=m, endpoint=e), st.bytes_in) for m, e, st in rpc])
+            samples = []
+            for m, e, st in rpc:
+                cumulative = 0
+                for bound, count in zip(METRICS_BUCKETS + ("+Inf",), st.buckets):
+                    cumulative += count
+                    samples.append(("_bucket" + labels(method=m, endpoint=e, le=bound), cumulative))
+                samples.append(("_sum" + labels(method=m, endpoint=e), st.seconds))
+                samples.append(("_count" + labels(method=m, endpoint=e), st.calls))
+            family("xolana_rpc_latency_seconds", "histogram", "JSON-RPC round-trip latency", samples)
+            family("xolana_rpc_cache_total", "counter", "RPC cache hits, misses and coalesced concurrent calls",
+                   [(labels(method=m, outcome=outcome), count) for (m, outcome), count in sorted(self.cache.items())])
+            family("xolana_command_runs_total", "counter", "Commands and menu actions run",
+                   [(labels(command=name), st.calls) for name, st in commands])
+            family("xolana_command_seconds_total", "counter", "Time spent in commands and menu actions",
+                   [(labels(command=name), st.seconds) for name, st in commands])
+            gauges = list(self.gauges.items())
+        family("xolana_uptime_seconds", "gauge", "Seconds since the process started", [("", time.time() - self.started)])
+        for name, (kind, help_text, read) in gauges:
+            family(name, kind, help_text, [("", read())])
+        return "\n".join(lines) + "\n"
+
+    # Serve /metrics on a local port from a daemon thread
+    def serve(self, port, host="127.0.0.1"):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+        err_console.print(f"[dim green]Serving metrics on http://{host}:{server.server_port}/metrics[/]")
+        return server
+
+    def close(self):
+        if self._trace is not None:
+            self._trace.close()
+            self._trace = None
+
+metrics = Metrics()
+
+# Reusable JSON-RPC client: keep-alive connections (one per thread, reused
+# across calls), unique request ids and batch support so several calls share a
+# single HTTP round trip. Built on http.client so startup stays cheap.
+class RpcClient:
+    def __init__(self, url=RPC_URL, timeout=10):
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self.first_request_at = None
+        self.url = url
+
+    @property
+    def url(self):
+        return self._url
+
+    @url.setter
+    def url(self, url):
+        parts = urlsplit(url)
+        self._url = url
+        self._scheme = parts.scheme
+        self._host = parts.hostname
+        self._port = parts.port
+        self._path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self.close()
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            if self._scheme == "https":
+                import ssl
+                connection = http.client.HTTPSConnection(self._host, self._port, timeout=self.timeout,
+                                                         context=ssl.create_default_context())
+            else:
+                connection = http.client.HTTPConnection(self._host, self._port, timeout=self.timeout)
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _drop_connection(self, connection):
+        connection.close()
+        self._local.connection = None
+        with self._lock:
+            if connection in self._connections:
+                self._connections.remove(connection)
+
+    def _post(self, payload):
+        if self.first_request_at is None:
+            self.first_request_at = time.perf_counter()
+        calls = payload if isinstance(payload, list) else [payload]
+        body = json.dumps(payload).encode()
+        started = time.perf_counter()
+        data = b""
+        try:
+            data, gzipped = self._send(body, calls)
+            result = self._decode(data, gzipped)
+        except RpcTransportError as e:
+            metrics.record_rpc(calls, self.url, time.perf_counter() - started, len(body), len(data), error=e.kind)
+            raise
+        metrics.record_rpc(calls, self.url, time.perf_counter() - started, len(body), len(data), response=result)
+        return result
+
+    def _send(self, body, calls):
+        headers = {"Content-Type": "application/json", "Accept-Encoding": "gzip"}
+        for attempt in (1, 2):
+            connection = self._connection()
+            reused = connection.sock is not None
+            try:
+                connection.request("POST", self._path, body, headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (http.client.HTTPException, OSError) as e:
+                self._drop_connection(connection)
+                # The server may have closed an idle keep-alive connection; retry once on a fresh one
+                stale = isinstance(e, (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError))
+                if attempt == 1 and reused and stale:
+                    metrics.record_retry(calls[0]["method"], self.url, "reconnect")
+                    continue
+                raise RpcTransportError(f"{self.url}: {e}", kind=type(e).__name__) from e
+            break
+
+        if response.status >= 400:
+            raise RpcTransportError(f"{response.status} {response.reason} for url: {self.url}", kind=f"http {response.status}")
+        return data, response.getheader("Content-Encoding") == "gzip"
+
+    def _decode(self, data, gzipped):
+        if gzipped:
+            data = gzip.decompress(data)
+        try:
+            return json_loads(data)
+        except ValueError as e:
+            raise RpcTransportError(f"Invalid JSON from {self.url}: {e}", kind="invalid json") from e
+
+    def _payload(self, method, params):
+        return {
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params if params is not None else [],
+            "id": next(self._ids),
+        }
+
+    # Single call; returns the full JSON-RPC response object
+    def request(self, method, params=None):
+        return self._post(self._payload(method, params))
+
+    # Several calls in one POST; `calls` is a list of (method, params) and the
+    # responses come back in the same order, matched up by request id.
+    def batch(self, calls):
+        if not calls:
+            return []
+        payloads = [self._payload(method, params) for method, params in calls]
+        if len(payloads) == 1:
+            return [self._post(payloads[0])]
+
+        body = self._post(payloads)
+        if not isinstance(body, list):
+            # Node rejected the batch as a whole; fall back to one call per method
+            return [self._post(payload) for payload in payloads]
+
+        by_id = {item.get("id"): item for item in body if isinstance(item, dict)}
+        return [
+            by_id.get(payload["id"], {"error": {"code": -32603, "message": "Missing response in batch"}})
+            for payload in payloads
+        ]
+
+    def close(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+# Rolling health of one endpoint: recent latencies (for percentiles), an
+# exponentially weighted error rate and how many slots it trails the pool
+class EndpointHealth:
+    def __init__(self, url, window=64, alpha=0.2):
+        self.url = url
+        self.latencies = deque(maxlen=window)
+        self.alpha = alpha
+        self.error_rate = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.last_error = None
+        self.slot = None
+        self.slot_lag = 0
+        self._lock = threading.Lock()
+
+    def record(self, latency=None, error=None):
+        with self._lock:
+            self.requests += 1
+            self.error_rate *= 1 - self.alpha
+            if error is None:
+                self.latencies.append(latency)
+            else:
+                self.errors += 1
+                self.error_rate += self.alpha
+                self.last_error = error
+
+    def percentile(self, pct):
+        with self._lock:
+            samples = sorted(self.latencies)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(pct / 100 * len(samples)))]
+
+    # Lower is better: median latency inflated by the error rate, plus the time
+    # the node needs to catch up on the slots it is behind. Endpoints without
+    # samples yet are assumed to be middling so they still get tried.
+    def score(self, unknown_latency=0.25):
+        p50 = self.percentile(50)
+        latency = p50 if p50 is not None else unknown_latency
+        return latency * (1 + 10 * self.error_rate) + self.slot_lag * SLOT_TIME
+
+    def summary(self):
+        p50, p95 = self.percentile(50), self.percentile(95)
+        return {
+            "url": self.url,
+            "score": self.score(),
+            "p50_ms": p50 * 1000 if p50 is not None else None,
+            "p95_ms": p95 * 1000 if p95 is not None else None,
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": self.error_rate,
+            "slot": self.slot,
+            "slot_lag": self.slot_lag,
+            "last_error": self.last_error,
+        }
+
+# How long the in-memory RPC cache keeps a successful response, per method:
+# ("slot", N) for N slots, or ("epoch", None) until the current epoch ends.
+# Methods not listed (getSlot, blockhashes, signature statuses, sends, ...)
+# are never cached.
+RPC_CACHE_POLICIES = {
+    "getVersion": ("epoch", None),
+    "getGenesisHash": ("epoch", None),
+    "getEpochSchedule": ("epoch", None),
+    "getInflationGovernor": ("epoch", None),
+    "getInflationRate": ("epoch", None),
+    "getLeaderSchedule": ("epoch", None),
+    "getMinimumBalanceForRentExemption": ("epoch", None),
+    "getStakeMinimumDelegation": ("epoch", None),
+    "getBlockTime": ("epoch", None),  # Immutable once the block exists
+    "getClusterNodes": ("slot", 300),
+    "getSupply": ("slot", 150),
+    "getVoteAccounts": ("slot", 150),
+    "getBlockProduction": ("slot", 150),
+    "getRecentPerformanceSamples": ("slot", 25),
+    "getBalance": ("slot", 4),
+    "getEpochInfo": ("slot", 2),
+}
+RPC_CACHE_INVALIDATES = {  # Calls that change state cached under other methods
+    "sendTransaction": ("getBalance",),
+    "requestAirdrop": ("getBalance",),
+}
+EPOCH_CACHE_MAX_AGE = 3600  # Seconds an epoch-scoped entry lives while the epoch end is unknown
+
+# One in-flight request that identical concurrent callers wait on
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.waiters = 0
+        self.payload = None  # Pickled response, one copy per waiter
+        self.error = None
+
+# In-memory response cache and single-flight for the RPC pool. Age is
+# measured in slots: every response that carries one (context.slot, getSlot,
+# getEpochInfo) moves the cache's slot forward, and wall time counts at
+# SLOT_TIME per slot in between, so an entry expires after its TTL by
+# whichever clock is ahead. getEpochInfo also tells where the epoch ends.
+# Responses are stored pickled and every hit (or coalesced caller) gets its
+# own copy, so a caller that changes its response cannot corrupt anyone
+# else's. Memory is bounded by RPC_CACHE_MAX_ENTRIES and RPC_CACHE_MAX_BYTES
+# with least-recently-used eviction. Disabling the cache also turns
+# coalescing off (see RpcPool.request).
+class ResponseCache:
+    def __init__(self, policies=RPC_CACHE_POLICIES, max_entries=RPC_CACHE_MAX_ENTRIES,
+                 max_bytes=RPC_CACHE_MAX_BYTES):
+        self.policies = policies
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.enabled = True
+        self.entries = OrderedDict()  # key -> (method, slot, epoch_end, monotonic time, pickled response)
+        self.slot = None
+        self.slot_at = 0.0
+        self.epoch_end = None
+        self.evictions = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(method, params):
+        return method + json.dumps(params, sort_keys=True, separators=(",", ":"))
+
+    def cacheable(self, method):
+        return self.enabled and method in self.policies
+
+    # Estimated current slot: the newest observed slot plus the slots since
+    def current_slot(self):
+        if self.slot is None:
+            return None
+        return self.slot + int((time.monotonic() - self.slot_at) / SLOT_TIME)
+
+    def observe(self, method, response):
+        result = response.get("result") if isinstance(response, dict) else None
+        slot = epoch_end = None
+        if method == "getSlot" and isinstance(result, int):
+            slot = result
+        elif method == "getEpochInfo" and isinstance(result, dict) and "absoluteSlot" in result:
+            slot = result["absoluteSlot"]
+            epoch_end = slot - result["slotIndex"] + result["slotsInEpoch"]
+        elif isinstance(result, dict) and isinstance(result.get("context"), dict):
+            slot = result["context"].get("slot")
+        if not isinstance(slot, int):
+            return
+        with self._lock:
+            if self.slot is None or slot > self.slot:
+                self.slot, self.slot_at = slot, time.monotonic()
+            if epoch_end is not None:
+                self.epoch_end = epoch_end
+
+    def _expired(self, entry, now):
+        method, slot, epoch_end, filled_at, _ = entry
+        scope, ttl = self.policies[method]
+        if scope == "slot":
+            if (now - filled_at) / SLOT_TIME >= ttl:
+                return True
+            return slot is not None and self.slot is not None and self.slot - slot >= ttl
+        if self.epoch_end is None:
+            return now - filled_at >= EPOCH_CACHE_MAX_AGE
+        return epoch_end != self.epoch_end or self.current_slot() >= self.epoch_end
+
+    def get(self, method, params):
+        if not self.cacheable(method):
+            return None
+        key = self.key(method, params)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None and self._expired(entry, time.monotonic()):
+                self._drop(key)
+                entry = None
+            if entry is not None:
+                self.entries.move_to_end(key)
+        metrics.record_cache(method, "miss" if entry is None else "hit")
+        return None if entry is None else pickle.loads(entry[4])
+
+    def put(self, method, params, response):
+        self.observe(method, response)
+        if isinstance(response, dict) and "error" not in response and method in RPC_CACHE_INVALIDATES:
+            self.invalidate(*RPC_CACHE_INVALIDATES[method])
+        if not self.cacheable(method) or not isinstance(response, dict) or "result" not in response:
+            return
+        payload = pickle.dumps(response, pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            key = self.key(method, params)
+            if key in self.entries:
+                self._drop(key)
+            self.entries[key] = (method, self.current_slot(), self.epoch_end, time.monotonic(), payload)
+            self.bytes += len(payload)
+            while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._drop(next(iter(self.entries)))
+                self.evictions += 1
+
+    def _drop(self, key):
+        self.bytes -= len(self.entries.pop(key)[4])
+
+    # Drop cached responses of the given methods (all of them when none are given)
+    def invalidate(self, *methods):
+        with self._lock:
+            for key in [key for key, entry in self.entries.items() if not methods or entry[0] in methods]:
+                self._drop(key)
+
+    def clear(self):
+        self.invalidate()
+
+    # Run `fetch` once for all concurrent callers with the same key; the
+    # others wait for a copy of its response (or its exception)
+    def single_flight(self, key, label, fetch):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                flight.waiters += 1
+        if not leader:
+            metrics.record_cache(label, "coalesced")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return pickle.loads(flight.payload)
+        response = None
+        try:
+            response = fetch()
+            return response
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            if flight.waiters and flight.error is None:
+                flight.payload = pickle.dumps(response, pickle.HIGHEST_PROTOCOL)
+            flight.done.set()
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self.entries), "max_entries": self.max_entries, "bytes": self.bytes,
+                    "max_bytes": self.max_bytes, "evictions": self.evictions,
+                    "slot": self.current_slot(), "epoch_end": self.epoch_end, "in_flight": len(self._flights)}
+
+# Pool of RPC endpoints behind the RpcClient interface. Calls go to the
+# best-scoring endpoint; transport errors and unhealthy-node responses fail over
+# to the next one, and when the best endpoint is slower than its own
+# `hedge_percentile` latency a duplicate is raced on the runner-up. With a
+# single endpoint calls run inline with no extra threads.
+class RpcPool:
+    # Writes that go to the best endpoint only: never hedged, never failed over.
+    # A duplicate could double an airdrop, and a transaction sent to two nodes
+    # can be rejected by one while the other lands it.
+    UNHEDGED_METHODS = {"requestAirdrop", "sendTransaction"}
+
+    def __init__(self, urls=(RPC_URL,), timeout=10, hedge_percentile=95, min_hedge_delay=0.05,
+                 default_hedge_delay=1.0, health_interval=30.0, max_workers=16):
+        self.timeout = timeout
+        self.hedge_percentile = hedge_percentile
+        self.min_hedge_delay = min_hedge_delay
+        self.default_hedge_delay = default_hedge_delay
+        self.health_interval = health_interval
+        self.max_workers = max_workers
+        self.first_request_at = None
+        self.hedged = 0
+        self.failovers = 0
+        self._lock = threading.Lock()
+        self._executor = None
+        self._last_check = 0.0
+        self._checking = False
+        self.clients = {}
+        self.health = {}
+        self.cache = ResponseCache()
+        self.set_endpoints(urls)
+
+    def set_endpoints(self, urls):
+        self.close()
+        self.cache.clear()
+        with self._lock:
+            self.clients, self.health = {}, {}
+        for url in urls:
+            self.add(url)
+
+    def add(self, url):
+        url = url.rstrip("/")
+        with self._lock:
+            if url in self.clients:
+                return False
+            self.clients[url] = RpcClient(url, timeout=self.timeout)
+            self.health[url] = EndpointHealth(url)
+        return True
+
+    # Endpoints best first; ties keep configuration order
+    def ranked(self):
+        with self._lock:
+            order = {url: i for i, url in enumerate(self.clients)}
+            health = list(self.health.values())
+        return sorted(health, key=lambda h: (h.score(), order[h.url]))
+
+    @property
+    def url(self):
+        return self.ranked()[0].url
+
+    @url.setter
+    def url(self, url):
+        self.set_endpoints([url])
+
+    def hedge_delay(self, url):
+        health = self.health[url]
+        if len(health.latencies) < 10:
+            return self.default_hedge_delay
+        return max(self.min_hedge_delay, health.percentile(self.hedge_percentile))
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="rpc-pool")
+            return self._executor
+
+    # One call on one endpoint, recorded in its health. A node that answers but
+    # reports itself unhealthy counts as a failure so the pool moves on.
+    def _attempt(self, url, send):
+        client = self.clients[url]
+        health = self.health[url]
+        started = time.perf_counter()
+        try:
+            result = send(client)
+        except RpcTransportError as e:
+            health.record(error=str(e))
+            raise
+        items = result if isinstance(result, list) else [result]
+        for item in items:
+            error = item.get("error") if isinstance(item, dict) else None
+            if isinstance(error, dict) and error.get("code") == NODE_UNHEALTHY:
+                health.record(error=error.get("message"))
+                raise RpcTransportError(f"{url}: {error.get('message')}", kind="unhealthy")
+        health.record(latency=time.perf_counter() - started)
+        return result
+
+    # A JSON-RPC error answer, or a batch answer containing one
+    @staticmethod
+    def _is_error(result):
+        items = result if isinstance(result, list) else [result]
+        return any(isinstance(item, dict) and "error" in item for item in items)
+
+    # Run `send` on the best endpoint, racing a duplicate on the runner-up when
+    # it is slow and failing over on transport errors. Only a success wins the
+    # race: an error answer is returned once no other attempt is left. With
+    # hedge=False the call goes to the best endpoint alone.
+    def _dispatch(self, send, label, hedge=True):
+        if self.first_request_at is None:
+            self.first_request_at = time.perf_counter()
+        candidates = [health.url for health in self.ranked()]
+        if len(candidates) == 1 or not hedge:
+            return self._attempt(candidates[0], send)
+
+        self._maybe_check_health()
+        executor = self._get_executor()
+        remaining = iter(candidates)
+        pending = set()
+        errors = []
+
+        def launch():
+            url = next(remaining, None)
+            if url is not None:
+                pending.add(executor.submit(self._attempt, url, send))
+            return url
+
+        launch()
+        delay = self.hedge_delay(candidates[0])
+        answer = None
+        while pending:
+            done, _ = futures.wait(pending, timeout=delay, return_when=futures.FIRST_COMPLETED)
+            if not done:
+                # Slower than this endpoint's usual tail: race a duplicate on the runner-up
+                delay = None
+                url = launch()
+                if url:
+                    self.hedged += 1
+                    metrics.record_retry(label, url, "hedge")
+                continue
+            for future in done:
+                pending.discard(future)
+                try:
+                    result = future.result()
+                except RpcTransportError as e:
+                    errors.append(str(e))
+                    continue
+                if not self._is_error(result):
+                    return result
+                answer = answer or result
+            if not pending and answer is not None:
+                return answer
+            if not pending:
+                url = launch()
+                if url:
+                    self.failovers += 1
+                    metrics.record_retry(label, url, "failover")
+        raise RpcTransportError("All RPC endpoints failed: " + "; ".join(errors))
+
+    # Cached responses are served without a round trip and identical
+    # concurrent calls share one; refresh=True skips both and always asks the
+    # node (the fresh response is still cached for later callers)
+    def request(self, method, params=None, refresh=False):
+        if not refresh:
+            cached = self.cache.get(method, params)
+            if cached is not None:
+                return cached
+
+        def fetch():
+            response = self._dispatch(lambda client: client.request(method, params), method,
+                                      hedge=method not in self.UNHEDGED_METHODS)
+            self.cache.put(method, params, response)
+            return response
+        if refresh or not self.cache.enabled or method in self.UNHEDGED_METHODS:
+            return fetch()
+        return self.cache.single_flight(self.cache.key(method, params), method, fetch)
+
+    # Only the calls that miss the cache go out, still as one batch
+    def batch(self, calls, refresh=False):
+        if not calls:
+            return []
+        responses = [None if refresh else self.cache.get(method, params) for method, params in calls]
+        missing = [i for i, response in enumerate(responses) if response is None]
+        if not missing:
+            return responses
+        pending = [calls[i] for i in missing]
+        hedge = not any(method in self.UNHEDGED_METHODS for method, _ in pending)
+
+        def fetch():
+            fetched = self._dispatch(lambda client: client.batch(pending), "batch", hedge=hedge)
+            for (method, params), response in zip(pending, fetched):
+                self.cache.put(method, params, response)
+            return fetched
+        if refresh or not self.cache.enabled or not hedge:
+            fetched = fetch()
+        else:
+            key = "\n".join(self.cache.key(method, params) for method, params in pending)
+            fetched = self.cache.single_flight(key, "batch", fetch)
+        for i, response in zip(missing, fetched):
+            responses[i] = response
+        return responses
+
+    # getSlot on every endpoint at once; updates latency, errors and slot lag
+    def check(self):
+        urls = list(self.clients)
+        executor = self._get_executor()
+        slots = {}
+        tasks = {executor.submit(self._attempt, url, lambda client: client.request("getSlot", [])): url for url in urls}
+        for future in futures.as_completed(tasks):
+            try:
+                slots[tasks[future]] = future.result().get("result")
+            except RpcTransportError:
+                pass
+        newest = max((slot for slot in slots.values() if isinstance(slot, int)), default=None)
+        for url in urls:
+            health = self.health[url]
+            health.slot = slots.get(url)
+            if newest is not None and isinstance(health.slot, int):
+                health.slot_lag = newest - health.slot
+        self._last_check = time.monotonic()
+        return [health.summary() for health in self.ranked()]
+
+    # Refresh slot lag in the background once `health_interval` has passed
+    def _maybe_check_health(self):
+        with self._lock:
+            if self._checking or time.monotonic() - self._last_check < self.health_interval:
+                return
+            self._checking = True
+
+        def run():
+            try:
+                self.check()
+            finally:
+                self._checking = False
+        threading.Thread(target=run, name="rpc-pool-health", daemon=True).start()
+
+    # Seed the pool with the RPC addresses nodes advertise in gossip
+    def discover(self, limit=8):
+        response_json = self.request("getClusterNodes", [])
+        added = []
+        for url in cluster_rpc_urls(response_json.get("result") or []):
+            if len(added) >= limit:
+                break
+            if self.add(url):
+                added.append(url)
+        if added:
+            self.check()
+        return added
+
+    def close(self):
+        for client in list(self.clients.values()):
+            client.close()
+
+# HTTP URLs for the `rpc` addresses in a getClusterNodes result
+def cluster_rpc_urls(nodes):
+    urls = []
+    for node in nodes:
+        rpc = node.get("rpc")
+        if rpc and not rpc.startswith(("0.0.0.0", "127.", "[::]")):
+            urls.append(rpc if "://" in rpc else f"http://{rpc}")
+    return urls
+
+# Endpoints from the pool file (one URL per line, '#' comments), or the
+# default testnet endpoint
+def load_endpoints(path=RPC_ENDPOINTS_PATH):
+    try:
+        with open(path, "r") as endpoints_file:
+            urls = [line.split("#", 1)[0].strip() for line in endpoints_file]
+    except OSError:
+        return [RPC_URL]
+    return [url for url in urls if url] or [RPC_URL]
+
+def save_endpoints(urls, path=RPC_ENDPOINTS_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as endpoints_file:
+        endpoints_file.write("".join(f"{url}\n" for url in urls))
+
+rpc_client = RpcPool(load_endpoints())
+
+# Websocket URL for an RPC URL, following the validator convention of serving
+# PubSub on the RPC port + 1 (8899 -> 8900)
+def ws_url_for(rpc_url):
+    if rpc_url == RPC_URL:
+        return WS_URL
+    parts = urlsplit(rpc_url)
+    scheme = "wss" if parts.scheme == "https" else "ws"
+    netloc = parts.netloc
+    if parts.port:
+        netloc = f"{parts.hostname}:{parts.port + 1}"
+    return urlunsplit((scheme, netloc, parts.path, parts.query, parts.fragment))
 
 # Helper function to send RPC requests
 def send_rpc_request(method, params):
-    payload = {
-        "jsonrpc": "2.0",
-        "method": method,
-        "params": params,
-        "id": 1
-    }
     try:
-        response = requests.post(RPC_URL, json=payload, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        console.print(f"[bold red]Error sending RPC request: {e}[/bold red]")
+        return rpc_client.request(method, params)
+    except RpcTransportError as e:
+        err_console.print(f"[bold red]Error sending RPC request: {e}[/bold red]")
         return None
 
-# Helper function to get default keypair path from solana-cli config
-def get_default_keypair_path():
+# Helper function to send several RPC requests in one round trip
+def send_rpc_batch(calls):
     try:
-        result = subprocess.run(["solana", "config", "get"], capture_output=True, text=True)
-        for line in result.stdout.splitlines():
-            if "Keypair Path:" in line:
-                return line.split(":", 1)[1].strip()
-    except Exception as e:
-        console.print(f"[bold red]Failed to get default keypair path: {e}[/bold red]")
+        return rpc_client.batch(calls)
+    except RpcTransportError as e:
+        err_console.print(f"[bold red]Error sending RPC batch: {e}[/bold red]")
         return None
+
+# Helper function to get default keypair path from solana-cli config. Reads
+# config.yml directly instead of spawning `solana config get`.
+def get_default_keypair_path(config_path=SOLANA_CONFIG_PATH):
+    try:
+        with open(config_path, "r") as config_file:
+            for line in config_file:
+                key, _, value = line.partition(":")
+                if key.strip() == "keypair_path":
+                    return os.path.expanduser(value.strip().strip("'\""))
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        err_console.print(f"[bold red]Failed to read solana-cli config: {e}[/bold red]")
+    return DEFAULT_KEYPAIR_PATH if os.path.exists(DEFAULT_KEYPAIR_PATH) else None
     
 def splash_screen():
     art = """
@@ -127,18 +1167,19 @@ def check_balance(keypair=None, address=None):
         console.print(f"[bold red]No keypair loaded![/bold red]")
         return
     
-    # Get SOL balance
-    response_json = send_rpc_request("getBalance", [str(pubkey)])
-    
-    # Retrieve recent transactions (e.g., last 5)
-    transaction_history_json = send_rpc_request("getConfirmedSignaturesForAddress2", [str(pubkey), {"limit": 5}])
+    # Get SOL balance and recent transactions (e.g., last 5) in one round trip
+    responses = send_rpc_batch([
+        ("getBalance", [str(pubkey)]),
+        ("getConfirmedSignaturesForAddress2", [str(pubkey), {"limit": 5}]),
+    ])
+    response_json, transaction_history_json = responses if responses else (None, None)
 
     if response_json and 'result' in response_json and 'value' in response_json['result']:
         balance = response_json['result']['value']
         sol_balance = lamports_to_sol(balance)
         
         # Recent Transactions
-        transactions = transaction_history_json['result']
+        transactions = (transaction_history_json or {}).get('result') or []
         
         # Display information
         info_lines = [
@@ -155,6 +1196,95 @@ def check_balance(keypair=None, address=None):
     else:
         console.print(Panel(f"[bold red]Failed to retrieve balance. Response: {response_json}[/bold red]", border_style="red"))
 
+# Read addresses (one per line, blank lines and "#" comments ignored) and
+# validate them in a single pass. Returns (valid_pubkeys, invalid_lines).
+def read_addresses(stream):
+    valid, invalid = [], []
+    for line in stream:
+        address = line.split("#", 1)[0].strip()
+        if not address:
+            continue
+        try:
+            valid.append(Pubkey.from_string(address))
+        except ValueError:
+            invalid.append(address)
+    return valid, invalid
+
+# Fetch lamports for one chunk of up to 100 addresses with getMultipleAccounts.
+# dataSlice of length 0 keeps the account data out of the response.
+def fetch_balances_chunk(pubkeys):
+    response_json = rpc_client.request("getMultipleAccounts", [
+        [str(pubkey) for pubkey in pubkeys],
+        {"encoding": "base64", "dataSlice": {"offset": 0, "length": 0}},
+    ])
+    if 'error' in response_json:
+        raise RuntimeError(response_json['error'].get('message', response_json['error']))
+    accounts = response_json['result']['value']
+    return [
+        (str(pubkey), account['lamports'] if account else 0, account is not None)
+        for pubkey, account in zip(pubkeys, accounts)
+    ]
+
+# Bulk balance scan: chunks of 100 run concurrently (bounded by `concurrency`)
+# and rows are streamed to `out` as each chunk completes.
+def bulk_balance_scan(pubkeys, out, fmt="csv", concurrency=8):
+    chunks = [pubkeys[i:i + MAX_MULTIPLE_ACCOUNTS] for i in range(0, len(pubkeys), MAX_MULTIPLE_ACCOUNTS)]
+    totals = {"addresses": len(pubkeys), "found": 0, "missing": 0, "failed": 0, "lamports": 0}
+
+    writer = csv.writer(out) if fmt == "csv" else None
+    if writer:
+        writer.writerow(["address", "lamports", "xsol", "exists"])
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {executor.submit(fetch_balances_chunk, chunk): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            try:
+                rows = future.result()
+            except Exception as e:
+                chunk = futures[future]
+                totals["failed"] += len(chunk)
+                err_console.print(f"[bold red]Chunk starting at {chunk[0]} failed: {e}[/bold red]")
+                continue
+
+            for address, lamports, exists in rows:
+                totals["lamports"] += lamports
+                totals["found" if exists else "missing"] += 1
+                if writer:
+                    writer.writerow([address, lamports, f"{lamports_to_sol(lamports):.9f}", exists])
+                else:
+                    out.write(json.dumps({"address": address, "lamports": lamports, "exists": exists}) + "\n")
+            out.flush()
+
+    totals["elapsed"] = time.perf_counter() - start
+    return totals
+
+def bulk_scan_command(args):
+    if args.file == "-":
+        pubkeys, invalid = read_addresses(sys.stdin)
+    else:
+        with open(args.file, "r") as infile:
+            pubkeys, invalid = read_addresses(infile)
+
+    for address in invalid:
+        err_console.print(f"[bold red]Invalid public key skipped: {address}[/bold red]")
+
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        totals = bulk_balance_scan(pubkeys, out, fmt=args.format, concurrency=args.concurrency)
+    finally:
+        if args.output:
+            out.close()
+
+    err_console.print(Panel(
+        f"Addresses: {totals['addresses']} (invalid skipped: {len(invalid)})\n"
+        f"Existing accounts: {totals['found']}  Missing: {totals['missing']}  Failed: {totals['failed']}\n"
+        f"Total balance: [bright_green]{lamports_to_sol(totals['lamports']):.9f} xSOL[/]\n"
+        f"Elapsed: {totals['elapsed']:.2f}s",
+        title="Bulk Balance Scan", border_style="green",
+    ))
+    return 1 if totals["failed"] else 0
+
 def transfer_sol(keypair):
     recipient = Prompt.ask(f"[{dim_green_style}]Enter recipient's public key[/]")
     amount = float(Prompt.ask(f"[{dim_green_style}]Enter amount of SOL to send[/]"))
@@ -186,18 +1316,23 @@ def transfer_sol(keypair):
         serialized_tx = bytes(tx)
         encoded_tx = b58encode(serialized_tx).decode('utf-8')
         
+        sent_at = time.monotonic()
         result_json = send_rpc_request("sendTransaction", [encoded_tx])
         
         if result_json and 'result' in result_json:
             signature = result_json['result']
             console.print(Panel(f"Transaction sent!\nSignature: {signature}", border_style="green"))
 
+            # Wait for the cluster to confirm the transaction instead of sleeping a fixed time
+            tracker = ConfirmationTracker(rpc_client, ws_url_for(rpc_client.url), commitment="confirmed")
+            with console.status("[bright_green]Waiting for confirmation...[/]"):
+                result = tracker.wait([signature], timeout=60, sent_at={signature: sent_at})[signature]
 
-            # Wait for 5 seconds before checking the transaction status
-            console.print(Panel(f"Waiting for 10 seconds before checking transaction status for\n{signature[:80]}...", border_style="yellow"))
-            time.sleep(15)
+            if result["status"] == "timeout":
+                console.print(Panel(f"[bold yellow]Transaction not confirmed after 60 seconds:\n{signature}[/bold yellow]", border_style="yellow"))
+                return
+            console.print(f"[bright_green]Transaction {result['status']} in {result['elapsed']:.2f}s (slot {result['slot']})[/]")
 
-            # Check the transaction status after 5 seconds
             view_transaction_info(signature)
         else:
             console.print(Panel(f"[bold red]Failed to send transaction. Response: {result_json}[/bold red]", border_style="red"))
@@ -205,229 +1340,3088 @@ def transfer_sol(keypair):
         console.print(Panel(f"[bold red]Failed to send transaction: {e}[/bold red]", border_style="red"))
 
 
-# View Transaction Info
-def view_transaction_info(signature=None):
-    if not signature:
-        signature = Prompt.ask(f"[{dim_green_style}]Enter transaction signature[/]")
-    
-    try:
-        response_json = send_rpc_request("getTransaction", [
-            signature, 
-            {"encoding": "jsonParsed", "maxSupportedTransactionVersion": 0}
-        ])
-        
-        if response_json is None:
-            console.print(Panel("[bold red]Failed to retrieve transaction data. The RPC request failed.[/bold red]", border_style="red"))
-            return
+# Caches the latest blockhash and reuses it until the chain gets close to its
+# lastValidBlockHeight. Block height itself is polled at most once per interval.
+class BlockhashCache:
+    def __init__(self, client, margin=10, height_poll_interval=1.0):
+        self.client = client
+        self.margin = margin
+        self.height_poll_interval = height_poll_interval
+        self.blockhash = None
+        self.last_valid_block_height = 0
+        self._height = 0
+        self._height_checked = 0.0
+        self._lock = threading.Lock()
 
-        if 'result' not in response_json or response_json['result'] is None:
-            console.print(Panel("[bold red]Transaction not found or not confirmed. Please check the signature and try again.[/bold red]", border_style="red"))
-            return
+    def block_height(self):
+        now = time.monotonic()
+        if now - self._height_checked >= self.height_poll_interval:
+            response_json = self.client.request("getBlockHeight", [{"commitment": "confirmed"}])
+            if 'result' not in response_json:
+                raise RuntimeError(f"Failed to get block height. Response: {response_json}")
+            self._height = response_json['result']
+            self._height_checked = now
+        return self._height
 
-        tx_data = response_json['result']
-        
-        info = [
-            f"Signature: {signature}",
-            f"Slot: {tx_data['slot']}",
-            f"Block Time: {tx_data.get('blockTime', 'N/A')}",
-            f"Recent Blockhash: {tx_data['transaction']['message']['recentBlockhash']}",
-            "",
-            "Accounts:",
-        ]
-        
-        for account in tx_data['transaction']['message']['accountKeys']:
-            info.append(f"  - {account['pubkey']} (Writable: {account['writable']}, Signer: {account['signer']})")
-        
-        info.append("\nInstructions:")
-        for idx, instruction in enumerate(tx_data['transaction']['message']['instructions']):
-            info.append(f"  Instruction {idx + 1}:")
-            info.append(f"    Program: {instruction['program']}")
-            info.append(f"    Program ID: {instruction['programId']}")
-            if 'parsed' in instruction:
-                info.append(f"    Type: {instruction['parsed']['type']}")
-                for key, value in instruction['parsed']['info'].items():
-                    info.append(f"      {key}: {value}")
-            else:
-                info.append(f"    Data: {instruction['data']}")
-        
-        if 'meta' in tx_data and tx_data['meta'] is not None:
-            meta = tx_data['meta']
-            if meta.get('err'):
-                info.append(f"\n[bold red]Error:[/] {meta['err']}")
-            else:
-                info.append(f"\n[bold green]Transaction successful[/]")
-            
-            info.append(f"\nFee: {lamports_to_sol(meta['fee'])} SOL")
-            
-            if 'preBalances' in meta and 'postBalances' in meta:
-                info.append("\nBalance Changes:")
-                for i, (pre, post) in enumerate(zip(meta['preBalances'], meta['postBalances'])):
-                    change = post - pre
-                    if change != 0:
-                        info.append(f"  Account {i}: {lamports_to_sol(change):+.9f} SOL")
-            
-            if 'rewards' in meta and meta['rewards']:
-                info.append("\nRewards:")
-                for reward in meta['rewards']:
-                    info.append(f"  {reward['pubkey']}: {lamports_to_sol(reward['lamports']):+.9f} SOL (Type: {reward['rewardType']})")
-        
-        info.append(f"\nStatus: {tx_data.get('confirmationStatus', 'Unknown').capitalize()}")
-        
-        console.print(Panel("\n".join(info), title="Transaction Info", border_style="green"))
-        
-    except Exception as e:
-        console.print(Panel(f"[bold red]An error occurred while retrieving transaction info: {e}[/bold red]", border_style="red"))
+    def refresh(self):
+        response_json = self.client.request("getLatestBlockhash", [{"commitment": "confirmed"}])
+        if 'result' not in response_json or 'value' not in response_json['result']:
+            raise RuntimeError(f"Failed to get blockhash. Response: {response_json}")
+        value = response_json['result']['value']
+        self.blockhash = Hash.from_string(value['blockhash'])
+        self.last_valid_block_height = value['lastValidBlockHeight']
 
-def review_validators():
-    response_json = send_rpc_request("getVoteAccounts", [])
-    
-    if response_json and 'result' in response_json:
-        validators = response_json['result']['current']
-        
-        if not validators:
-            console.print(Panel("[bold red]No validators found.[/bold red]", border_style="red"))
-            return
-        
-        table = Table(title="Validators", box=box.ROUNDED)
-        table.add_column("Validator Identity", style="bold cyan")
-        table.add_column("Commission (%)", style="bold magenta")
-        table.add_column("Activated Stake (SOL)", style="bold green")
-        table.add_column("Last Vote", style="bold yellow")
-        table.add_column("Uptime (Epoch)", style="bold blue")
-
-        for validator in validators:
-            identity_pubkey = validator.get('nodePubkey', 'N/A')
-            commission = str(validator.get('commission', 'N/A'))
-            activated_stake = lamports_to_sol(validator.get('activatedStake', 0))
-            last_vote = str(validator.get('lastVote', 'N/A'))
-            uptime = str(validator.get('epochCredits', [['N/A']])[-1][1])  # Gets the last entry of epoch credits
-            
-            table.add_row(identity_pubkey, commission, f"{activated_stake:.2f}", last_vote, uptime)
+    def get(self):
+        with self._lock:
+            if self.blockhash is None or self.block_height() >= self.last_valid_block_height - self.margin:
+                self.refresh()
+            return self.blockhash, self.last_valid_block_height
 
-        console.print(Panel(table, title="Current Validators", border_style="green"))
-    else:
-        console.print(Panel(f"[bold red]Failed to retrieve validators. Response: {response_json}[/bold red]", border_style="red"))
+# Parse a payout list: "recipient,amount" per line (amount in xSOL). Blank
+# lines, "#" comments and a non-numeric header row are skipped.
+def load_payout_list(path):
+    payouts, errors = [], []
+    with open(path, "r", newline="") as infile:
+        for line_no, row in enumerate(csv.reader(infile), start=1):
+            if not row or not row[0].strip() or row[0].strip().startswith("#"):
+                continue
+            if len(row) < 2:
+                errors.append(f"line {line_no}: expected 'recipient,amount'")
+                continue
+            recipient, amount = row[0].strip(), row[1].strip()
+            try:
+                lamports = Decimal(amount) * LAMPORTS_PER_SOL
+            except InvalidOperation:
+                if not payouts and not errors:
+                    continue  # header row
+                errors.append(f"line {line_no}: invalid amount {amount!r}")
+                continue
+            if not lamports.is_finite():
+                errors.append(f"line {line_no}: invalid amount {amount!r}")
+                continue
+            try:
+                Pubkey.from_string(recipient)
+            except ValueError:
+                errors.append(f"line {line_no}: invalid public key {recipient!r}")
+                continue
+            if lamports < 1:
+                errors.append(f"line {line_no}: amount must be at least one lamport (0.000000001)")
+                continue
+            if lamports > MAX_LAMPORTS:
+                errors.append(f"line {line_no}: amount {amount!r} is too large")
+                continue
+            if lamports != lamports.to_integral_value():
+                errors.append(f"line {line_no}: amount {amount!r} is not a whole number of lamports (at most 9 decimals)")
+                continue
+            payouts.append({"line": line_no, "recipient": recipient, "lamports": int(lamports)})
+    return payouts, errors
 
-# Helper function to convert lamports to SOL
-def lamports_to_sol(lamports):
-    return lamports / 10**9
-def gossip_nodes():
-    response_json = send_rpc_request("getClusterNodes", [])
-    
-    if response_json and 'result' in response_json:
-        nodes = response_json['result']
-        
-        table = Table(title="Gossip Nodes", box=box.ROUNDED)
-        table.add_column("Node", style="bold green")
-        table.add_column("IP Address")
-        table.add_column("TPU Port")
-        
-        for node in nodes:
-            table.add_row(node['pubkey'], node.get('gossip', 'N/A'), str(node.get('tpu', 'N/A')))
-        
-        console.print(Panel(table, title="Gossip Nodes", border_style="green"))
-    else:
-        console.print(Panel(f"[bold red]Failed to retrieve gossip nodes. Response: {response_json}[/bold red]", border_style="red"))
-from time import sleep
+def build_transfer_message(payer, items, blockhash):
+    instructions = [
+        transfer(TransferParams(
+            from_pubkey=payer,
+            to_pubkey=Pubkey.from_string(item["recipient"]),
+            lamports=item["lamports"],
+        ))
+        for item in items
+    ]
+    return MessageV0.try_compile(
+        payer=payer,
+        instructions=instructions,
+        address_lookup_table_accounts=[],
+        recent_blockhash=blockhash,
+    )
 
-def network_testing():
-    console.print(Panel("[bold green]Network Test Running...[/bold green]", border_style="green"))
+# Serialized size of a single-signer transaction carrying `msg`
+def transaction_size(msg):
+    return 1 + 64 + len(to_bytes_versioned(msg))
 
-    # Initialize a list to store each ping result for the final summary table
-    ping_results = []
+# Greedily pack payouts into batches whose transaction fits in one packet.
+# Size does not depend on the blockhash value, so a placeholder is used.
+def pack_payouts(payer, payouts):
+    batches, current = [], []
+    for item in payouts:
+        candidate = current + [item]
+        if current and transaction_size(build_transfer_message(payer, candidate, Hash.default())) > PACKET_DATA_SIZE:
+            batches.append(current)
+            current = [item]
+        else:
+            current = candidate
+    if current:
+        batches.append(current)
+    return batches
 
-    try:
-        for seq in range(5):  # Running the ping 5 times
-            result = subprocess.run(["solana", "ping", "--count", "1"], capture_output=True, text=True)
-            if result.returncode == 0:
-                # Extract time from the result
-                output_lines = result.stdout.strip().splitlines()
-                time_line = next((line for line in output_lines if "time=" in line), "")
+# Append-only JSONL journal. Every batch is recorded (with its signature and
+# signed bytes) and fsync'd *before* it is sent, so after a crash each batch
+# can be resolved against the chain instead of being paid twice.
+class PayoutJournal:
+    def __init__(self, path):
+        self.path = path
+        self.entries = []
+        if os.path.exists(path):
+            with open(path, "r") as infile:
+                for line in infile:
+                    line = line.strip()
+                    if line:
+                        try:
+                            self.entries.append(json.loads(line))
+                        except json.JSONDecodeError:
+                            break  # torn final write from a crash
+        self._file = open(path, "a")
 
-                time_taken = time_line.split("time=")[1].strip() if time_line else "N/A"
+    def record(self, event, **fields):
+        entry = {"event": event, "time": time.time(), **fields}
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.entries.append(entry)
 
-                # Print each ping test result immediately without the signature
-                console.print(f"[bright_green]Ping Test {seq + 1} complete: {time_taken}[/]")
+    # Replay the journal: returns (paid line numbers, unsettled batches). Only
+    # a confirmation or an on-chain failure settles a batch. One that was
+    # still pending, expired or was rejected may have landed after all, so it
+    # is looked up again before any of its unpaid payees are re-packed.
+    def state(self):
+        batches = {}
+        for entry in self.entries:
+            if entry["event"] == "sent":
+                batches[entry["signature"]] = dict(entry, status="pending")
+            elif entry["signature"] in batches:
+                batches[entry["signature"]]["status"] = entry["event"]
+        paid = {item["line"] for batch in batches.values() if batch["status"] == "confirmed" for item in batch["items"]}
+        unsettled = {
+            sig: batch for sig, batch in batches.items()
+            if batch["status"] in ("pending", "expired", "rejected")
+            and any(item["line"] not in paid for item in batch["items"])
+        }
+        return paid, unsettled
 
-                # Store the results for the final table
-                ping_results.append((f"Ping Test - {seq + 1}", "✅ Success", time_taken))
-            else:
-                console.print(f"[bold red]Ping Test {seq + 1} failed[/bold red]")
-                ping_results.append((f"Ping Test - {seq + 1}", "❌ Failed", "N/A"))
-            
-            sleep(1)  # Adding a delay between pings
+    def close(self):
+        self._file.close()
 
-        # Create a table to display all results (without the signature column)
-        table = Table(title="Network Ping Test Results", box=box.ROUNDED, border_style="green")
-        table.add_column("Ping Test", style="bold cyan")
-        table.add_column("Status", style="bold green")
-        table.add_column("Time (ms)", style="bold yellow")
+# Statuses from the node's recent status cache. With search_history the node
+# also searches its ledger, which is slower but the only lookup whose "not
+# found" can be trusted for a transaction older than the cache.
+def fetch_signature_statuses(signatures, client=None, search_history=False):
+    client = client or rpc_client
+    statuses = {}
+    signatures = list(signatures)
+    for i in range(0, len(signatures), MAX_SIGNATURE_STATUSES):
+        chunk = signatures[i:i + MAX_SIGNATURE_STATUSES]
+        response_json = client.request("getSignatureStatuses", [chunk, {"searchTransactionHistory": search_history}])
+        values = (response_json.get('result') or {}).get('value') or [None] * len(chunk)
+        statuses.update(zip(chunk, values))
+    return statuses
 
-        for result in ping_results:
-            table.add_row(result[0], result[1], result[2])
+# Of the `batches` (signature -> batch with "last_valid_block_height") that
+# look expired, the ones that certainly never landed and no longer can: not
+# found by a history-searching lookup, with the blockhash past the last valid
+# finalized height of the same node. Statuses and height go out in one batch
+# per chunk so they come from one endpoint; a lagging node's "not found" is
+# never paired with another node's height. Also returns the statuses found,
+# for batches that did land.
+def resolve_expired(batches, client=None):
+    client = client or rpc_client
+    signatures = list(batches)
+    statuses, expired = {}, set()
+    for i in range(0, len(signatures), MAX_SIGNATURE_STATUSES):
+        chunk = signatures[i:i + MAX_SIGNATURE_STATUSES]
+        status_json, height_json = client.batch([
+            ("getSignatureStatuses", [chunk, {"searchTransactionHistory": True}]),
+            ("getBlockHeight", [{"commitment": "finalized"}]),
+        ])
+        values = (status_json.get('result') or {}).get('value')
+        height = height_json.get('result')
+        if values is None or not isinstance(height, int):
+            continue  # undecided; looked up again on the next poll
+        for signature, status in zip(chunk, values):
+            statuses[signature] = status
+            if status is None and height > batches[signature]["last_valid_block_height"]:
+                expired.add(signature)
+    return statuses, expired
 
-        console.print(table)
-        console.print(Panel("[bold green]Network Test Completed[/bold green]", border_style="green"))
+def send_raw_transaction(encoded_tx, skip_preflight=False):
+    return rpc_client.request("sendTransaction", [encoded_tx, {
+        "encoding": "base64",
+        "skipPreflight": skip_preflight,
+        "preflightCommitment": "confirmed",
+    }])
 
-    except Exception as e:
-        console.print(Panel(f"[bold red]An error occurred during the network test: {e}[/bold red]", border_style="red"))
+# Signatures of `pending` batches whose status was not found and whose
+# blockhash looks expired by `height`, confirmed with resolve_expired. Any
+# statuses it finds are merged into `statuses`.
+def expired_batches(pending, statuses, height):
+    stale = {signature: pending[signature] for signature, status in statuses.items()
+             if status is None and signature in pending and height > pending[signature]["last_valid_block_height"]}
+    if not stale:
+        return set()
+    found, expired = resolve_expired(stale)
+    statuses.update(found)
+    return expired
 
-def network_details(keypair):
-    console.print(Panel("[bright_green]Network & Wallet Information[/]", border_style="green"))
+# Send and confirm transactions with up to `max_inflight` unconfirmed at once.
+# Each entry of `queue` is a list of items for one transaction, compiled by
+# `build_message(payer, items, blockhash)`. Confirmation is by polling
+# signature statuses. Unconfirmed transactions are rebroadcast (same signed
+# bytes, so they can only land once) and given up only after their blockhash
+# expires and a history-searching lookup confirms they never landed; the item
+# list `on_expired` returns is then queued again. `pending` may hold batches
+# from an earlier run to resume. Callbacks get the signature and the batch
+# ({"items", "last_valid_block_height", "tx", "last_sent"}). Returns the
+# number of transactions sent.
+def send_and_confirm(keypair, queue, build_message, on_confirmed, on_failed, on_rejected,
+                     on_sent=None, on_expired=None, pending=None, max_inflight=16, skip_preflight=False,
+                     rebroadcast_interval=2.0, poll_interval=0.4):
+    payer = keypair.pubkey()
+    cache = BlockhashCache(rpc_client)
+    pending = {} if pending is None else pending
+    sends, sent = {}, 0
 
+    executor = ThreadPoolExecutor(max_workers=max(1, max_inflight))
     try:
-        # Wallet address and balance
-        wallet_address = keypair.pubkey()
-        response_json = send_rpc_request("getBalance", [str(wallet_address)])
-        wallet_balance = lamports_to_sol(response_json['result']['value']) if response_json and 'result' in response_json else "Failed to retrieve balance."
+        while queue or pending:
+            while queue and len(pending) < max_inflight:
+                items = queue.pop(0)
+                blockhash, last_valid = cache.get()
+                tx = VersionedTransaction(build_message(payer, items, blockhash), [keypair])
+                signature = str(tx.signatures[0])
+                batch = {"items": items, "last_valid_block_height": last_valid,
+                         "tx": base64.b64encode(bytes(tx)).decode("ascii")}
+                if on_sent:
+                    on_sent(signature, batch)
+                batch["last_sent"] = time.monotonic()
+                pending[signature] = batch
+                sends[signature] = executor.submit(send_raw_transaction, batch["tx"], skip_preflight)
+                sent += 1
 
-        # RPC URL
-        rpc_url = RPC_URL
+            # A preflight rejection means the node never forwarded the transaction
+            for signature, future in list(sends.items()):
+                if not future.done():
+                    continue
+                del sends[signature]
+                try:
+                    result_json = future.result()
+                except RpcTransportError:
+                    continue  # outcome unknown; resolved by status or expiry
+                if 'error' in result_json and signature in pending:
+                    on_rejected(signature, pending.pop(signature), result_json['error'])
 
-        # RPC Version
-        try:
-            version_result = subprocess.run(["solana", "--version"], capture_output=True, text=True)
-            rpc_version = version_result.stdout.strip().split(" ")[1]
-        except Exception as e:
-            rpc_version = f"Failed to retrieve version. Error: {e}"
+            if not pending:
+                continue
 
-        # RPC Health
-        try:
-            health_result = subprocess.run(["solana", "health"], capture_output=True, text=True)
-            rpc_health = health_result.stdout.strip()
-        except Exception as e:
-            rpc_health = f"Failed to retrieve health. Error: {e}"
+            time.sleep(poll_interval)
+            statuses = fetch_signature_statuses(pending.keys())
+            expired = expired_batches(pending, statuses, cache.block_height())
+            now = time.monotonic()
+            for signature, status in statuses.items():
+                batch = pending.get(signature)
+                if batch is None:
+                    continue
+                if status and status.get('confirmationStatus') in ("confirmed", "finalized"):
+                    del pending[signature]
+                    if status.get('err'):
+                        on_failed(signature, batch, status['err'])
+                    else:
+                        on_confirmed(signature, batch, status)
+                elif signature in expired:
+                    del pending[signature]
+                    items = on_expired(signature, batch, pending) if on_expired else batch["items"]
+                    if items:
+                        queue.append(items)
+                elif now - batch["last_sent"] >= rebroadcast_interval:
+                    batch["last_sent"] = now
+                    executor.submit(send_raw_transaction, batch["tx"], True)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return sent
 
-        # Current Slot
+# Payout engine: pack, sign and pipeline many transfers through
+# send_and_confirm. Every batch is journaled before it is sent. Batches left
+# unsettled by an earlier run are resumed: rebroadcast, and re-packed only once
+# they are known to have expired.
+def run_payouts(keypair, payouts, journal, max_inflight=16, skip_preflight=False,
+                rebroadcast_interval=2.0, poll_interval=0.4):
+    paid, pending = journal.state()
+    summary = {"paid": len(paid), "failed": 0, "lamports": 0, "transactions": 0}
+
+    resumed = {item["line"] for batch in pending.values() for item in batch["items"]}
+    remaining = [item for item in payouts if item["line"] not in paid and item["line"] not in resumed]
+    queue = pack_payouts(keypair.pubkey(), remaining)
+    for batch in pending.values():
+        batch["last_sent"] = 0.0  # rebroadcast resumed batches right away
+
+    def sent(signature, batch):
+        journal.record("sent", signature=signature, **batch)
+
+    def rejected(signature, batch, error):
+        journal.record("rejected", signature=signature, error=error)
+        summary["failed"] += len(batch["items"])
+        console.print(f"[bold red]Batch {signature[:16]}... rejected: {error.get('message')}[/bold red]")
+
+    def failed(signature, batch, err):
+        journal.record("failed", signature=signature, error=err)
+        summary["failed"] += len(batch["items"])
+        console.print(f"[bold red]Batch {signature[:16]}... failed on chain: {err}[/bold red]")
+
+    def confirmed(signature, batch, status):
+        journal.record("confirmed", signature=signature, slot=status.get('slot'))
+        new = [item for item in batch["items"] if item["line"] not in paid]
+        paid.update(item["line"] for item in new)
+        summary["paid"] += len(new)
+        summary["lamports"] += sum(item["lamports"] for item in new)
+        console.print(f"[bright_green]Paid {len(batch['items'])} recipients in {signature[:16]}...[/]")
+
+    # Never landed and no longer can: re-pack the payees that are not paid
+    # or still pending in another resumed batch
+    def expired(signature, batch, pending):
+        journal.record("expired", signature=signature)
+        elsewhere = paid | {item["line"] for other in pending.values() for item in other["items"]}
+        return [item for item in batch["items"] if item["line"] not in elsewhere]
+
+    summary["transactions"] = send_and_confirm(
+        keypair, queue, build_transfer_message, confirmed, failed, rejected, on_sent=sent, on_expired=expired,
+        pending=pending, max_inflight=max_inflight, skip_preflight=skip_preflight,
+        rebroadcast_interval=rebroadcast_interval, poll_interval=poll_interval,
+    )
+    return summary
+
+def payout_command(args):
+    keypair_path = args.keypair or get_default_keypair_path()
+    keypair = load_keypair(keypair_path) if keypair_path else None
+    if not keypair:
+        console.print("[bold red]Failed to load keypair. Exiting.[/bold red]")
+        return 1
+
+    payouts, errors = load_payout_list(args.file)
+    for error in errors:
+        console.print(f"[bold red]Invalid payout entry, {error}[/bold red]")
+    if errors and not args.skip_invalid:
+        console.print("[bold red]Fix the payout list or pass --skip-invalid.[/bold red]")
+        return 1
+
+    if args.dry_run:
+        batches = pack_payouts(keypair.pubkey(), payouts)
+        total = sum(item["lamports"] for item in payouts)
+        console.print(Panel(
+            f"Payouts: {len(payouts)} in {len(batches)} transactions\n"
+            f"Total: [bright_green]{lamports_to_sol(total):.9f} xSOL[/]",
+            title="Payout Plan", border_style="green",
+        ))
+        return 0
+
+    journal = PayoutJournal(args.journal or args.file + ".journal")
+    start = time.perf_counter()
+    try:
+        summary = run_payouts(keypair, payouts, journal, max_inflight=args.inflight,
+                              skip_preflight=args.skip_preflight)
+    finally:
+        journal.close()
+
+    console.print(Panel(
+        f"Paid: {summary['paid']} / {len(payouts)}  Failed: {summary['failed']}\n"
+        f"Sent this run: [bright_green]{lamports_to_sol(summary['lamports']):.9f} xSOL[/] in {summary['transactions']} transactions\n"
+        f"Elapsed: {time.perf_counter() - start:.2f}s\n"
+        f"Journal: {journal.path}",
+        title="Payout Summary", border_style="green" if not summary["failed"] else "red",
+    ))
+    return 0 if summary["paid"] == len(payouts) else 1
+
+# True if a getSignatureStatuses entry has reached the wanted commitment level
+def commitment_reached(status, commitment):
+    level = status.get('confirmationStatus') or "processed"
+    return COMMITMENT_LEVELS.index(level) >= COMMITMENT_LEVELS.index(commitment)
+
+# Watches many signatures at once until they reach a commitment level.
+# Notifications come from signatureSubscribe on the websocket endpoint; batched
+# getSignatureStatuses polling with exponential backoff runs alongside as the
+# fallback (and catches anything that landed before the subscription did).
+class ConfirmationTracker:
+    def __init__(self, client, ws_url=None, commitment="confirmed", poll_interval=0.25, max_poll_interval=2.0):
+        if commitment not in COMMITMENT_LEVELS:
+            raise ValueError(f"Unknown commitment level: {commitment}")
+        self.client = client
+        self.ws_url = ws_url
+        self.commitment = commitment
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+
+    # Block until every signature confirms, fails or `timeout` passes. Returns
+    # {signature: {"status", "slot", "err", "elapsed", "source"}} where status
+    # is the commitment level, "failed" or "timeout"; elapsed is measured from
+    # sent_at[signature] (a time.monotonic() value) when given.
+    def wait(self, signatures, timeout=60.0, sent_at=None):
+        return asyncio.run(self.wait_async(signatures, timeout, sent_at))
+
+    async def wait_async(self, signatures, timeout=60.0, sent_at=None):
+        start = time.monotonic()
+        sent_at = sent_at or {}
+        pending = set(signatures)
+        results = {}
+        done = asyncio.Event()
+        if not pending:
+            return results
+
+        def resolve(signature, slot, err, source):
+            if signature not in pending:
+                return
+            pending.discard(signature)
+            results[signature] = {
+                "status": "failed" if err else self.commitment,
+                "slot": slot,
+                "err": err,
+                "elapsed": time.monotonic() - sent_at.get(signature, start),
+                "source": source,
+            }
+            if not pending:
+                done.set()
+
+        tasks = [asyncio.create_task(self._poll(pending, resolve))]
+        if self.ws_url:
+            tasks.append(asyncio.create_task(self._subscribe(pending, resolve)))
         try:
-            slot_result = subprocess.run(["solana", "block", "get"], capture_output=True, text=True)
-            current_slot = slot_result.stdout.strip().split()[1]
-        except Exception as e:
-            current_slot = f"Failed to retrieve current slot. Error: {e}"
+            await asyncio.wait_for(done.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        for signature in pending:
+            results[signature] = {"status": "timeout", "slot": None, "err": None, "elapsed": None, "source": None}
+        return results
+
+    async def _poll(self, pending, resolve):
+        interval = self.poll_interval
+        while pending:
+            try:
+                statuses = await asyncio.to_thread(fetch_signature_statuses, list(pending), self.client)
+            except RpcTransportError:
+                statuses = {}
+            for signature, status in statuses.items():
+                if status and (status.get('err') or commitment_reached(status, self.commitment)):
+                    resolve(signature, status.get('slot'), status.get('err'), "poll")
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, self.max_poll_interval)
+
+    async def _subscribe(self, pending, resolve):
+        try:
+            import websockets
+        except ImportError:
+            return  # polling alone
+
+        ids = itertools.count(1)
+        requested, subscriptions = {}, {}
+        try:
+            async with websockets.connect(self.ws_url, max_size=None, close_timeout=1) as ws:
+                for signature in list(pending):
+                    request_id = next(ids)
+                    requested[request_id] = signature
+                    await ws.send(json.dumps({
+                        "jsonrpc": "2.0",
+                        "id": request_id,
+                        "method": "signatureSubscribe",
+                        "params": [signature, {"commitment": self.commitment}],
+                    }))
+                async for raw in ws:
+                    message = json.loads(raw)
+                    if message.get("id") in requested:
+                        subscriptions[message.get("result")] = requested.pop(message["id"])
+                    elif message.get("method") == "signatureNotification":
+                        params = message["params"]
+                        signature = subscriptions.pop(params["subscription"], None)
+                        value = params["result"]["value"]
+                        if signature and isinstance(value, dict) and "err" in value:
+                            resolve(signature, params["result"]["context"]["slot"], value["err"], "websocket")
+        except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException):
+            return  # polling carries on
+
+def confirm_command(args):
+    tracker = ConfirmationTracker(rpc_client, ws_url_for(rpc_client.url), commitment=args.commitment)
+    results = tracker.wait(args.signatures, timeout=args.timeout)
+    if args.json:
+        emit_json(results)
+        return 0 if all(result["status"] == args.commitment for result in results.values()) else 1
+
+    table = Table(title="Confirmation Status", box=box.ROUNDED, border_style="green")
+    table.add_column("Signature", style="bold cyan")
+    table.add_column("Status", style="bold green")
+    table.add_column("Slot", style="bold yellow")
+    table.add_column("Time (s)", style="bold magenta")
+    table.add_column("Source")
+    for signature in args.signatures:
+        result = results[signature]
+        status = result["status"] if not result["err"] else f"failed: {result['err']}"
+        elapsed = f"{result['elapsed']:.3f}" if result["elapsed"] is not None else "N/A"
+        table.add_row(signature, status, str(result["slot"] or "N/A"), elapsed, result["source"] or "N/A")
+    console.print(table)
+    return 0 if all(result["status"] == args.commitment for result in results.values()) else 1
+
+# Staking. Stake accounts of an authority are found with filtered
+# getProgramAccounts calls (memcmp on the staker and withdrawer fields, with a
+# dataSlice so only the fields below are sent) and decoded locally.
+# Operations are packed several to a transaction and pipelined like payouts.
+STAKE_PROGRAM_ID = "Stake11111111111111111111111111111111111111"
+STAKE_CONFIG_ID = "StakeConfig11111111111111111111111111111111"
+SYSVAR_CLOCK_ID = "SysvarC1ock11111111111111111111111111111111"
+SYSVAR_RENT_ID = "SysvarRent111111111111111111111111111111111"
+SYSVAR_STAKE_HISTORY_ID = "SysvarStakeHistory1111111111111111111111111"
+STAKE_ACCOUNT_SIZE = 200
+# StakeStateV2 up to the end of the Delegation: state tag, Meta (rent-exempt
+# reserve, staker, withdrawer, lockup), then voter, stake, activation and
+# deactivation epochs. The warmup rate, credits and flags after it are unused.
+STAKE_LAYOUT = struct.Struct("<IQ32s32sqQ32s32sQQQ")
+STAKER_OFFSET = 12
+WITHDRAWER_OFFSET = 44
+EPOCH_NONE = 2**64 - 1  # Deactivation epoch of stake that was never deactivated
+STAKE_SEED_PREFIX = "xolana-stake-"  # New accounts live at create_with_seed(authority, prefix + n)
+STAKE_IDLE = ("undelegated", "inactive")
+
+# Decode a (sliced) stake account. Warmup and cooldown are assumed to take a
+# single epoch, which holds unless a large share of the cluster moves at once.
+def decode_stake_account(address, account, epoch):
+    data = base64.b64decode(account['data'][0])
+    if len(data) < STAKE_LAYOUT.size:
+        return None
+    (state, reserve, staker, withdrawer, lockup_time, lockup_epoch, _custodian,
+     voter, stake, activation, deactivation) = STAKE_LAYOUT.unpack_from(data)
+    if state not in (1, 2):
+        return None  # uninitialized or rewards pool
+    delegated = state == 2
+    if not delegated:
+        status = "undelegated"
+    elif deactivation == EPOCH_NONE:
+        status = "activating" if activation >= epoch else "active"
+    elif deactivation == activation or deactivation < epoch:
+        status = "inactive"
+    else:
+        status = "deactivating"
+    return {
+        "address": address,
+        "lamports": account['lamports'],
+        "status": status,
+        "voter": str(Pubkey.from_bytes(voter)) if delegated else None,
+        "stake": stake if delegated else 0,
+        "activation_epoch": activation if delegated else None,
+        "deactivation_epoch": deactivation if delegated and deactivation != EPOCH_NONE else None,
+        "staker": str(Pubkey.from_bytes(staker)),
+        "withdrawer": str(Pubkey.from_bytes(withdrawer)),
+        "rent_exempt_reserve": reserve,
+        "locked": lockup_time > time.time() or lockup_epoch > epoch,
+    }
+
+# All stake accounts where `authority` is the staker or the withdrawer, largest
+# first, and the current epoch. Both filtered scans and getEpochInfo go out as
+# one batch, so enumeration costs a single round trip however many accounts.
+def fetch_stake_accounts(authority, client=None):
+    client = client or rpc_client
+    calls = [("getProgramAccounts", [STAKE_PROGRAM_ID, {
+        "encoding": "base64",
+        "commitment": "confirmed",
+        "dataSlice": {"offset": 0, "length": STAKE_LAYOUT.size},
+        "filters": [{"dataSize": STAKE_ACCOUNT_SIZE}, {"memcmp": {"offset": offset, "bytes": authority}}],
+    }]) for offset in (STAKER_OFFSET, WITHDRAWER_OFFSET)]
+    responses = client.batch(calls + [("getEpochInfo", [{"commitment": "confirmed"}])])
+    for response_json in responses:
+        if 'error' in response_json:
+            raise RuntimeError(f"Failed to fetch stake accounts: {response_json['error'].get('message')}")
+    epoch = responses[-1]['result']['epoch']
+    accounts = {}
+    for response_json in responses[:2]:
+        for entry in response_json['result']:
+            if entry['pubkey'] not in accounts:
+                stake_account = decode_stake_account(entry['pubkey'], entry['account'], epoch)
+                if stake_account:
+                    accounts[entry['pubkey']] = stake_account
+    return sorted(accounts.values(), key=lambda account: (-account["lamports"], account["address"])), epoch
+
+def stake_instruction(kind, accounts, data=b""):
+    return Instruction(Pubkey.from_string(STAKE_PROGRAM_ID), struct.pack("<I", kind) + data, [
+        AccountMeta(Pubkey.from_string(str(key)), is_signer, is_writable)
+        for key, is_signer, is_writable in accounts
+    ])
+
+# Staker and withdrawer both set to `authority`, no lockup
+def initialize_stake_instruction(stake, authority):
+    authority_bytes = bytes(Pubkey.from_string(str(authority)))
+    return stake_instruction(0, [(stake, False, True), (SYSVAR_RENT_ID, False, False)],
+                             authority_bytes * 2 + struct.pack("<qQ", 0, 0) + bytes(32))
+
+def delegate_stake_instruction(stake, vote, authority):
+    return stake_instruction(2, [
+        (stake, False, True), (vote, False, False), (SYSVAR_CLOCK_ID, False, False),
+        (SYSVAR_STAKE_HISTORY_ID, False, False), (STAKE_CONFIG_ID, False, False), (authority, True, False),
+    ])
+
+def split_stake_instruction(stake, split, authority, lamports):
+    return stake_instruction(3, [(stake, False, True), (split, False, True), (authority, True, False)],
+                             struct.pack("<Q", lamports))
+
+def withdraw_stake_instruction(stake, recipient, authority, lamports):
+    return stake_instruction(4, [
+        (stake, False, True), (recipient, False, True), (SYSVAR_CLOCK_ID, False, False),
+        (SYSVAR_STAKE_HISTORY_ID, False, False), (authority, True, False),
+    ], struct.pack("<Q", lamports))
+
+def deactivate_stake_instruction(stake, authority):
+    return stake_instruction(5, [(stake, False, True), (SYSVAR_CLOCK_ID, False, False), (authority, True, False)])
+
+# The next `count` unused seeded stake addresses of `authority`, as (seed, address)
+def stake_seed_addresses(authority, count, taken):
+    program_id = Pubkey.from_string(STAKE_PROGRAM_ID)
+    found = []
+    for n in itertools.count():
+        if len(found) == count:
+            return found
+        seed = f"{STAKE_SEED_PREFIX}{n}"
+        address = str(Pubkey.create_with_seed(authority, seed, program_id))
+        if address not in taken:
+            found.append((seed, address))
+
+def stake_rent_exempt_reserve():
+    response_json = rpc_client.request("getMinimumBalanceForRentExemption", [STAKE_ACCOUNT_SIZE])
+    if 'result' not in response_json:
+        raise RuntimeError(f"Failed to get rent-exempt reserve. Response: {response_json}")
+    return response_json['result']
+
+# --validator VOTE[:WEIGHT] arguments -> {vote: weight}
+def parse_validator_weights(values):
+    weights = {}
+    for value in values or []:
+        vote, _, weight = value.partition(":")
+        weight = float(weight) if weight else 1.0
+        if weight <= 0:
+            raise RuntimeError(f"Validator weight must be positive: {value}")
+        weights[str(Pubkey.from_string(vote))] = weight
+    return weights
+
+def check_vote_accounts(validators):
+    response_json = rpc_client.request("getVoteAccounts", [{"commitment": "confirmed"}])
+    if 'result' not in response_json:
+        raise RuntimeError(f"Failed to retrieve vote accounts. Response: {response_json}")
+    current = {account['votePubkey'] for account in response_json['result']['current']}
+    unknown = [vote for vote in validators if vote not in current]
+    if unknown:
+        raise RuntimeError(f"Not a current (non-delinquent) vote account: {', '.join(unknown)}")
+
+# Hand each account to the validator furthest below its target, largest
+# accounts first. `delegated` is the stake each target already has.
+def assign_validators(accounts, targets, delegated):
+    delegated = dict(delegated)
+    assignments = []
+    for account in sorted(accounts, key=lambda account: -account["lamports"]):
+        vote = max(targets, key=lambda vote: targets[vote] - delegated.get(vote, 0))
+        delegated[vote] = delegated.get(vote, 0) + account["lamports"]
+        assignments.append((account, vote))
+    return assignments
+
+def weighted_targets(weights, total):
+    weight_sum = sum(weights.values())
+    return {vote: total * weight / weight_sum for vote, weight in weights.items()}
+
+def stake_operation(action, stake, instructions, **fields):
+    return {"action": action, "stake": stake, "instructions": instructions, **fields}
+
+# Explicitly named accounts must all qualify; with --all every qualifying
+# account is used. `role` is the authority field the operation needs.
+def select_stake_accounts(args, accounts, authority, role, statuses):
+    eligible = {account["address"]: account for account in accounts
+                if account[role] == authority and account["status"] in statuses
+                and not (role == "withdrawer" and account["locked"])}
+    if args.accounts:
+        by_address = {account["address"]: account for account in accounts}
+        selected = []
+        for address in args.accounts:
+            if address not in eligible:
+                found = by_address.get(address)
+                reason = f"is {found['status']}" if found else f"is not a stake account of {authority}"
+                raise RuntimeError(f"Cannot {args.action} {address}: it {reason} "
+                                   f"(needs {role} authority and status {' or '.join(statuses)})")
+            selected.append(eligible[address])
+        return selected
+    if not args.all:
+        raise RuntimeError(f"Name the stake accounts to {args.action}, or pass --all")
+    return list(eligible.values())
+
+def plan_stake_create(args, authority, accounts):
+    if not args.amount:
+        raise RuntimeError("--amount is required for create")
+    lamports = int(Decimal(args.amount) * LAMPORTS_PER_SOL)
+    reserve = stake_rent_exempt_reserve()
+    if lamports <= reserve:
+        raise RuntimeError(f"Amount must exceed the rent-exempt reserve of {lamports_to_sol(reserve):.9f} xSOL")
+    weights = parse_validator_weights(args.validator)
+    if weights:
+        check_vote_accounts(weights)
+    new_accounts = [{"address": address, "seed": seed, "lamports": lamports}
+                    for seed, address in stake_seed_addresses(authority, args.count, {a["address"] for a in accounts})]
+    votes = dict((account["address"], vote) for account, vote in
+                 assign_validators(new_accounts, weighted_targets(weights, lamports * args.count), {})) if weights else {}
+    operations = []
+    for account in new_accounts:
+        instructions = [
+            create_account_with_seed(CreateAccountWithSeedParams(
+                from_pubkey=authority, to_pubkey=Pubkey.from_string(account["address"]), base=authority,
+                seed=account["seed"], lamports=lamports, space=STAKE_ACCOUNT_SIZE,
+                owner=Pubkey.from_string(STAKE_PROGRAM_ID),
+            )),
+            initialize_stake_instruction(account["address"], authority),
+        ]
+        vote = votes.get(account["address"])
+        if vote:
+            instructions.append(delegate_stake_instruction(account["address"], vote, authority))
+        operations.append(stake_operation("create", account["address"], instructions, validator=vote, lamports=lamports))
+    return operations
+
+def plan_stake_delegate(args, authority, accounts):
+    weights = parse_validator_weights(args.validator)
+    if not weights:
+        raise RuntimeError("--validator is required for delegate")
+    check_vote_accounts(weights)
+    selected = select_stake_accounts(args, accounts, str(authority), "staker", STAKE_IDLE)
+    targets = weighted_targets(weights, sum(account["lamports"] for account in selected))
+    return [
+        stake_operation("delegate", account["address"], [delegate_stake_instruction(account["address"], vote, authority)],
+                        validator=vote, lamports=account["lamports"])
+        for account, vote in assign_validators(selected, targets, {})
+    ]
+
+# --validator narrows the selection; it still needs named accounts or --all
+def plan_stake_deactivate(args, authority, accounts):
+    weights = parse_validator_weights(args.validator)
+    selected = [account for account in select_stake_accounts(args, accounts, str(authority), "staker",
+                                                             ("active", "activating"))
+                if not weights or account["voter"] in weights]
+    return [
+        stake_operation("deactivate", account["address"], [deactivate_stake_instruction(account["address"], authority)],
+                        validator=account["voter"], lamports=account["lamports"])
+        for account in selected
+    ]
+
+def plan_stake_withdraw(args, authority, accounts):
+    recipient = str(Pubkey.from_string(args.to)) if args.to else str(authority)
+    lamports = int(Decimal(args.amount) * LAMPORTS_PER_SOL) if args.amount else None
+    operations = []
+    for account in select_stake_accounts(args, accounts, str(authority), "withdrawer", STAKE_IDLE):
+        amount = min(lamports, account["lamports"]) if lamports else account["lamports"]
+        operations.append(stake_operation("withdraw", account["address"], [
+            withdraw_stake_instruction(account["address"], recipient, authority, amount),
+        ], lamports=amount, recipient=recipient))
+    return operations
+
+# Split one account into --count new seeded accounts of --amount each. The new
+# accounts are funded with the rent-exempt reserve first, as split requires.
+def plan_stake_split(args, authority, accounts):
+    if len(args.accounts or []) != 1 or not args.amount:
+        raise RuntimeError("split takes exactly one stake account and --amount")
+    source = select_stake_accounts(args, accounts, str(authority), "staker",
+                                   STAKE_IDLE + ("active", "activating"))[0]
+    lamports = int(Decimal(args.amount) * LAMPORTS_PER_SOL)
+    reserve = stake_rent_exempt_reserve()
+    operations = []
+    for seed, address in stake_seed_addresses(authority, args.count, {a["address"] for a in accounts}):
+        operations.append(stake_operation("split", address, [
+            transfer(TransferParams(from_pubkey=authority, to_pubkey=Pubkey.from_string(address), lamports=reserve)),
+            allocate_with_seed(AllocateWithSeedParams(
+                address=Pubkey.from_string(address), base=authority, seed=seed,
+                space=STAKE_ACCOUNT_SIZE, owner=Pubkey.from_string(STAKE_PROGRAM_ID),
+            )),
+            split_stake_instruction(source["address"], address, authority, lamports),
+        ], source=source["address"], validator=source["voter"], lamports=lamports))
+    return operations
+
+# Move the authority's stake toward the --validator weights: stake with other
+# validators is deactivated, overweight validators shed accounts while that
+# brings them closer to target, and idle accounts are delegated to whichever
+# target is furthest below. Deactivated stake becomes idle next epoch, so a
+# second run then finishes the move. Deactivating accounts are left alone.
+def plan_stake_rebalance(args, authority, accounts):
+    weights = parse_validator_weights(args.validator)
+    if not weights:
+        raise RuntimeError("--validator is required for rebalance")
+    check_vote_accounts(weights)
+    managed = [account for account in accounts
+               if account["staker"] == str(authority) and account["status"] != "deactivating"]
+    targets = weighted_targets(weights, sum(account["lamports"] for account in managed))
+    delegated = dict.fromkeys(weights, 0)
+    deactivate, idle = [], []
+    for account in managed:
+        if account["status"] in STAKE_IDLE:
+            idle.append(account)
+        elif account["voter"] in weights:
+            delegated[account["voter"]] += account["lamports"]
+        else:
+            deactivate.append(account)
+    for vote in weights:
+        staked = sorted((account for account in managed
+                         if account["voter"] == vote and account["status"] not in STAKE_IDLE),
+                        key=lambda account: -account["lamports"])
+        for account in staked:
+            if delegated[vote] - targets[vote] > account["lamports"] / 2:
+                deactivate.append(account)
+                delegated[vote] -= account["lamports"]
+
+    operations = [
+        stake_operation("deactivate", account["address"], [deactivate_stake_instruction(account["address"], authority)],
+                        validator=account["voter"], lamports=account["lamports"])
+        for account in deactivate
+    ]
+    operations += [
+        stake_operation("delegate", account["address"], [delegate_stake_instruction(account["address"], vote, authority)],
+                        validator=vote, lamports=account["lamports"])
+        for account, vote in assign_validators(idle, targets, delegated)
+    ]
+    return operations
+
+STAKE_PLANNERS = {
+    "create": plan_stake_create,
+    "delegate": plan_stake_delegate,
+    "deactivate": plan_stake_deactivate,
+    "withdraw": plan_stake_withdraw,
+    "split": plan_stake_split,
+    "rebalance": plan_stake_rebalance,
+}
+
+def build_stake_message(payer, operations, blockhash):
+    return MessageV0.try_compile(
+        payer=payer,
+        instructions=[instruction for operation in operations for instruction in operation["instructions"]],
+        address_lookup_table_accounts=[],
+        recent_blockhash=blockhash,
+    )
+
+# Greedily pack operations into transactions that fit in one packet; every
+# operation is signed by the authority alone, which is also the fee payer
+def pack_stake_operations(payer, operations):
+    batches, current = [], []
+    for operation in operations:
+        candidate = current + [operation]
+        if current and transaction_size(build_stake_message(payer, candidate, Hash.default())) > PACKET_DATA_SIZE:
+            batches.append(current)
+            current = [operation]
+        else:
+            current = candidate
+    if current:
+        batches.append(current)
+    return batches
+
+# Send and confirm stake transactions through send_and_confirm, re-packing on
+# blockhash expiry like run_payouts. No journal is kept, so an interrupted run
+# is not resumed. Running the command again plans afresh from the accounts'
+# current state: delegate, deactivate, rebalance and a full withdraw skip what
+# already landed, but create, split and a partial `withdraw --amount` are
+# counts and amounts and run again in full. Check `stake list` before
+# repeating those.
+def run_stake_operations(keypair, batches, max_inflight=16, skip_preflight=False,
+                         rebroadcast_interval=2.0, poll_interval=0.4):
+    summary = {"done": 0, "failed": 0, "transactions": 0, "failures": []}
+
+    def fail(batch, error):
+        summary["failed"] += len(batch["items"])
+        summary["failures"] += [{"action": operation["action"], "stake": operation["stake"], "error": error}
+                                for operation in batch["items"]]
+
+    def rejected(signature, batch, error):
+        fail(batch, error.get('message'))
+        err_console.print(f"[bold red]Transaction {signature[:16]}... rejected: {error.get('message')}[/bold red]")
+
+    def failed(signature, batch, err):
+        fail(batch, err)
+        err_console.print(f"[bold red]Transaction {signature[:16]}... failed on chain: {err}[/bold red]")
+
+    def confirmed(signature, batch, status):
+        summary["done"] += len(batch["items"])
+
+    summary["transactions"] = send_and_confirm(
+        keypair, list(batches), build_stake_message, confirmed, failed, rejected,
+        max_inflight=max_inflight, skip_preflight=skip_preflight,
+        rebroadcast_interval=rebroadcast_interval, poll_interval=poll_interval,
+    )
+    return summary
+
+def render_stake_accounts(accounts, authority, epoch):
+    table = Table(title=f"Stake Accounts of {authority}", box=box.ROUNDED, border_style="green")
+    table.add_column("Address", style="bold cyan")
+    table.add_column("Status", style="bold green")
+    table.add_column("Balance (xSOL)", justify="right", style="bold yellow")
+    table.add_column("Validator")
+    table.add_column("Activated", justify="right")
+    table.add_column("Deactivated", justify="right")
+    totals = {}
+    for account in accounts:
+        totals[account["status"]] = totals.get(account["status"], 0) + account["lamports"]
+        table.add_row(
+            account["address"],
+            account["status"] + (" (locked)" if account["locked"] else ""),
+            f"{lamports_to_sol(account['lamports']):,.4f}",
+            account["voter"] or "-",
+            str(account["activation_epoch"]) if account["activation_epoch"] is not None else "-",
+            str(account["deactivation_epoch"]) if account["deactivation_epoch"] is not None else "-",
+        )
+    console.print(table)
+    lines = [f"Epoch: {epoch}  Accounts: {len(accounts)}"]
+    lines += [f"{status.capitalize()}: [bright_green]{lamports_to_sol(lamports):,.4f} xSOL[/]"
+              for status, lamports in sorted(totals.items())]
+    console.print(Panel("\n".join(lines), title="Stake Summary", border_style="green"))
+
+def render_stake_plan(operations, batches, accounts, epoch):
+    counts = {}
+    for operation in operations:
+        counts[operation["action"]] = counts.get(operation["action"], 0) + 1
+    lines = [
+        f"Epoch: {epoch}  Stake accounts: {len(accounts)}",
+        "Operations: " + (", ".join(f"{action} {count}" for action, count in counts.items()) or "none"),
+        f"Transactions: {len(batches)}",
+    ]
+    by_validator = {}
+    for account in accounts:
+        if account["voter"] and account["status"] in ("active", "activating"):
+            by_validator.setdefault(account["voter"], [0, 0])[0] += account["lamports"]
+    for operation in operations:
+        if operation["action"] in ("delegate", "create") and operation.get("validator"):
+            by_validator.setdefault(operation["validator"], [0, 0])[1] += operation["lamports"]
+        elif operation["action"] == "deactivate":
+            by_validator[operation["validator"]][1] -= operation["lamports"]
+    table = Table(box=box.SIMPLE)
+    table.add_column("Validator", style="bold cyan")
+    table.add_column("Staked now (xSOL)", justify="right")
+    table.add_column("Change (xSOL)", justify="right")
+    for vote, (staked, change) in sorted(by_validator.items(), key=lambda item: -sum(item[1])):
+        if change:
+            table.add_row(vote, f"{lamports_to_sol(staked):,.4f}", f"{lamports_to_sol(change):+,.4f}")
+    console.print(Panel(Group("\n".join(lines), table) if table.row_count else "\n".join(lines),
+                        title="Stake Plan", border_style="green"))
+
+def stake_command(args):
+    if args.action == "list":
+        authority = str(Pubkey.from_string(args.authority)) if args.authority else str(load_command_keypair(args).pubkey())
+        accounts, epoch = fetch_stake_accounts(authority)
+        if args.json:
+            emit_json({"authority": authority, "epoch": epoch, "accounts": accounts})
+        else:
+            render_stake_accounts(accounts, authority, epoch)
+        return 0
+
+    keypair = load_command_keypair(args)
+    authority = keypair.pubkey()
+    accounts, epoch = fetch_stake_accounts(str(authority))
+    operations = STAKE_PLANNERS[args.action](args, authority, accounts)
+    batches = pack_stake_operations(authority, operations)
+    plan = [{key: value for key, value in operation.items() if key != "instructions"} for operation in operations]
+    if not args.json:
+        render_stake_plan(operations, batches, accounts, epoch)
+    if args.dry_run or not operations:
+        if args.json:
+            emit_json({"epoch": epoch, "transactions": len(batches), "operations": plan})
+        return 0
+
+    start = time.perf_counter()
+    summary = run_stake_operations(keypair, batches, max_inflight=args.inflight, skip_preflight=args.skip_preflight)
+    summary["elapsed"] = time.perf_counter() - start
+    if args.json:
+        emit_json({"epoch": epoch, "operations": plan, **summary})
+    else:
+        console.print(Panel(
+            f"Completed: {summary['done']} / {len(operations)}  Failed: {summary['failed']}\n"
+            f"Transactions: {summary['transactions']}\n"
+            f"Elapsed: {summary['elapsed']:.2f}s",
+            title="Stake Summary", border_style="green" if not summary["failed"] else "red",
+        ))
+    return 0 if summary["done"] == len(operations) else 1
+
+SYSTEM_PROGRAM_ID = "11111111111111111111111111111111"
+COMPUTE_BUDGET_PROGRAM_ID = "ComputeBudget111111111111111111111111111111"
+MEMO_PROGRAM_IDS = ("MemoSq4gqABAXKb96qnH8TysNcWxMyWCqXgDLGmfcHr", "Memo1UhkJRfHyvLMcVucJwxXeuD728EqVDDwQDxFMNo")
+
+def decode_system_instruction(data, accounts):
+    if len(data) < 4:
+        return None
+    kind = struct.unpack_from("<I", data)[0]
+    if kind == 2 and len(data) >= 12:
+        return {"type": "transfer", "info": {
+            "source": accounts[0], "destination": accounts[1], "lamports": struct.unpack_from("<Q", data, 4)[0],
+        }}
+    if kind == 0 and len(data) >= 52:
+        lamports, space = struct.unpack_from("<QQ", data, 4)
+        return {"type": "createAccount", "info": {
+            "source": accounts[0], "newAccount": accounts[1], "lamports": lamports, "space": space,
+            "owner": str(Pubkey.from_bytes(data[20:52])),
+        }}
+    if kind == 1 and len(data) >= 36:
+        return {"type": "assign", "info": {"account": accounts[0], "owner": str(Pubkey.from_bytes(data[4:36]))}}
+    return None
+
+def decode_compute_budget_instruction(data, accounts):
+    if data[:1] == b"\x02" and len(data) >= 5:
+        return {"type": "setComputeUnitLimit", "info": {"units": struct.unpack_from("<I", data, 1)[0]}}
+    if data[:1] == b"\x03" and len(data) >= 9:
+        return {"type": "setComputeUnitPrice", "info": {"microLamports": struct.unpack_from("<Q", data, 1)[0]}}
+    return None
+
+def decode_memo_instruction(data, accounts):
+    try:
+        return {"type": "memo", "info": {"memo": data.decode()}}
+    except UnicodeDecodeError:
+        return None
+
+STAKE_INSTRUCTION_ACCOUNTS = {
+    2: ("delegate", ("stakeAccount", "voteAccount", None, None, None, "stakeAuthority")),
+    3: ("split", ("stakeAccount", "newSplitAccount", "stakeAuthority")),
+    4: ("withdraw", ("stakeAccount", "destination", None, None, "withdrawAuthority")),
+    5: ("deactivate", ("stakeAccount", None, "stakeAuthority")),
+    7: ("merge", ("destination", "source", None, None, "stakeAuthority")),
+}
+
+def decode_stake_instruction(data, accounts):
+    if len(data) < 4:
+        return None
+    kind = struct.unpack_from("<I", data)[0]
+    if kind == 0 and len(data) >= 68:
+        return {"type": "initialize", "info": {
+            "stakeAccount": accounts[0],
+            "authorized": {"staker": str(Pubkey.from_bytes(data[4:36])), "withdrawer": str(Pubkey.from_bytes(data[36:68]))},
+        }}
+    if kind not in STAKE_INSTRUCTION_ACCOUNTS:
+        return None
+    name, fields = STAKE_INSTRUCTION_ACCOUNTS[kind]
+    info = {field: account for field, account in zip(fields, accounts) if field}
+    if kind in (3, 4) and len(data) >= 12:
+        info["lamports"] = struct.unpack_from("<Q", data, 4)[0]
+    return {"type": name, "info": info}
+
+# Program id -> (name shown as "Program", decoder returning a jsonParsed-style
+# {"type", "info"} dict or None when the instruction is not recognized)
+INSTRUCTION_DECODERS = {
+    SYSTEM_PROGRAM_ID: ("system", decode_system_instruction),
+    COMPUTE_BUDGET_PROGRAM_ID: ("compute-budget", decode_compute_budget_instruction),
+    STAKE_PROGRAM_ID: ("stake", decode_stake_instruction),
+    **{program_id: ("spl-memo", decode_memo_instruction) for program_id in MEMO_PROGRAM_IDS},
+}
+
+# Turn a base64 getTransaction result into the jsonParsed layout the viewer
+# renders: account keys with writable/signer flags, and instructions decoded
+# by the built-in decoders or left as base58 data. `meta` (fee, balances,
+# logs) is already JSON in every encoding and passes through untouched.
+def decode_transaction(tx_data):
+    encoded = tx_data['transaction']
+    if not isinstance(encoded, list):
+        return tx_data
+    tx = VersionedTransaction.from_bytes(base64.b64decode(encoded[0]))
+    message = tx.message
+    header = message.header
+    static_keys = [str(key) for key in message.account_keys]
+    loaded = (tx_data.get('meta') or {}).get('loadedAddresses') or {}
+    loaded_writable, loaded_readonly = loaded.get('writable', []), loaded.get('readonly', [])
+    keys = static_keys + loaded_writable + loaded_readonly
+
+    signers = header.num_required_signatures
+    writable_signers = signers - header.num_readonly_signed_accounts
+    writable_unsigned_end = len(static_keys) - header.num_readonly_unsigned_accounts
+    program_indexes = {instruction.program_id_index for instruction in message.instructions}
+
+    account_keys = []
+    for index, key in enumerate(keys):
+        if index < len(static_keys):
+            writable = index < writable_signers or signers <= index < writable_unsigned_end
+            source = "transaction"
+        else:
+            writable = index < len(static_keys) + len(loaded_writable)
+            source = "lookupTable"
+        account_keys.append({
+            "pubkey": key,
+            "writable": writable and index not in program_indexes,
+            "signer": index < signers,
+            "source": source,
+        })
+
+    instructions = []
+    for compiled in message.instructions:
+        program_id = keys[compiled.program_id_index]
+        accounts = [keys[index] for index in bytes(compiled.accounts)]
+        data = bytes(compiled.data)
+        name, decoder = INSTRUCTION_DECODERS.get(program_id, ("unknown", None))
+        parsed = decoder(data, accounts) if decoder else None
+        if parsed is not None:
+            instructions.append({"program": name, "programId": program_id, "parsed": parsed, "stackHeight": None})
+        else:
+            instructions.append({"program": name, "programId": program_id, "accounts": accounts,
+                                 "data": b58encode(data).decode(), "stackHeight": None})
+
+    decoded = dict(tx_data)
+    decoded['transaction'] = {
+        "signatures": [str(signature) for signature in tx.signatures],
+        "message": {
+            "accountKeys": account_keys,
+            "recentBlockhash": str(message.recent_blockhash),
+            "instructions": instructions,
+        },
+    }
+    return decoded
+
+# On-disk store of finalized transactions keyed by (signature, encoding).
+# Finalized transactions never change, so entries only leave through LRU
+# eviction once the stored payloads exceed `max_bytes`. Access times are
+# buffered in memory and written with the next insert or on close.
+class TransactionCache:
+    def __init__(self, path=TX_CACHE_PATH, max_bytes=TX_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS transactions ("
+            " signature TEXT NOT NULL, encoding TEXT NOT NULL, data TEXT NOT NULL,"
+            " size INTEGER NOT NULL, last_access REAL NOT NULL,"
+            " PRIMARY KEY (signature, encoding))"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS transactions_lru ON transactions (last_access)")
+        self.db.commit()
+        self.total_bytes = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM transactions").fetchone()[0]
+        self._touched = {}
+        self._lock = threading.Lock()
+
+    def get(self, signature, encoding="jsonParsed"):
+        with self._lock:
+            row = self.db.execute(
+                "SELECT data FROM transactions WHERE signature = ? AND encoding = ?", (signature, encoding)
+            ).fetchone()
+            if row is None:
+                return None
+            self._touched[(signature, encoding)] = time.time()
+        return json_loads(row[0])
+
+    # Which of `signatures` are already stored
+    def contains(self, signatures, encoding="jsonParsed"):
+        found = set()
+        signatures = list(signatures)
+        with self._lock:
+            for i in range(0, len(signatures), 500):
+                chunk = signatures[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.db.execute(
+                    f"SELECT signature FROM transactions WHERE encoding = ? AND signature IN ({placeholders})",
+                    [encoding, *chunk],
+                )
+                found.update(row[0] for row in rows)
+        return found
+
+    def put_many(self, items, encoding="jsonParsed"):
+        now = time.time()
+        rows = [(signature, encoding, json.dumps(tx_data, separators=(",", ":"))) for signature, tx_data in items]
+        with self._lock:
+            for signature, encoding, data in rows:
+                previous = self.db.execute(
+                    "SELECT size FROM transactions WHERE signature = ? AND encoding = ?", (signature, encoding)
+                ).fetchone()
+                self.total_bytes += len(data) - (previous[0] if previous else 0)
+                self.db.execute(
+                    "INSERT OR REPLACE INTO transactions VALUES (?, ?, ?, ?, ?)",
+                    (signature, encoding, data, len(data), now),
+                )
+            self._flush_touched()
+            self._evict()
+            self.db.commit()
+
+    def put(self, signature, tx_data, encoding="jsonParsed"):
+        self.put_many([(signature, tx_data)], encoding)
+
+    def _flush_touched(self):
+        if self._touched:
+            self.db.executemany(
+                "UPDATE transactions SET last_access = ? WHERE signature = ? AND encoding = ?",
+                [(accessed, signature, encoding) for (signature, encoding), accessed in self._touched.items()],
+            )
+            self._touched.clear()
+
+    # Drop least recently used entries until under the size bound
+    def _evict(self):
+        while self.total_bytes > self.max_bytes:
+            rows = self.db.execute(
+                "SELECT signature, encoding, size FROM transactions ORDER BY last_access LIMIT 256"
+            ).fetchall()
+            if not rows:
+                self.total_bytes = 0
+                break
+            for signature, encoding, size in rows:
+                self.db.execute("DELETE FROM transactions WHERE signature = ? AND encoding = ?", (signature, encoding))
+                self.total_bytes -= size
+                if self.total_bytes <= self.max_bytes:
+                    break
+
+    def resize(self, max_bytes):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._flush_touched()
+            self._evict()
+            self.db.commit()
+
+    def stats(self):
+        with self._lock:
+            count = self.db.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+        return {"path": self.path, "transactions": count, "bytes": self.total_bytes, "max_bytes": self.max_bytes}
+
+    def clear(self):
+        with self._lock:
+            self.db.execute("DELETE FROM transactions")
+            self.db.commit()
+            self._touched.clear()
+            self.total_bytes = 0
+
+    def close(self):
+        with self._lock:
+            self._flush_touched()
+            self.db.commit()
+            self.db.close()
+
+_tx_cache = None
+
+# Open the transaction cache on first use so commands that never look up
+# transactions don't touch the disk
+def get_tx_cache():
+    global _tx_cache
+    if _tx_cache is None:
+        try:
+            _tx_cache = TransactionCache()
+        except sqlite3.Error as e:
+            err_console.print(f"[bold yellow]Transaction cache unavailable: {e}[/bold yellow]")
+            _tx_cache = False
+    return _tx_cache or None
+
+def close_tx_cache():
+    global _tx_cache
+    if _tx_cache:
+        _tx_cache.close()
+    _tx_cache = None
+
+def get_transaction_params(signature, commitment, encoding=TX_ENCODING):
+    return [signature, {"encoding": encoding, "maxSupportedTransactionVersion": 0, "commitment": commitment}]
 
-        # Current Block Time
+# getTransaction through the on-disk cache. A transaction is stored only when
+# it was returned at finalized commitment; a miss there falls back to confirmed
+# so a just-sent transfer can still be shown. The cache keeps the payload as
+# the node sent it (base64 is several times smaller than jsonParsed) and an
+# entry cached under the other encoding is used too. Returns a JSON-RPC style
+# response dict with the result in jsonParsed layout, or None if the RPC
+# request failed.
+def fetch_transaction(signature, use_cache=True, encoding=TX_ENCODING):
+    cache = get_tx_cache() if use_cache else None
+    if cache:
+        for cached_encoding in dict.fromkeys((encoding, "base64", "jsonParsed")):
+            tx_data = cache.get(signature, cached_encoding)
+            if tx_data is not None:
+                return {"result": decode_transaction(tx_data)}
+
+    response_json = send_rpc_request("getTransaction", get_transaction_params(signature, "finalized", encoding))
+    if response_json and response_json.get('result') is not None:
+        response_json['result']['confirmationStatus'] = "finalized"
+        if cache:
+            cache.put(signature, response_json['result'], encoding)
+        response_json['result'] = decode_transaction(response_json['result'])
+        return response_json
+
+    response_json = send_rpc_request("getTransaction", get_transaction_params(signature, "confirmed", encoding))
+    if response_json and response_json.get('result') is not None:
+        response_json['result']['confirmationStatus'] = "confirmed"
+        response_json['result'] = decode_transaction(response_json['result'])
+    return response_json
+
+# Fetch every finalized transaction in `signatures` that is not cached yet.
+# Requests go out as JSON-RPC batches of `batch_size`, several batches at once.
+def prefetch_transactions(signatures, cache, batch_size=20, concurrency=4, encoding=TX_ENCODING):
+    unique = list(dict.fromkeys(signatures))
+    cached = cache.contains(unique, encoding)
+    missing = [signature for signature in unique if signature not in cached]
+    batches = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+    summary = {"requested": len(unique), "cached": len(cached), "fetched": 0, "not_found": 0, "failed": 0}
+
+    def fetch_batch(batch):
+        return rpc_client.batch([("getTransaction", get_transaction_params(signature, "finalized", encoding)) for signature in batch])
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {executor.submit(fetch_batch, batch): batch for batch in batches}
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                responses = future.result()
+            except RpcTransportError as e:
+                err_console.print(f"[bold red]Prefetch batch failed: {e}[/bold red]")
+                summary["failed"] += len(batch)
+                continue
+            found = []
+            for signature, response_json in zip(batch, responses):
+                if response_json.get('result') is not None:
+                    response_json['result']['confirmationStatus'] = "finalized"
+                    found.append((signature, response_json['result']))
+                elif 'error' in response_json:
+                    summary["failed"] += 1
+                else:
+                    summary["not_found"] += 1
+            cache.put_many(found, encoding)
+            summary["fetched"] += len(found)
+    return summary
+
+def txcache_command(args):
+    cache = get_tx_cache()
+    if cache is None:
+        return 1
+    if args.max_mb is not None:
+        cache.resize(args.max_mb * 1024 * 1024)
+
+    try:
+        if args.action == "prefetch":
+            if args.file in (None, "-"):
+                signatures = [line.strip() for line in sys.stdin if line.strip()]
+            else:
+                with open(args.file, "r") as infile:
+                    signatures = [line.strip() for line in infile if line.strip()]
+            start = time.perf_counter()
+            summary = prefetch_transactions(signatures, cache, concurrency=args.concurrency, encoding=args.encoding)
+            console.print(Panel(
+                f"Requested: {summary['requested']}  Already cached: {summary['cached']}\n"
+                f"Fetched: {summary['fetched']}  Not finalized/not found: {summary['not_found']}  Failed: {summary['failed']}\n"
+                f"Elapsed: {time.perf_counter() - start:.2f}s",
+                title="Transaction Prefetch", border_style="green",
+            ))
+        elif args.action == "clear":
+            cache.clear()
+            console.print("[bright_green]Transaction cache cleared.[/]")
+
+        stats = cache.stats()
+        console.print(
+            f"[dim green]{stats['transactions']} transactions, {stats['bytes'] / 1024 / 1024:.1f} MB "
+            f"of {stats['max_bytes'] / 1024 / 1024:.0f} MB in {stats['path']}[/]"
+        )
+    finally:
+        close_tx_cache()
+    return 0
+
+# Local index of address signature history. Sync walks getSignaturesForAddress
+# with before/until cursors at finalized commitment. The newest synced
+# signature is the high-water mark for incremental runs, and the oldest one
+# lets an interrupted backfill resume where it stopped.
+class HistoryIndex:
+    def __init__(self, path=HISTORY_DB_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS signatures ("
+            " address TEXT NOT NULL, signature TEXT NOT NULL, slot INTEGER NOT NULL,"
+            " block_time INTEGER, err TEXT, memo TEXT,"
+            " PRIMARY KEY (address, signature))"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS signatures_by_slot ON signatures (address, slot)")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS sync_state ("
+            " address TEXT PRIMARY KEY, newest_signature TEXT, newest_slot INTEGER,"
+            " oldest_signature TEXT, complete INTEGER NOT NULL DEFAULT 0, updated REAL)"
+        )
+        self.db.commit()
+        self._lock = threading.Lock()
+
+    def state(self, address):
+        with self._lock:
+            row = self.db.execute(
+                "SELECT newest_signature, newest_slot, oldest_signature, complete, updated FROM sync_state WHERE address = ?",
+                (address,),
+            ).fetchone()
+        keys = ("newest_signature", "newest_slot", "oldest_signature", "complete", "updated")
+        return dict(zip(keys, row)) if row else dict.fromkeys(keys)
+
+    def _store_page(self, address, page, **state):
+        rows = [
+            (address, entry['signature'], entry['slot'], entry.get('blockTime'),
+             json.dumps(entry['err']) if entry.get('err') else None, entry.get('memo'))
+            for entry in page
+        ]
+        with self._lock:
+            self.db.executemany("INSERT OR IGNORE INTO signatures VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self.db.execute("INSERT OR IGNORE INTO sync_state (address) VALUES (?)", (address,))
+            for column, value in state.items():
+                self.db.execute(f"UPDATE sync_state SET {column} = ? WHERE address = ?", (value, address))
+            self.db.execute("UPDATE sync_state SET updated = ? WHERE address = ?", (time.time(), address))
+            self.db.commit()
+
+    def _fetch_page(self, client, address, before=None, until=None, limit=MAX_SIGNATURES_PAGE):
+        options = {"limit": limit, "commitment": "finalized"}
+        if before:
+            options["before"] = before
+        if until:
+            options["until"] = until
+        response_json = client.request("getSignaturesForAddress", [address, options])
+        if 'error' in response_json:
+            raise RuntimeError(response_json['error'].get('message', response_json['error']))
+        return response_json['result']
+
+    # Bring one address up to date. Returns counts of new entries and requests made.
+    def sync(self, client, address, limit=MAX_SIGNATURES_PAGE):
+        state = self.state(address)
+        summary = {"address": address, "new": 0, "requests": 0}
+
+        # Newer than the high-water mark (everything, for an address whose
+        # history was empty so far). The mark only moves once every page
+        # back to it is stored, so an interrupted run leaves no gap.
+        if state["newest_signature"] or state["complete"]:
+            before, newest = None, None
+            while True:
+                page = self._fetch_page(client, address, before=before, until=state["newest_signature"], limit=limit)
+                summary["requests"] += 1
+                if newest is None and page:
+                    newest = page[0]
+                self._store_page(address, page)
+                summary["new"] += len(page)
+                if len(page) < limit:
+                    break
+                before = page[-1]['signature']
+            if newest:
+                self._store_page(address, [], newest_signature=newest['signature'], newest_slot=newest['slot'])
+
+        # Backfill older history, resuming from the oldest stored signature
+        if not state["complete"]:
+            before = state["oldest_signature"]
+            while True:
+                page = self._fetch_page(client, address, before=before, limit=limit)
+                summary["requests"] += 1
+                update = {}
+                if page:
+                    update["oldest_signature"] = page[-1]['signature']
+                    if not state["newest_signature"] and not before:
+                        update["newest_signature"] = page[0]['signature']
+                        update["newest_slot"] = page[0]['slot']
+                if len(page) < limit:
+                    update["complete"] = 1
+                self._store_page(address, page, **update)
+                summary["new"] += len(page)
+                if len(page) < limit:
+                    break
+                before = page[-1]['signature']
+        return summary
+
+    def query(self, address, from_slot=None, to_slot=None, limit=None):
+        sql = "SELECT signature, slot, block_time, err, memo FROM signatures WHERE address = ?"
+        params = [address]
+        if from_slot is not None:
+            sql += " AND slot >= ?"
+            params.append(from_slot)
+        if to_slot is not None:
+            sql += " AND slot <= ?"
+            params.append(to_slot)
+        sql += " ORDER BY slot DESC, signature"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self.db.execute(sql, params).fetchall()
+        return [
+            {"signature": signature, "slot": slot, "blockTime": block_time,
+             "err": json.loads(err) if err else None, "memo": memo}
+            for signature, slot, block_time, err, memo in rows
+        ]
+
+    def count(self, address):
+        with self._lock:
+            return self.db.execute("SELECT COUNT(*) FROM signatures WHERE address = ?", (address,)).fetchone()[0]
+
+    def close(self):
+        self.db.close()
+
+def history_command(args):
+    addresses = list(args.addresses)
+    if args.file:
+        with open(args.file, "r") as infile:
+            pubkeys, invalid = read_addresses(infile)
+        addresses += [str(pubkey) for pubkey in pubkeys]
+        for address in invalid:
+            console.print(f"[bold red]Invalid public key skipped: {address}[/bold red]")
+    for address in addresses:
+        try:
+            Pubkey.from_string(address)
+        except ValueError:
+            console.print(f"[bold red]Invalid public key: {address}[/bold red]")
+            return 1
+    if not addresses:
+        console.print("[bold red]No addresses given.[/bold red]")
+        return 1
+
+    index = HistoryIndex()
+    try:
+        if args.action == "sync":
+            start = time.perf_counter()
+            table = Table(title="History Sync", box=box.ROUNDED, border_style="green")
+            table.add_column("Address", style="bold cyan")
+            table.add_column("New", style="bold green", justify="right")
+            table.add_column("Indexed", style="bold yellow", justify="right")
+            table.add_column("Requests", justify="right")
+            failed = 0
+            with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as executor:
+                futures = {executor.submit(index.sync, rpc_client, address): address for address in addresses}
+                for future in as_completed(futures):
+                    address = futures[future]
+                    try:
+                        summary = future.result()
+                    except Exception as e:
+                        failed += 1
+                        console.print(f"[bold red]Sync failed for {address}: {e}[/bold red]")
+                        continue
+                    table.add_row(address, str(summary["new"]), str(index.count(address)), str(summary["requests"]))
+            console.print(table)
+            console.print(f"[dim green]Synced {len(addresses) - failed}/{len(addresses)} addresses in {time.perf_counter() - start:.2f}s[/]")
+            return 1 if failed else 0
+
+        rows = []
+        for address in addresses:
+            rows += [dict(entry, address=address) for entry in index.query(address, args.from_slot, args.to_slot, args.last)]
+        if args.json:
+            print(json.dumps(rows))
+            return 0
+        table = Table(title="Indexed Transactions", box=box.ROUNDED, border_style="green")
+        table.add_column("Address", style="bold cyan")
+        table.add_column("Signature", style="bold green")
+        table.add_column("Slot", style="bold yellow", justify="right")
+        table.add_column("Block Time")
+        table.add_column("Status")
+        for entry in rows:
+            block_time = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry["blockTime"])) if entry["blockTime"] else "N/A"
+            table.add_row(entry["address"], entry["signature"], str(entry["slot"]), block_time,
+                          "[bold red]Failed[/]" if entry["err"] else "Success")
+        console.print(table)
+        return 0
+    finally:
+        index.close()
+
+# View Transaction Info
+def view_transaction_info(signature=None, encoding=TX_ENCODING, use_cache=True):
+    if not signature:
+        signature = Prompt.ask(f"[{dim_green_style}]Enter transaction signature[/]")
+    
+    try:
+        response_json = fetch_transaction(signature, use_cache=use_cache, encoding=encoding)
+        
+        if response_json is None:
+            console.print(Panel("[bold red]Failed to retrieve transaction data. The RPC request failed.[/bold red]", border_style="red"))
+            return
+
+        if 'result' not in response_json or response_json['result'] is None:
+            console.print(Panel("[bold red]Transaction not found or not confirmed. Please check the signature and try again.[/bold red]", border_style="red"))
+            return
+
+        tx_data = response_json['result']
+        
+        info = [
+            f"Signature: {signature}",
+            f"Slot: {tx_data['slot']}",
+            f"Block Time: {tx_data.get('blockTime', 'N/A')}",
+            f"Recent Blockhash: {tx_data['transaction']['message']['recentBlockhash']}",
+            "",
+            "Accounts:",
+        ]
+        
+        for account in tx_data['transaction']['message']['accountKeys']:
+            info.append(f"  - {account['pubkey']} (Writable: {account['writable']}, Signer: {account['signer']})")
+        
+        info.append("\nInstructions:")
+        for idx, instruction in enumerate(tx_data['transaction']['message']['instructions']):
+            info.append(f"  Instruction {idx + 1}:")
+            info.append(f"    Program: {instruction.get('program', 'unknown')}")
+            info.append(f"    Program ID: {instruction['programId']}")
+            if 'parsed' in instruction:
+                info.append(f"    Type: {instruction['parsed']['type']}")
+                for key, value in instruction['parsed']['info'].items():
+                    info.append(f"      {key}: {value}")
+            else:
+                info.append(f"    Data: {instruction['data']}")
+        
+        if 'meta' in tx_data and tx_data['meta'] is not None:
+            meta = tx_data['meta']
+            if meta.get('err'):
+                info.append(f"\n[bold red]Error:[/] {meta['err']}")
+            else:
+                info.append(f"\n[bold green]Transaction successful[/]")
+            
+            info.append(f"\nFee: {lamports_to_sol(meta['fee'])} SOL")
+            
+            if 'preBalances' in meta and 'postBalances' in meta:
+                info.append("\nBalance Changes:")
+                for i, (pre, post) in enumerate(zip(meta['preBalances'], meta['postBalances'])):
+                    change = post - pre
+                    if change != 0:
+                        info.append(f"  Account {i}: {lamports_to_sol(change):+.9f} SOL")
+            
+            if 'rewards' in meta and meta['rewards']:
+                info.append("\nRewards:")
+                for reward in meta['rewards']:
+                    info.append(f"  {reward['pubkey']}: {lamports_to_sol(reward['lamports']):+.9f} SOL (Type: {reward['rewardType']})")
+        
+        info.append(f"\nStatus: {tx_data.get('confirmationStatus', 'Unknown').capitalize()}")
+        
+        console.print(Panel("\n".join(info), title="Transaction Info", border_style="green"))
+        
+    except Exception as e:
+        console.print(Panel(f"[bold red]An error occurred while retrieving transaction info: {e}[/bold red]", border_style="red"))
+
+# Per-epoch snapshots of the raw validator payloads (gzip'd JSON), so earlier
+# epochs can be analyzed and compared without downloading them again. The
+# snapshot for an epoch is overwritten on every fetch during that epoch.
+class ValidatorSnapshots:
+    def __init__(self, directory=VALIDATOR_SNAPSHOT_DIR):
+        self.directory = directory
+
+    def _path(self, epoch):
+        return os.path.join(self.directory, f"epoch-{epoch}.json.gz")
+
+    def save(self, snapshot):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self._path(snapshot["epoch"]) + ".tmp"
+        with gzip.open(tmp_path, "wt") as outfile:
+            json.dump(snapshot, outfile, separators=(",", ":"))
+        os.replace(tmp_path, self._path(snapshot["epoch"]))
+
+    def load(self, epoch):
         try:
-            block_time_result = subprocess.run(["solana", "block-time", current_slot], capture_output=True, text=True)
-            current_block_time = block_time_result.stdout.strip()
+            with gzip.open(self._path(epoch), "rt") as infile:
+                return json.load(infile)
+        except FileNotFoundError:
+            return None
+
+    def epochs(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            int(name[len("epoch-"):-len(".json.gz")])
+            for name in os.listdir(self.directory)
+            if name.startswith("epoch-") and name.endswith(".json.gz")
+        )
+
+# Download vote accounts, block production and epoch info in one round trip
+# and store the result as the snapshot for the current epoch
+def fetch_validator_snapshot(client=None, snapshots=None):
+    client = client or rpc_client
+    vote_accounts, block_production, epoch_info = client.batch([
+        ("getVoteAccounts", []),
+        ("getBlockProduction", []),
+        ("getEpochInfo", []),
+    ])
+    if 'result' not in vote_accounts:
+        raise RuntimeError(f"Failed to retrieve validators. Response: {vote_accounts}")
+    snapshot = {
+        "epoch": (epoch_info.get('result') or {}).get('epoch'),
+        "time": time.time(),
+        "vote_accounts": vote_accounts['result'],
+        "block_production": (block_production.get('result') or {}).get('value'),
+    }
+    if snapshots is not None and snapshot["epoch"] is not None:
+        snapshots.save(snapshot)
+    return snapshot
+
+# Columnar view of the validator set. Every metric is computed over NumPy
+# arrays (one row per vote account), so sorting and filtering thousands of
+# validators stays interactive.
+class ValidatorAnalytics:
+    SORT_KEYS = ("stake", "share", "commission", "credits", "avg_credits", "credit_rate", "skip_rate", "last_vote")
+
+    def __init__(self, snapshot):
+        self.epoch = snapshot.get("epoch")
+        vote_accounts = snapshot["vote_accounts"]
+        current = vote_accounts.get('current') or []
+        rows = current + (vote_accounts.get('delinquent') or [])
+        n = len(rows)
+
+        self.vote_pubkey = np.array([row['votePubkey'] for row in rows], dtype=object)
+        self.node_pubkey = np.array([row['nodePubkey'] for row in rows], dtype=object)
+        self.stake = np.fromiter((row.get('activatedStake', 0) for row in rows), dtype=np.int64, count=n)
+        self.commission = np.fromiter((row.get('commission', 0) for row in rows), dtype=np.int16, count=n)
+        self.last_vote = np.fromiter((row.get('lastVote', 0) for row in rows), dtype=np.int64, count=n)
+        self.delinquent = np.zeros(n, dtype=bool)
+        self.delinquent[len(current):] = True
+
+        # epochCredits entries are [epoch, credits, previous_credits]; lay them out
+        # as an (validators x epochs) matrix of credits earned in each epoch
+        entries = np.array(
+            [(i, epoch, credits, previous) for i, row in enumerate(rows)
+             for epoch, credits, previous in (row.get('epochCredits') or [])],
+            dtype=np.int64,
+        ).reshape(-1, 4)
+        if len(entries):
+            first_epoch = entries[:, 1].min()
+            self.epochs = np.arange(first_epoch, entries[:, 1].max() + 1)
+        else:
+            first_epoch = 0
+            self.epochs = np.arange(0)
+        self.epoch_credits = np.full((n, len(self.epochs)), np.nan)
+        if len(entries):
+            self.epoch_credits[entries[:, 0], entries[:, 1] - first_epoch] = entries[:, 2] - entries[:, 3]
+
+        # Block production is keyed by identity: [leaderSlots, blocksProduced]
+        by_identity = ((snapshot.get("block_production") or {}).get('byIdentity')) or {}
+        production = np.array([by_identity.get(node, (0, 0)) for node in self.node_pubkey], dtype=np.int64).reshape(-1, 2)
+        self.leader_slots = production[:, 0]
+        self.blocks_produced = production[:, 1]
+
+    def __len__(self):
+        return len(self.stake)
+
+    @property
+    def total_stake(self):
+        return int(self.stake[~self.delinquent].sum())
+
+    @property
+    def share(self):
+        total = self.total_stake
+        return np.where(self.delinquent, 0.0, self.stake / total) if total else np.zeros(len(self))
+
+    # Fewest validators whose combined active stake exceeds `threshold` of the total
+    def nakamoto_coefficient(self, threshold=1 / 3):
+        stakes = np.sort(self.stake[~self.delinquent])[::-1]
+        if not len(stakes):
+            return 0
+        cumulative = np.cumsum(stakes)
+        return int(np.searchsorted(cumulative, cumulative[-1] * threshold, side="right") + 1)
+
+    # Credits earned in the latest epoch and the mean over the full history
+    @property
+    def credits(self):
+        return np.nan_to_num(self.epoch_credits[:, -1]) if len(self.epochs) else np.zeros(len(self))
+
+    @property
+    def avg_credits(self):
+        if not len(self.epochs):
+            return np.zeros(len(self))
+        with np.errstate(invalid="ignore"):
+            return np.nan_to_num(np.nanmean(self.epoch_credits, axis=1))
+
+    # Per-epoch credits relative to the best validator in that epoch (1.0 = no
+    # missed votes), and its mean over the epochs each validator was active
+    @property
+    def credit_rates(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            best = np.nanmax(self.epoch_credits, axis=0) if len(self) else np.zeros(0)
+            return self.epoch_credits / np.where(best > 0, best, np.nan)
+
+    @property
+    def credit_rate(self):
+        if not len(self.epochs):
+            return np.zeros(len(self))
+        with np.errstate(invalid="ignore"):
+            return np.nan_to_num(np.nanmean(self.credit_rates, axis=1))
+
+    # Share of leader slots this epoch that produced no block (NaN without slots)
+    @property
+    def skip_rate(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.leader_slots > 0, 1 - self.blocks_produced / np.maximum(self.leader_slots, 1), np.nan)
+
+    def commission_distribution(self):
+        counts = np.bincount(np.clip(self.commission[~self.delinquent], 0, 100), minlength=101)
+        return {int(pct): int(count) for pct, count in enumerate(counts) if count}
+
+    def column(self, key):
+        return {
+            "stake": self.stake,
+            "share": self.share,
+            "commission": self.commission,
+            "credits": self.credits,
+            "avg_credits": self.avg_credits,
+            "credit_rate": self.credit_rate,
+            "skip_rate": np.nan_to_num(self.skip_rate, nan=-1.0),
+            "last_vote": self.last_vote,
+        }[key]
+
+    # Row indices after filtering and sorting (descending by default)
+    def select(self, sort="stake", ascending=False, include_delinquent=False, min_stake=None,
+               max_commission=None, top=None):
+        mask = np.ones(len(self), dtype=bool)
+        if not include_delinquent:
+            mask &= ~self.delinquent
+        if min_stake is not None:
+            mask &= self.stake >= min_stake
+        if max_commission is not None:
+            mask &= self.commission <= max_commission
+        indices = np.flatnonzero(mask)
+        order = np.argsort(self.column(sort)[indices], kind="stable")
+        if not ascending:
+            order = order[::-1]
+        indices = indices[order]
+        return indices[:top] if top else indices
+
+    # Stake change per vote account against an earlier snapshot (0 for new ones)
+    def stake_change(self, previous):
+        previous_stake = dict(zip(previous.vote_pubkey, previous.stake))
+        before = np.fromiter((previous_stake.get(key, 0) for key in self.vote_pubkey), dtype=np.int64, count=len(self))
+        return self.stake - before
+
+    def records(self, indices, previous=None):
+        share, credits, avg_credits = self.share, self.credits, self.avg_credits
+        credit_rate, skip_rate = self.credit_rate, self.skip_rate
+        change = self.stake_change(previous) if previous is not None else None
+        records = []
+        for rank, i in enumerate(indices, start=1):
+            record = {
+                "rank": rank,
+                "vote_pubkey": self.vote_pubkey[i],
+                "node_pubkey": self.node_pubkey[i],
+                "stake": int(self.stake[i]),
+                "share": float(share[i]),
+                "commission": int(self.commission[i]),
+                "last_vote": int(self.last_vote[i]),
+                "credits": int(credits[i]),
+                "avg_credits": float(avg_credits[i]),
+                "credit_rate": float(credit_rate[i]),
+                "skip_rate": None if np.isnan(skip_rate[i]) else float(skip_rate[i]),
+                "delinquent": bool(self.delinquent[i]),
+            }
+            if change is not None:
+                record["stake_change"] = int(change[i])
+            records.append(record)
+        return records
+
+def export_records(records, path):
+    if path.endswith(".json"):
+        with open(path, "w") as outfile:
+            json.dump(records, outfile, indent=2)
+    else:
+        with open(path, "w", newline="") as outfile:
+            writer = csv.DictWriter(outfile, fieldnames=list(records[0].keys()) if records else ["rank"])
+            writer.writeheader()
+            writer.writerows(records)
+
+def render_validator_summary(analytics):
+    distribution = analytics.commission_distribution()
+    common = sorted(distribution.items(), key=lambda item: item[1], reverse=True)[:5]
+    active = int((~analytics.delinquent).sum())
+    lines = [
+        f"Epoch: {analytics.epoch if analytics.epoch is not None else 'N/A'}",
+        f"Validators: {active} active, {len(analytics) - active} delinquent",
+        f"Total Active Stake: [bright_green]{lamports_to_sol(analytics.total_stake):,.2f} xSOL[/]",
+        f"Nakamoto Coefficient (33%): {analytics.nakamoto_coefficient()}",
+        "Most Common Commission: " + ", ".join(f"{pct}% ({count})" for pct, count in common),
+    ]
+    console.print(Panel("\n".join(lines), title="Validator Summary", border_style="green"))
+
+def render_validator_table(records, title="Validators"):
+    table = Table(title=title, box=box.ROUNDED)
+    table.add_column("#", justify="right")
+    table.add_column("Validator Identity", style="bold cyan")
+    table.add_column("Commission (%)", style="bold magenta", justify="right")
+    table.add_column("Activated Stake (SOL)", style="bold green", justify="right")
+    table.add_column("Stake %", justify="right")
+    table.add_column("Last Vote", style="bold yellow", justify="right")
+    table.add_column("Credits (Epoch)", style="bold blue", justify="right")
+    table.add_column("Credit Rate", justify="right")
+    table.add_column("Skip Rate", justify="right")
+    with_change = bool(records) and "stake_change" in records[0]
+    if with_change:
+        table.add_column("Stake Change (SOL)", justify="right")
+
+    for record in records:
+        identity = record["node_pubkey"] + (" [bold red](delinquent)[/]" if record["delinquent"] else "")
+        row = [
+            str(record["rank"]),
+            identity,
+            str(record["commission"]),
+            f"{lamports_to_sol(record['stake']):.2f}",
+            f"{record['share'] * 100:.2f}",
+            str(record["last_vote"]),
+            str(record["credits"]),
+            f"{record['credit_rate'] * 100:.1f}%",
+            f"{record['skip_rate'] * 100:.1f}%" if record["skip_rate"] is not None else "N/A",
+        ]
+        if with_change:
+            row.append(f"{lamports_to_sol(record['stake_change']):+.2f}")
+        table.add_row(*row)
+    console.print(Panel(table, title=title, border_style="green"))
+
+def review_validators():
+    try:
+        snapshot = fetch_validator_snapshot(snapshots=ValidatorSnapshots())
+    except (RpcTransportError, RuntimeError) as e:
+        console.print(Panel(f"[bold red]Failed to retrieve validators. {e}[/bold red]", border_style="red"))
+        return
+
+    analytics = ValidatorAnalytics(snapshot)
+    indices = analytics.select("stake")
+    if not len(indices):
+        console.print(Panel("[bold red]No validators found.[/bold red]", border_style="red"))
+        return
+
+    render_validator_summary(analytics)
+    render_validator_table(analytics.records(indices), title="Current Validators")
+
+def validators_command(args):
+    snapshots = ValidatorSnapshots()
+    if args.epoch is not None:
+        snapshot = snapshots.load(args.epoch)
+        if snapshot is None:
+            console.print(f"[bold red]No snapshot stored for epoch {args.epoch}. Stored: {snapshots.epochs()}[/bold red]")
+            return 1
+    else:
+        snapshot = fetch_validator_snapshot(snapshots=snapshots)
+    analytics = ValidatorAnalytics(snapshot)
+
+    previous = None
+    if args.compare is not None:
+        previous_snapshot = snapshots.load(args.compare)
+        if previous_snapshot is None:
+            console.print(f"[bold red]No snapshot stored for epoch {args.compare}. Stored: {snapshots.epochs()}[/bold red]")
+            return 1
+        previous = ValidatorAnalytics(previous_snapshot)
+
+    indices = analytics.select(
+        args.sort,
+        ascending=args.ascending,
+        include_delinquent=args.include_delinquent,
+        min_stake=int(args.min_stake * LAMPORTS_PER_SOL) if args.min_stake is not None else None,
+        max_commission=args.max_commission,
+        top=args.top,
+    )
+    records = analytics.records(indices, previous)
+    if args.export:
+        export_records(records, args.export)
+        err_console.print(f"[dim green]Exported {len(records)} validators to {args.export}[/]")
+    if args.json:
+        emit_json({
+            "epoch": analytics.epoch,
+            "total_stake": analytics.total_stake,
+            "active": int((~analytics.delinquent).sum()),
+            "delinquent": int(analytics.delinquent.sum()),
+            "nakamoto_coefficient": analytics.nakamoto_coefficient(),
+            "commission_distribution": analytics.commission_distribution(),
+            "validators": records,
+        })
+        return 0
+
+    render_validator_summary(analytics)
+    title = f"Validators by {args.sort}" + (f" (vs epoch {args.compare})" if previous is not None else "")
+    render_validator_table(records, title=title)
+    return 0
+
+# Helper function to convert lamports to SOL
+def lamports_to_sol(lamports):
+    return lamports / 10**9
+def gossip_nodes(interactive=True):
+    response_json = send_rpc_request("getClusterNodes", [])
+    
+    if response_json and 'result' in response_json:
+        nodes = response_json['result']
+        
+        table = Table(title="Gossip Nodes", box=box.ROUNDED)
+        table.add_column("Node", style="bold green")
+        table.add_column("IP Address")
+        table.add_column("TPU Port")
+        table.add_column("RPC")
+        
+        for node in nodes:
+            table.add_row(node['pubkey'], node.get('gossip', 'N/A'), str(node.get('tpu', 'N/A')), node.get('rpc') or 'N/A')
+        
+        console.print(Panel(table, title="Gossip Nodes", border_style="green"))
+    else:
+        console.print(Panel(f"[bold red]Failed to retrieve gossip nodes. Response: {response_json}[/bold red]", border_style="red"))
+        return
+
+    if interactive and Prompt.ask(f"[{dim_green_style}]Probe node reachability and latency?[/]", choices=["y", "n"], default="n") == "y":
+        try:
+            results, age, elapsed = gossip_sweep(nodes)
         except Exception as e:
-            current_block_time = f"Failed to retrieve block time. Error: {e}"
+            console.print(Panel(f"[bold red]Reachability sweep failed: {e}[/bold red]", border_style="red"))
+            return
+        render_gossip_sweep(results, age, elapsed)
+
+def split_host_port(address):
+    host, _, port = address.rpartition(":")
+    return host.strip("[]"), int(port)
+
+def decode_chunked(data):
+    body = bytearray()
+    while data:
+        size_line, _, data = data.partition(b"\r\n")
+        size = int(size_line.split(b";")[0], 16)
+        if size == 0:
+            break
+        body += data[:size]
+        data = data[size + 2:]
+    return bytes(body)
+
+# TCP connect time in seconds. Validators listen on TCP at their gossip port
+# (the ip-echo service), so this is a real reachability check for gossip too.
+async def tcp_connect_probe(address):
+    host, port = split_host_port(address)
+    started = time.perf_counter()
+    _, writer = await asyncio.open_connection(host, port)
+    latency = time.perf_counter() - started
+    writer.close()
+    return latency
+
+# TPU is UDP/QUIC and answers nothing to a stray datagram, so the best a probe
+# can do is send a one-byte one (dropped as garbage) and listen for an ICMP
+# port-unreachable
+async def udp_probe(address, wait):
+    host, port = split_host_port(address)
+    loop = asyncio.get_running_loop()
+    refused = loop.create_future()
+
+    class Protocol(asyncio.DatagramProtocol):
+        def error_received(self, exc):
+            if not refused.done():
+                refused.set_result(exc)
+
+    transport, _ = await loop.create_datagram_endpoint(Protocol, remote_addr=(host, port))
+    try:
+        transport.sendto(b"\x00")
+        await asyncio.wait_for(refused, wait)
+        return "refused"
+    except asyncio.TimeoutError:
+        return "open|filtered"
+    finally:
+        transport.close()
+
+# getHealth and getSlot in one HTTP request on a fresh connection; returns the
+# connect time, the request round trip, the health string and the slot
+async def rpc_health_probe(address):
+    host, port = split_host_port(address)
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection(host, port)
+    connected = time.perf_counter()
+    try:
+        body = json.dumps([
+            {"jsonrpc": "2.0", "id": 1, "method": "getHealth"},
+            {"jsonrpc": "2.0", "id": 2, "method": "getSlot"},
+        ]).encode()
+        writer.write(
+            f"POST / HTTP/1.1\r\nHost: {host}:{port}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+        raw = await reader.read()
+    finally:
+        writer.close()
+    round_trip = time.perf_counter() - connected
+
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    status = head.split(b"\r\n", 1)[0]
+    if b" 200 " not in status + b" ":
+        raise ConnectionError(status.decode(errors="replace") or "empty response")
+    if b"transfer-encoding: chunked" in head.lower():
+        payload = decode_chunked(payload)
+    items = json.loads(payload)
+    if not isinstance(items, list):
+        # Batch requests disabled or refused: the node answers with one object
+        error = items.get("error") if isinstance(items, dict) else None
+        message = error.get("message") if isinstance(error, dict) else None
+        return connected - started, round_trip, message or "invalid batch response", None
+    responses = {item.get("id"): item for item in items if isinstance(item, dict)}
+    health = responses.get(1, {})
+    health = health.get("result") or health.get("error", {}).get("message", "unknown")
+    return connected - started, round_trip, health, responses.get(2, {}).get("result")
+
+# Probe every node's gossip, TPU and RPC endpoints at once, at most
+# `concurrency` sockets open and each probe bounded by `timeout` seconds, so
+# the sweep takes about one timeout rather than one per unreachable node.
+# Rows come back sorted by connect latency, unreachable nodes last.
+async def sweep_gossip_nodes(nodes, concurrency=512, timeout=2.0):
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def bounded(probe, *args):
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(probe(*args), timeout), None
+            except asyncio.TimeoutError:
+                return None, "timeout"
+            except Exception as e:  # One misbehaving node must not abort the sweep
+                return None, type(e).__name__
+
+    async def skipped():
+        return None, "n/a"
+
+    async def sweep_node(node):
+        gossip, tpu, rpc = node.get("gossip"), node.get("tpu"), node.get("rpc")
+        (gossip_latency, gossip_error), (tpu_status, tpu_error), (rpc_probe_result, rpc_error) = await asyncio.gather(
+            bounded(tcp_connect_probe, gossip) if gossip else skipped(),
+            bounded(udp_probe, tpu, min(timeout / 2, 1.0)) if tpu else skipped(),
+            bounded(rpc_health_probe, rpc) if rpc else skipped(),
+        )
+        rpc_connect, rpc_round_trip, health, slot = rpc_probe_result or (None, None, None, None)
+        connect_times = [latency for latency in (gossip_latency, rpc_connect) if latency is not None]
+        return {
+            "pubkey": node.get("pubkey"),
+            "version": node.get("version"),
+            "gossip": gossip,
+            "gossip_ms": gossip_latency * 1000 if gossip_latency is not None else None,
+            "gossip_error": gossip_error,
+            "tpu": tpu,
+            "tpu_status": tpu_status or tpu_error,
+            "rpc": rpc,
+            "rpc_connect_ms": rpc_connect * 1000 if rpc_connect is not None else None,
+            "rpc_ms": rpc_round_trip * 1000 if rpc_round_trip is not None else None,
+            "rpc_error": rpc_error,
+            "health": health,
+            "slot": slot if isinstance(slot, int) else None,
+            "slot_lag": None,
+            "latency_ms": min(connect_times) * 1000 if connect_times else None,
+        }
+
+    results = await asyncio.gather(*(sweep_node(node) for node in nodes))
+    newest = max((row["slot"] for row in results if row["slot"] is not None), default=None)
+    for row in results:
+        if row["slot"] is not None:
+            row["slot_lag"] = newest - row["slot"]
+    results.sort(key=lambda row: (row["latency_ms"] is None, row["latency_ms"] or 0.0))
+    return results
+
+# Stable name of the cluster the pool talks to, for files that outlive the
+# process: its genesis hash, else the configured endpoints. Unlike
+# rpc_client.url it does not change when the pool reorders endpoints.
+def cluster_key():
+    try:
+        genesis = rpc_client.request("getGenesisHash", []).get("result")
+    except RpcTransportError:
+        genesis = None
+    return f"genesis:{genesis}" if isinstance(genesis, str) else " ".join(sorted(rpc_client.clients))
+
+# Sweep results reused for `ttl` seconds per cluster, so repeat views are
+# instant. The file also remembers the cluster key of each endpoint set, so
+# cluster_key() is only asked the first time a set of endpoints is used and a
+# cached sweep is otherwise shown without any network call. Returns (rows,
+# age of the rows in seconds, sweep duration).
+def gossip_sweep(nodes=None, concurrency=512, timeout=2.0, ttl=GOSSIP_SWEEP_TTL, refresh=False,
+                 path=GOSSIP_SWEEP_PATH):
+    try:
+        with open(path, "r") as cache_file:
+            cache = json.load(cache_file)
+    except (OSError, ValueError):
+        cache = {}
+    clusters, sweeps = cache.get("clusters", {}), cache.get("sweeps", {})
+
+    def save():
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as cache_file:
+            json.dump({"clusters": clusters, "sweeps": sweeps}, cache_file)
+
+    endpoints = " ".join(sorted(rpc_client.clients))
+    key = clusters.get(endpoints) or (endpoints if endpoints in sweeps else None)
+    if key is None:
+        key = cluster_key()
+        if key != endpoints:  # Only a genesis hash is worth remembering
+            clusters[endpoints] = key
+            save()
+    entry = sweeps.get(key)
+    if entry and not refresh and time.time() - entry["time"] < ttl:
+        return entry["results"], time.time() - entry["time"], entry["elapsed"]
+
+    if nodes is None:
+        response_json = rpc_client.request("getClusterNodes", [], refresh=refresh)
+        if 'result' not in response_json:
+            raise RuntimeError(f"Failed to retrieve gossip nodes. Response: {response_json}")
+        nodes = response_json['result']
+    started = time.perf_counter()
+    results = asyncio.run(sweep_gossip_nodes(nodes, concurrency, timeout))
+    elapsed = time.perf_counter() - started
+
+    sweeps[key] = {"time": time.time(), "elapsed": elapsed, "results": results}
+    save()
+    return results, 0.0, elapsed
+
+def render_gossip_sweep(results, age=0.0, elapsed=None, limit=None):
+    def ms(value):
+        return f"{value:.1f}" if value is not None else "-"
+
+    table = Table(title="Gossip Node Reachability (by latency)", box=box.ROUNDED)
+    table.add_column("Node", style="bold green")
+    table.add_column("Latency ms", justify="right")
+    table.add_column("Gossip")
+    table.add_column("TPU")
+    table.add_column("RPC ms", justify="right")
+    table.add_column("Health")
+    table.add_column("Slot Lag", justify="right")
+    for row in results[:limit]:
+        gossip = ms(row["gossip_ms"]) if row["gossip_ms"] is not None else f"[red]{row['gossip_error']}[/red]"
+        if row["rpc"] is None:
+            rpc = "-"
+        elif row["rpc_ms"] is not None:
+            rpc = ms(row["rpc_ms"])
+        else:
+            rpc = f"[red]{row['rpc_error']}[/red]"
+        health = row["health"] or "-"
+        if row["health"] not in (None, "ok"):
+            health = f"[yellow]{health}[/yellow]"
+        table.add_row(
+            row["pubkey"], ms(row["latency_ms"]), gossip, row["tpu_status"] or "-", rpc, health,
+            str(row["slot_lag"]) if row["slot_lag"] is not None else "-",
+        )
+
+    reachable = sum(1 for row in results if row["latency_ms"] is not None)
+    healthy = sum(1 for row in results if row["health"] == "ok")
+    footer = f"{reachable}/{len(results)} reachable, {healthy} healthy RPC"
+    if elapsed is not None:
+        footer += f", swept in {elapsed:.1f}s"
+    if age:
+        footer += f" ({age:.0f}s ago, cached)"
+    console.print(Panel(table, title="Gossip Sweep", subtitle=footer, border_style="green"))
+from time import sleep
+
+# Streaming latency histogram with log-spaced buckets (about 1% relative
+# error), so percentiles cost O(buckets) no matter how many samples arrive
+class LatencyHistogram:
+    def __init__(self, precision=0.01):
+        self.log_base = math.log1p(precision)
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, seconds):
+        seconds = max(seconds, 0.0)
+        bucket = int(math.log(max(seconds * 1e6, 1.0)) / self.log_base)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentile(self, pct):
+        if not self.count:
+            return None
+        target = pct / 100 * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                value = math.exp((bucket + 0.5) * self.log_base) / 1e6
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    # Summary in milliseconds
+    def summary(self):
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "min": self.min * 1000,
+            "mean": self.total / self.count * 1000,
+            "p50": self.percentile(50) * 1000,
+            "p90": self.percentile(90) * 1000,
+            "p99": self.percentile(99) * 1000,
+            "max": self.max * 1000,
+        }
+
+# Run `count` probes (or until `duration` seconds pass) with at most
+# `concurrency` in flight, paced at `rate` probes per second when given.
+# A probe is a coroutine taking the probe number and returning its latency in
+# seconds, or None to have the wall time of the call recorded.
+async def run_probes(probe, count, concurrency=4, rate=None, duration=None):
+    histogram = LatencyHistogram()
+    errors = {}
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    async def run_one(seq):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                latency = await probe(seq)
+            except Exception as e:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                return
+            histogram.record(latency if latency is not None else time.perf_counter() - started)
+
+    tasks = []
+    for seq in range(count):
+        if duration is not None and loop.time() - start >= duration:
+            break
+        if rate:
+            await asyncio.sleep(max(0.0, start + seq / rate - loop.time()))
+        tasks.append(asyncio.create_task(run_one(seq)))
+    await asyncio.gather(*tasks)
+    return histogram, errors, loop.time() - start
+
+# RPC round trip for a cheap method over the pooled keep-alive session,
+# bypassing the response cache so every probe reaches the node
+def rpc_probe(client, method, executor):
+    async def probe(seq):
+        response_json = await asyncio.get_running_loop().run_in_executor(executor, lambda: client.request(method, [], refresh=True))
+        if 'error' in response_json:
+            raise RuntimeError(response_json['error'].get('message'))
+    return probe
+
+# End-to-end latency of a tiny self-transfer: send until `commitment` is
+# reached. Each probe moves a different lamport amount to itself so every
+# signature is unique under a shared cached blockhash; only the fee is spent.
+def transaction_probe(client, keypair, executor, commitment="confirmed", timeout=30.0):
+    cache = BlockhashCache(client)
+    tracker = ConfirmationTracker(client, ws_url_for(client.url), commitment=commitment)
+    payer = keypair.pubkey()
+
+    async def probe(seq):
+        loop = asyncio.get_running_loop()
+        blockhash, _ = await loop.run_in_executor(executor, cache.get)
+        msg = build_transfer_message(payer, [{"recipient": str(payer), "lamports": seq + 1}], blockhash)
+        tx = VersionedTransaction(msg, [keypair])
+        signature = str(tx.signatures[0])
+        sent_at = time.monotonic()
+        encoded_tx = base64.b64encode(bytes(tx)).decode("ascii")
+        result_json = await loop.run_in_executor(executor, lambda: client.request("sendTransaction", [encoded_tx, {"encoding": "base64"}]))
+        if 'error' in result_json:
+            raise RuntimeError(result_json['error'].get('message'))
+        result = (await tracker.wait_async([signature], timeout, {signature: sent_at}))[signature]
+        if result["status"] == "timeout":
+            raise TimeoutError(signature)
+        if result["err"]:
+            raise RuntimeError(result["err"])
+        return result["elapsed"]
+    return probe
+
+# Websocket notification lag: how long after HTTP getSlot (processed) first
+# reports a slot the slotSubscribe stream delivers it (0 when the stream was ahead)
+class SlotWatcher:
+    def __init__(self, ws_url, keep=1024):
+        self.ws_url = ws_url
+        self.seen = {}
+        self.order = deque(maxlen=keep)
+        self.changed = asyncio.Event()
+
+    async def run(self):
+        import websockets
+
+        async with websockets.connect(self.ws_url, max_size=None, close_timeout=1) as ws:
+            await ws.send(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "slotSubscribe"}))
+            async for raw in ws:
+                message = json.loads(raw)
+                if message.get("method") != "slotNotification":
+                    continue
+                slot = message["params"]["result"]["slot"]
+                if slot not in self.seen:
+                    if len(self.order) == self.order.maxlen:
+                        self.seen.pop(self.order[0], None)
+                    self.order.append(slot)
+                    self.seen[slot] = time.monotonic()
+                    self.changed.set()
+
+    async def wait_for(self, slot, timeout):
+        deadline = time.monotonic() + timeout
+        while slot not in self.seen and not any(seen > slot for seen in self.order):
+            self.changed.clear()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"slot {slot}")
+            try:
+                await asyncio.wait_for(self.changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"slot {slot}")
+        return self.seen.get(slot, 0.0)
+
+def websocket_probe(client, watcher, executor, timeout=10.0):
+    async def probe(seq):
+        loop = asyncio.get_running_loop()
+        response_json = await loop.run_in_executor(executor, lambda: client.request("getSlot", [{"commitment": "processed"}], refresh=True))
+        reported_at = time.monotonic()
+        if 'error' in response_json:
+            raise RuntimeError(response_json['error'].get('message'))
+        arrived_at = await watcher.wait_for(response_json['result'], timeout)
+        return max(0.0, arrived_at - reported_at)
+    return probe
+
+# Run one probe mode and return a result record (latencies in ms)
+async def probe_session(mode, count, concurrency=4, rate=None, duration=None, method="getSlot",
+                        keypair=None, commitment="confirmed", client=None):
+    client = client or rpc_client
+    executor = ThreadPoolExecutor(max_workers=max(1, concurrency))
+    watcher_task = None
+    try:
+        if mode == "rpc":
+            probe, label = rpc_probe(client, method, executor), f"RPC {method}"
+        elif mode == "tx":
+            probe, label = transaction_probe(client, keypair, executor, commitment), f"Transaction ({commitment})"
+        else:
+            watcher = SlotWatcher(ws_url_for(client.url))
+            watcher_task = asyncio.create_task(watcher.run())
+            probe, label = websocket_probe(client, watcher, executor), "Websocket slot lag"
+        histogram, errors, elapsed = await run_probes(probe, count, concurrency, rate, duration)
+    finally:
+        if watcher_task:
+            watcher_task.cancel()
+            await asyncio.gather(watcher_task, return_exceptions=True)
+        executor.shutdown(wait=False)
+
+    return {
+        "time": time.time(),
+        "url": client.url,
+        "mode": mode,
+        "probe": label,
+        "concurrency": concurrency,
+        "rate": rate,
+        "elapsed": elapsed,
+        "errors": errors,
+        "latency_ms": histogram.summary(),
+    }
+
+def render_probe_results(results, title="Network Probe Results"):
+    table = Table(title=title, box=box.ROUNDED, border_style="green")
+    table.add_column("Probe", style="bold cyan")
+    table.add_column("Samples", justify="right")
+    table.add_column("Errors", style="bold red", justify="right")
+    for column in ("p50", "p90", "p99", "Max"):
+        table.add_column(f"{column} (ms)", style="bold yellow", justify="right")
+    for result in results:
+        latency = result["latency_ms"]
+        values = [f"{latency[key]:.1f}" if latency.get(key) is not None else "N/A" for key in ("p50", "p90", "p99", "max")]
+        table.add_row(result["probe"], str(latency["count"]), str(sum(result["errors"].values())), *values)
+    console.print(table)
+
+# Append run results as JSON lines so runs can be compared over time
+def export_probe_results(results, path):
+    with open(path, "a") as outfile:
+        for result in results:
+            outfile.write(json.dumps(result) + "\n")
+
+def network_testing(keypair=None):
+    console.print(Panel("[bold green]Network Test Running...[/bold green]", border_style="green"))
+
+    try:
+        async def session():
+            results = [
+                await probe_session("rpc", 20, concurrency=4, method="getSlot"),
+                await probe_session("rpc", 10, concurrency=4, method="getHealth"),
+            ]
+            if keypair:
+                results.append(await probe_session("tx", 5, concurrency=5, keypair=keypair))
+            return results
+
+        with console.status("[bright_green]Probing...[/]"):
+            results = asyncio.run(session())
+        render_probe_results(results, title="Network Ping Test Results")
+        console.print(Panel("[bold green]Network Test Completed[/bold green]", border_style="green"))
+
+    except Exception as e:
+        console.print(Panel(f"[bold red]An error occurred during the network test: {e}[/bold red]", border_style="red"))
+
+def probe_command(args):
+    keypair = None
+    if args.mode == "tx":
+        keypair_path = args.keypair or get_default_keypair_path()
+        keypair = load_keypair(keypair_path) if keypair_path else None
+        if not keypair:
+            console.print("[bold red]Transaction probes need a keypair.[/bold red]")
+            return 1
+
+    results = []
+    methods = (args.method or ["getSlot", "getHealth"]) if args.mode == "rpc" else [None]
+    for method in methods:
+        results.append(asyncio.run(probe_session(
+            args.mode, args.count, concurrency=args.concurrency, rate=args.rate, duration=args.duration,
+            method=method, keypair=keypair, commitment=args.commitment,
+        )))
+    if args.json:
+        emit_json(results)
+    else:
+        render_probe_results(results)
+    if args.export:
+        export_probe_results(results, args.export)
+        err_console.print(f"[dim green]Appended results to {args.export}[/]")
+    return 0 if all(result["latency_ms"]["count"] for result in results) else 1
+
+# Fields on the network dashboard: RPC method, params and how often (seconds)
+# the value is worth re-polling. The block time depends on the slot, so it is
+# chained right behind getSlot while the independent calls share one batch.
+NETWORK_FIELDS = {
+    "version": ("getVersion", [], 300),
+    "health": ("getHealth", [], 0),
+    "epoch": ("getEpochInfo", [{"commitment": "confirmed"}], 0),
+    "supply": ("getSupply", [{"excludeNonCirculatingAccountsList": True}], 60),
+    "balance": ("getBalance", None, 0),
+}
+
+class NetworkDashboard:
+    def __init__(self, client, wallet_address=None):
+        self.client = client
+        self.wallet_address = wallet_address
+        self.values = {}
+        self.fetched_at = {}
+
+    def _due(self, now, force):
+        return [
+            field for field, (_, _, interval) in NETWORK_FIELDS.items()
+            if (field != "balance" or self.wallet_address)
+            and (force or field not in self.fetched_at or now - self.fetched_at[field] >= interval)
+        ]
 
-        # Display the results
+    # Slot, then its block time, as one pipelined chain
+    def _fetch_slot_and_block_time(self):
+        slot_json = self.client.request("getSlot", [{"commitment": "confirmed"}])
+        if 'result' not in slot_json:
+            return slot_json, None
+        return slot_json, self.client.request("getBlockTime", [slot_json['result']])
+
+    # Re-poll the fields that are due; returns the names of fields whose value changed
+    def refresh(self, force=False):
+        now = time.monotonic()
+        fields = self._due(now, force)
+        calls = [
+            (NETWORK_FIELDS[field][0], [str(self.wallet_address)] if field == "balance" else NETWORK_FIELDS[field][1])
+            for field in fields
+        ]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            chain = executor.submit(self._fetch_slot_and_block_time)
+            batch = executor.submit(self.client.batch, calls)
+            responses = dict(zip(fields, batch.result()))
+            responses["slot"], responses["block_time"] = chain.result()
+
+        changed = set()
+        for field, response_json in responses.items():
+            value = self._value(field, response_json)
+            if self.values.get(field) != value:
+                changed.add(field)
+            self.values[field] = value
+            self.fetched_at[field] = now
+        return changed
+
+    @staticmethod
+    def _value(field, response_json):
+        if response_json is None:
+            return "N/A"
+        if 'error' in response_json:
+            # getHealth reports an unhealthy node as an error ("Node is behind by N slots")
+            return f"{'Unhealthy' if field == 'health' else 'Error'}: {response_json['error'].get('message')}"
+        result = response_json.get('result')
+        if field in ("supply", "balance"):
+            return result['value']
+        return result
+
+    def rows(self):
+        values = self.values
+        rows = []
+        if self.wallet_address:
+            balance = values.get("balance")
+            rows.append(("Wallet Address", str(self.wallet_address)))
+            rows.append(("Wallet Balance (xSOL)", f"{lamports_to_sol(balance):.9f}" if isinstance(balance, int) else str(balance)))
+        rows.append(("RPC URL", self.client.url))
+        version = values.get("version")
+        rows.append(("RPC Version", version.get('solana-core', 'N/A') if isinstance(version, dict) else str(version)))
+        rows.append(("RPC Health", str(values.get("health", "N/A"))))
+        rows.append(("Current Slot", str(values.get("slot", "N/A"))))
+        block_time = values.get("block_time")
+        rows.append(("Current Block Time", time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(block_time)) + f" ({block_time})"
+                     if isinstance(block_time, int) else str(block_time)))
+        epoch = values.get("epoch")
+        if isinstance(epoch, dict):
+            progress = epoch['slotIndex'] * 100 / epoch['slotsInEpoch'] if epoch.get('slotsInEpoch') else 0
+            rows.append(("Epoch", f"{epoch['epoch']} ({progress:.1f}% complete, {epoch['slotsInEpoch'] - epoch['slotIndex']} slots left)"))
+            rows.append(("Block Height", str(epoch.get('blockHeight', 'N/A'))))
+            rows.append(("Transaction Count", str(epoch.get('transactionCount', 'N/A'))))
+        else:
+            rows.append(("Epoch", str(epoch)))
+        supply = values.get("supply")
+        if isinstance(supply, dict):
+            rows.append(("Total Supply (xSOL)", f"{lamports_to_sol(supply['total']):,.2f}"))
+            rows.append(("Circulating Supply (xSOL)", f"{lamports_to_sol(supply['circulating']):,.2f}"))
+        else:
+            rows.append(("Total Supply (xSOL)", str(supply)))
+        return rows
+
+    def render(self, changed=()):
         table = Table(title="Network & Wallet Information", box=box.ROUNDED, border_style="green")
         table.add_column("Metric", style="bold cyan")
         table.add_column("Value", style="bold white")
+        labels = {"balance": "Wallet Balance (xSOL)", "health": "RPC Health", "slot": "Current Slot",
+                  "block_time": "Current Block Time", "epoch": "Epoch", "supply": "Total Supply (xSOL)"}
+        highlight = {labels[field] for field in changed if field in labels}
+        for metric, value in self.rows():
+            table.add_row(metric, f"[bright_green]{value}[/]" if metric in highlight else value)
+        return table
 
-        table.add_row("Wallet Address", str(wallet_address))
-        table.add_row("Wallet Balance (xSOL)", f"{wallet_balance:.9f}" if isinstance(wallet_balance, float) else wallet_balance)
-        table.add_row("RPC URL", rpc_url)
-        table.add_row("RPC Version", rpc_version)
-        table.add_row("Current Block Time", current_block_time)
+def network_details(keypair):
+    console.print(Panel("[bright_green]Network & Wallet Information[/]", border_style="green"))
 
-        console.print(table)
+    try:
+        dashboard = NetworkDashboard(rpc_client, keypair.pubkey())
+        dashboard.refresh(force=True)
+        console.print(dashboard.render())
 
     except Exception as e:
         console.print(Panel(f"[bold red]An error occurred while retrieving network details: {e}[/bold red]", border_style="red"))
 
+def details_command(args):
+    address = None
+    if args.address:
+        address = Pubkey.from_string(args.address)
+    elif not args.no_wallet:
+        keypair_path = get_default_keypair_path()
+        keypair = load_keypair(keypair_path) if keypair_path else None
+        address = keypair.pubkey() if keypair else None
+
+    dashboard = NetworkDashboard(rpc_client, address)
+    if args.metrics_port and args.watch:
+        metrics.serve(args.metrics_port)
+    dashboard.refresh(force=True)
+    if args.json:
+        emit_json(dict(dashboard.values, url=rpc_client.url, address=str(address) if address else None))
+        return 0
+    if not args.watch:
+        console.print(dashboard.render())
+        return 0
+
+    with Live(dashboard.render(), console=console, auto_refresh=False) as live:
+        try:
+            while True:
+                time.sleep(args.watch)
+                changed = dashboard.refresh()
+                live.update(dashboard.render(changed), refresh=True)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+# Program-ID counter that keeps memory bounded: once more than `capacity`
+# programs are tracked, the least active half is dropped. Top-K is computed
+# on demand (once per frame), not per message.
+class TopKCounter:
+    def __init__(self, capacity=10000):
+        self.capacity = capacity
+        self.counts = {}
+        self.total = 0
+
+    def add(self, key, amount=1):
+        self.counts[key] = self.counts.get(key, 0) + amount
+        self.total += amount
+        if len(self.counts) > self.capacity:
+            keep = heapq.nlargest(self.capacity // 2, self.counts.items(), key=lambda item: item[1])
+            self.counts = dict(keep)
+
+    def top(self, k):
+        return heapq.nlargest(k, self.counts.items(), key=lambda item: item[1])
+
+# Streaming state for logsSubscribe: message counters, program counts and a
+# bounded ring buffer of recent transactions.
+class LogStreamStats:
+    def __init__(self, recent=15):
+        self.programs = TopKCounter()
+        self.recent = deque(maxlen=recent)
+        self.messages = 0
+        self.transactions = 0
+        self.failed = 0
+        self.slot = 0
+        self.started = time.monotonic()
+
+    # Parse one logsNotification; returns a flat entry or None for other messages
+    def process(self, message):
+        self.messages += 1
+        if message.get("method") != "logsNotification":
+            return None
+        result = message["params"]["result"]
+        value = result["value"]
+        logs = value.get("logs") or []
+
+        program_id = None
+        log_content = []
+        for line in logs:
+            if program_id is None and line.startswith("Program ") and not line.startswith("Program log:"):
+                program_id = line.split(" ", 2)[1]
+            elif line.startswith("Program log: "):
+                log_content.append(line[13:])
+
+        self.slot = result["context"]["slot"]
+        self.transactions += 1
+        if value.get("err"):
+            self.failed += 1
+        if program_id:
+            self.programs.add(program_id)
+
+        entry = {
+            "time": time.time(),
+            "slot": self.slot,
+            "signature": value.get("signature"),
+            "program": program_id,
+            "err": value.get("err"),
+            "log": " ".join(log_content),
+        }
+        self.recent.appendleft(entry)
+        return entry
+
+    def rate(self):
+        elapsed = time.monotonic() - self.started
+        return self.transactions / elapsed if elapsed > 0 else 0.0
+
+# Rich renderable for the live monitor screen
+def render_monitor(stats, ws_url, top=10):
+    header = (
+        f"[bright_green]Monitoring transactions at {ws_url}[/]\n"
+        f"Current Slot Number: {stats.slot}   Transactions: {stats.transactions}   "
+        f"Failed: {stats.failed}   Rate: {stats.rate():.1f} tx/s"
+    )
+
+    programs = Table(box=box.ROUNDED, border_style="green", expand=True)
+    programs.add_column("Program ID", style="bold cyan")
+    programs.add_column("Interactions", style="bold green", justify="right")
+    programs.add_column("Percentage", style="bold yellow", justify="right")
+    total = stats.programs.total or 1
+    for program_id, count in stats.programs.top(top):
+        programs.add_row(program_id, str(count), f"{count * 100 // total}%")
+
+    logs = Table(box=box.SIMPLE, expand=True, show_header=False)
+    logs.add_column("Time", style="dim green", no_wrap=True)
+    logs.add_column("Transaction", overflow="ellipsis", no_wrap=True)
+    for entry in list(stats.recent):
+        logs.add_row(
+            time.strftime("%H:%M:%S", time.localtime(entry["time"])),
+            f"Slot: {entry['slot']} | [bright_green]{entry['program']}[/] | Sig: [bright_green]{entry['signature']}[/]\n"
+            f"[green]Logs:[/] {entry['log']}",
+        )
+
+    return Group(
+        Panel(header, title="Xolana Transaction Monitor", border_style="bright_green"),
+        Panel(programs, title="Most Active Programs", border_style="green"),
+        Panel(logs, title="Recent Transaction Logs", border_style="green"),
+    )
+
+# Keep one websocket open on logsSubscribe and feed every message to `on_entry`,
+# reconnecting with backoff if the connection drops.
+async def stream_logs(ws_url, stats, on_entry, log_filter="all", commitment="confirmed", stop=None):
+    import websockets
+
+    backoff = 1.0
+    while stop is None or not stop.is_set():
+        try:
+            async with websockets.connect(ws_url, max_size=None, ping_interval=20, close_timeout=1) as ws:
+                await ws.send(json.dumps({
+                    "jsonrpc": "2.0",
+                    "id": 1,
+                    "method": "logsSubscribe",
+                    "params": [log_filter, {"commitment": commitment}],
+                }))
+                backoff = 1.0
+                async for raw in ws:
+                    entry = stats.process(json_loads(raw))
+                    if entry is not None:
+                        on_entry(entry)
+                    if stats.messages % 256 == 0:
+                        await asyncio.sleep(0)  # buffered messages never yield; let the UI run
+        except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException) as e:
+            err_console.print(f"[bold yellow]Websocket disconnected ({e}); reconnecting in {backoff:.0f}s[/bold yellow]")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+async def run_monitor(args):
+    ws_url = args.ws_url or ws_url_for(rpc_client.url)
+    stats = LogStreamStats(recent=args.logs)
+    log_filter = {"mentions": [args.mentions]} if args.mentions else "all"
+    stop = asyncio.Event()
+
+    if args.headless:
+        out = open(args.output, "a") if args.output else sys.stdout
+        on_entry = lambda entry: out.write(json.dumps(entry) + "\n")
+    else:
+        on_entry = lambda entry: None
+
+    if args.metrics_port:
+        metrics.gauges.update({
+            "xolana_monitor_messages_total": ("counter", "Websocket messages received", lambda: stats.messages),
+            "xolana_monitor_transactions_total": ("counter", "Log notifications processed", lambda: stats.transactions),
+            "xolana_monitor_failed_total": ("counter", "Notifications for failed transactions", lambda: stats.failed),
+            "xolana_monitor_slot": ("gauge", "Slot of the latest notification", lambda: stats.slot),
+        })
+        metrics.serve(args.metrics_port)
+
+    stream = asyncio.create_task(stream_logs(ws_url, stats, on_entry, log_filter, args.commitment, stop))
+    try:
+        if args.headless:
+            await asyncio.wait_for(asyncio.shield(stream), args.duration) if args.duration else await stream
+        else:
+            deadline = time.monotonic() + args.duration if args.duration else None
+            with Live(render_monitor(stats, ws_url, args.top), console=console, auto_refresh=False, screen=True) as live:
+                while not stream.done() and (deadline is None or time.monotonic() < deadline):
+                    await asyncio.sleep(1.0 / args.fps)
+                    live.update(render_monitor(stats, ws_url, args.top), refresh=True)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        stop.set()
+        stream.cancel()
+        await asyncio.gather(stream, return_exceptions=True)
+        if args.headless:
+            out.flush()
+            if args.output:
+                out.close()
+
+    err_console.print(
+        f"[bright_green]Processed {stats.transactions} transactions ({stats.messages} messages) "
+        f"in {time.monotonic() - stats.started:.1f}s, {stats.rate():.1f} tx/s[/]"
+    )
+    return 0
+
+def monitor_command(args):
+    try:
+        return asyncio.run(run_monitor(args))
+    except KeyboardInterrupt:
+        return 0
+
+# Fixed-size ring buffer of numbers with summary statistics over its contents.
+# Memory and per-refresh cost stay flat however long a stream runs.
+class RollingWindow:
+    def __init__(self, size):
+        self.values = deque(maxlen=size)
+
+    def add(self, value):
+        self.values.append(value)
+
+    def latest(self):
+        return self.values[-1] if self.values else None
+
+    def summary(self):
+        if not self.values:
+            return {"latest": None, "mean": None, "p50": None, "p90": None, "max": None}
+        ordered = sorted(self.values)
+        return {
+            "latest": self.values[-1],
+            "mean": sum(ordered) / len(ordered),
+            "p50": ordered[(len(ordered) - 1) // 2],
+            "p90": ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))],
+            "max": ordered[-1],
+        }
+
+# Rolling network telemetry. TPS comes from getRecentPerformanceSamples (one
+# sample per minute per node); slot time, skipped slots and confirmation lag
+# come from slotSubscribe/rootSubscribe notifications as they arrive.
+class NetworkTelemetry:
+    def __init__(self, window=600, samples=60):
+        self.tps = RollingWindow(samples)
+        self.non_vote_tps = RollingWindow(samples)
+        self.sample_slot_time = RollingWindow(samples)  # seconds per slot, averaged by the node
+        self.slot_time = RollingWindow(window)  # seconds between consecutive slot notifications, per slot
+        self.skipped = RollingWindow(window)  # slots skipped before each new root
+        self.confirmation_lag = RollingWindow(window)  # seconds from a slot's notification to it being rooted
+        self.root_distance = RollingWindow(window)  # slots between the tip and the latest root
+        self.slot_seen = {}
+        self.slot_order = deque(maxlen=window * 2)
+        self.slot = None
+        self.root = None
+        self.last_slot_at = None
+        self.last_sample_slot = 0
+        self.notifications = 0
+        self.started = time.monotonic()
+
+    def add_samples(self, samples):
+        for sample in sorted(samples, key=lambda sample: sample['slot']):
+            period = sample.get('samplePeriodSecs') or 0
+            if sample['slot'] <= self.last_sample_slot or not period:
+                continue
+            self.last_sample_slot = sample['slot']
+            self.tps.add(sample['numTransactions'] / period)
+            if sample.get('numNonVoteTransactions') is not None:
+                self.non_vote_tps.add(sample['numNonVoteTransactions'] / period)
+            if sample.get('numSlots'):
+                self.sample_slot_time.add(period / sample['numSlots'])
+
+    def on_slot(self, slot, now):
+        self.notifications += 1
+        if self.slot is not None and slot <= self.slot:
+            return  # a fork switch or a repeat: time only new tips
+        if self.slot is not None and self.last_slot_at is not None:
+            self.slot_time.add((now - self.last_slot_at) / (slot - self.slot))
+        self.slot, self.last_slot_at = slot, now
+        if len(self.slot_order) == self.slot_order.maxlen:
+            self.slot_seen.pop(self.slot_order[0], None)
+        self.slot_order.append(slot)
+        self.slot_seen[slot] = now
+        if self.root is not None:
+            self.root_distance.add(slot - self.root)
+
+    def on_root(self, root, now):
+        self.notifications += 1
+        if self.root is not None and root <= self.root:
+            return
+        if self.root is not None:
+            self.skipped.add(root - self.root - 1)
+        self.root = root
+        seen = self.slot_seen.get(root)
+        if seen is not None:
+            self.confirmation_lag.add(now - seen)
+
+    # Forget the last slot time after a reconnect so the gap is not counted
+    def reset_stream(self):
+        self.last_slot_at = None
+
+    def skip_rate(self):
+        skipped = sum(self.skipped.values)
+        rooted = len(self.skipped.values)
+        return skipped / (skipped + rooted) if rooted else None
+
+    # Flat row for CSV/JSON export and the screen
+    def snapshot(self):
+        row = {"time": round(time.time(), 3), "slot": self.slot, "root": self.root}
+        for name, window, scale in (
+            ("tps", self.tps, 1),
+            ("non_vote_tps", self.non_vote_tps, 1),
+            ("slot_time_ms", self.slot_time, 1000),
+            ("confirmation_lag_s", self.confirmation_lag, 1),
+        ):
+            summary = window.summary()
+            for stat in ("latest", "mean", "p90"):
+                value = summary[stat]
+                row[f"{name}_{stat}"] = round(value * scale, 3) if value is not None else None
+        sample_slot_time = self.sample_slot_time.latest()
+        row["sample_slot_time_ms"] = round(sample_slot_time * 1000, 3) if sample_slot_time is not None else None
+        skip_rate = self.skip_rate()
+        row["skip_rate_pct"] = round(skip_rate * 100, 3) if skip_rate is not None else None
+        row["root_distance"] = self.root_distance.latest()
+        return row
+
+TELEMETRY_FIELDS = [
+    "time", "slot", "root",
+    *(f"{name}_{stat}" for name in ("tps", "non_vote_tps", "slot_time_ms", "confirmation_lag_s")
+      for stat in ("latest", "mean", "p90")),
+    "sample_slot_time_ms", "skip_rate_pct", "root_distance",
+]
+
+# One websocket carrying both slotSubscribe and rootSubscribe, reconnecting
+# with backoff like stream_logs
+async def stream_slots_and_roots(ws_url, telemetry, stop=None):
+    import websockets
+
+    backoff = 1.0
+    while stop is None or not stop.is_set():
+        try:
+            async with websockets.connect(ws_url, max_size=None, ping_interval=20, close_timeout=1) as ws:
+                await ws.send(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "slotSubscribe"}))
+                await ws.send(json.dumps({"jsonrpc": "2.0", "id": 2, "method": "rootSubscribe"}))
+                telemetry.reset_stream()
+                backoff = 1.0
+                async for raw in ws:
+                    message = json_loads(raw)
+                    method = message.get("method")
+                    if method == "slotNotification":
+                        telemetry.on_slot(message["params"]["result"]["slot"], time.monotonic())
+                    elif method == "rootNotification":
+                        telemetry.on_root(message["params"]["result"], time.monotonic())
+        except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException) as e:
+            err_console.print(f"[bold yellow]Websocket disconnected ({e}); reconnecting in {backoff:.0f}s[/bold yellow]")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+# Performance samples are produced once a minute; the first call backfills
+# `history` of them, later calls only fetch the newest few
+async def poll_performance_samples(telemetry, interval=15.0, history=60, stop=None):
+    limit = history
+    while stop is None or not stop.is_set():
+        try:
+            response_json = await asyncio.to_thread(rpc_client.request, "getRecentPerformanceSamples", [limit])
+            if 'result' in response_json:
+                telemetry.add_samples(response_json['result'])
+                limit = 2
+        except RpcTransportError as e:
+            err_console.print(f"[bold yellow]Performance samples unavailable: {e}[/bold yellow]")
+        await asyncio.sleep(interval)
+
+def render_telemetry(telemetry, ws_url):
+    header = (
+        f"[bright_green]Streaming slots and roots from {ws_url}[/]\n"
+        f"Slot: {telemetry.slot or 'N/A'}   Root: {telemetry.root or 'N/A'}   "
+        f"Running: {time.monotonic() - telemetry.started:.0f}s   Notifications: {telemetry.notifications}"
+    )
+    table = Table(box=box.ROUNDED, border_style="green", expand=True)
+    table.add_column("Metric", style="bold cyan")
+    for column in ("Latest", "Mean", "p50", "p90", "Max"):
+        table.add_column(column, justify="right")
+    table.add_column("Samples", justify="right", style="dim")
+    for label, window, fmt in (
+        ("TPS (all)", telemetry.tps, "{:,.0f}"),
+        ("TPS (non-vote)", telemetry.non_vote_tps, "{:,.0f}"),
+        ("Slot time (ms)", telemetry.slot_time, "{:,.0f}"),
+        ("Node slot time (ms)", telemetry.sample_slot_time, "{:,.0f}"),
+        ("Confirmation lag (s)", telemetry.confirmation_lag, "{:,.2f}"),
+        ("Root distance (slots)", telemetry.root_distance, "{:,.0f}"),
+        ("Skipped per root", telemetry.skipped, "{:,.2f}"),
+    ):
+        scale = 1000 if "(ms)" in label else 1
+        summary = window.summary()
+        table.add_row(label, *(fmt.format(summary[stat] * scale) if summary[stat] is not None else "-"
+                               for stat in ("latest", "mean", "p50", "p90", "max")), str(len(window.values)))
+    skip_rate = telemetry.skip_rate()
+    footer = f"Skip rate over window: {skip_rate * 100:.2f}%" if skip_rate is not None else "Skip rate over window: waiting for roots"
+    return Group(
+        Panel(header, title="Xolana Network Telemetry", border_style="bright_green"),
+        Panel(table, title="Rolling Windows", border_style="green"),
+        Panel(footer, border_style="green"),
+    )
+
+async def run_telemetry(args):
+    ws_url = args.ws_url or ws_url_for(rpc_client.url)
+    telemetry = NetworkTelemetry(window=args.window, samples=args.samples)
+    stop = asyncio.Event()
+
+    if args.metrics_port:
+        metrics.gauges.update({
+            "xolana_telemetry_slot": ("gauge", "Latest slot notified", lambda: telemetry.slot or 0),
+            "xolana_telemetry_root": ("gauge", "Latest root notified", lambda: telemetry.root or 0),
+            "xolana_telemetry_tps": ("gauge", "Transactions per second, latest performance sample", lambda: telemetry.tps.latest() or 0),
+            "xolana_telemetry_slot_time_seconds": ("gauge", "Mean slot time over the window", lambda: telemetry.slot_time.summary()["mean"] or 0),
+            "xolana_telemetry_skip_rate": ("gauge", "Skipped slot ratio over the window", lambda: telemetry.skip_rate() or 0),
+            "xolana_telemetry_confirmation_lag_seconds": ("gauge", "Mean slot-to-root lag over the window", lambda: telemetry.confirmation_lag.summary()["mean"] or 0),
+        })
+        metrics.serve(args.metrics_port)
+
+    out = writer = None
+    if args.export or args.headless:
+        new_file = not args.export or not os.path.exists(args.export) or os.path.getsize(args.export) == 0
+        out = open(args.export, "a", newline="") if args.export else sys.stdout
+        if not args.json:
+            writer = csv.DictWriter(out, fieldnames=TELEMETRY_FIELDS)
+            if new_file:
+                writer.writeheader()
+
+    def export_row():
+        if out is None:
+            return
+        row = telemetry.snapshot()
+        if writer:
+            writer.writerow(row)
+        else:
+            out.write(json.dumps(row) + "\n")
+        out.flush()
+
+    tasks = [
+        asyncio.create_task(stream_slots_and_roots(ws_url, telemetry, stop)),
+        asyncio.create_task(poll_performance_samples(telemetry, args.sample_interval, args.samples, stop)),
+    ]
+    deadline = time.monotonic() + args.duration if args.duration else None
+    next_export = time.monotonic() + args.interval
+    try:
+        if args.headless:
+            while deadline is None or time.monotonic() < deadline:
+                await asyncio.sleep(max(0.0, min(next_export, deadline or next_export) - time.monotonic()))
+                if time.monotonic() >= next_export:
+                    export_row()
+                    next_export += args.interval
+        else:
+            with Live(render_telemetry(telemetry, ws_url), console=console, auto_refresh=False, screen=True) as live:
+                while deadline is None or time.monotonic() < deadline:
+                    await asyncio.sleep(1.0 / args.fps)
+                    live.update(render_telemetry(telemetry, ws_url), refresh=True)
+                    if time.monotonic() >= next_export:
+                        export_row()
+                        next_export += args.interval
+    finally:
+        stop.set()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if args.export and out:
+            out.close()
+
+    snapshot = telemetry.snapshot()
+    if not args.headless:
+        console.print(render_telemetry(telemetry, ws_url))
+    err_console.print(
+        f"[bright_green]Telemetry ran {time.monotonic() - telemetry.started:.1f}s: "
+        f"{telemetry.notifications} notifications, {len(telemetry.tps.values)} performance samples[/]"
+    )
+    return 0 if snapshot["slot"] is not None else 1
+
+def telemetry_command(args):
+    try:
+        return asyncio.run(run_telemetry(args))
+    except KeyboardInterrupt:
+        return 0
 
 def main():
     splash_screen()
@@ -446,6 +4440,7 @@ def main():
     while True:
         display_menu()
         choice = Prompt.ask(f"[{dim_green_style}]Enter your choice[/]")
+        started = time.perf_counter()
 
         if choice == '1':
             check_balance(keypair=keypair)
@@ -461,7 +4456,7 @@ def main():
         elif choice == '6':
             gossip_nodes()
         elif choice == '7':
-            network_testing()
+            network_testing(keypair)
         elif choice == '8':
             network_details(keypair)  # Pass the keypair here
         elif choice == '9':
@@ -469,8 +4464,350 @@ def main():
             break
         else:
             console.print("[bold red]Invalid option. Please try again.[/bold red]")
+            continue
+        metrics.record_command(f"menu {choice}", time.perf_counter() - started)
+
+# Print one JSON document on stdout for scripted use
+def emit_json(data):
+    sys.stdout.write(json.dumps(data) + "\n")
+
+def load_command_keypair(args):
+    keypair_path = getattr(args, "keypair", None) or get_default_keypair_path()
+    keypair = load_keypair(keypair_path) if keypair_path else None
+    if not keypair:
+        raise RuntimeError("No keypair available (pass --keypair or configure solana-cli)")
+    return keypair
+
+def balance_command(args):
+    if args.addresses:
+        addresses = [str(Pubkey.from_string(address)) for address in args.addresses]
+    else:
+        addresses = [str(load_command_keypair(args).pubkey())]
+
+    if not args.json:
+        for address in addresses:
+            check_balance(address=address)
+        return 0
+
+    responses = rpc_client.batch([("getBalance", [address]) for address in addresses])
+    balances = []
+    for address, response_json in zip(addresses, responses):
+        if 'error' in response_json:
+            balances.append({"address": address, "error": response_json['error'].get('message')})
+            continue
+        lamports = response_json['result']['value']
+        balances.append({
+            "address": address,
+            "lamports": lamports,
+            "xsol": lamports_to_sol(lamports),
+            "slot": response_json['result']['context']['slot'],
+        })
+    emit_json(balances[0] if len(balances) == 1 else balances)
+    return 1 if any("error" in balance for balance in balances) else 0
+
+def send_command(args):
+    keypair = load_command_keypair(args)
+    recipient = Pubkey.from_string(args.recipient)
+    lamports = int(Decimal(args.amount) * LAMPORTS_PER_SOL)
+
+    blockhash, _ = BlockhashCache(rpc_client).get()
+    msg = build_transfer_message(keypair.pubkey(), [{"recipient": str(recipient), "lamports": lamports}], blockhash)
+    tx = VersionedTransaction(msg, [keypair])
+    signature = str(tx.signatures[0])
+    sent_at = time.monotonic()
+    result_json = send_raw_transaction(base64.b64encode(bytes(tx)).decode("ascii"))
+    if 'error' in result_json:
+        raise RuntimeError(f"Failed to send transaction: {result_json['error'].get('message')}")
+
+    result = {"signature": signature, "status": "sent", "slot": None, "err": None, "elapsed": None}
+    if not args.no_wait:
+        tracker = ConfirmationTracker(rpc_client, ws_url_for(rpc_client.url), commitment=args.commitment)
+        result.update(tracker.wait([signature], timeout=args.timeout, sent_at={signature: sent_at})[signature])
+        result.pop("source", None)
+
+    if args.json:
+        emit_json(dict(result, recipient=str(recipient), lamports=lamports))
+    else:
+        elapsed = f" in {result['elapsed']:.2f}s" if result["elapsed"] is not None else ""
+        console.print(Panel(
+            f"Sent {lamports_to_sol(lamports):.9f} xSOL to {recipient}\n"
+            f"Signature: {signature}\nStatus: {result['status']}{elapsed}",
+            border_style="green" if result["status"] in ("sent", args.commitment) else "red",
+        ))
+    return 0 if result["status"] in ("sent", args.commitment) else 1
+
+def tx_command(args):
+    use_cache = not (args.no_cache or args.no_rpc_cache)
+    if not args.json:
+        view_transaction_info(args.signature, encoding=args.encoding, use_cache=use_cache)
+        return 0
+    response_json = fetch_transaction(args.signature, use_cache=use_cache, encoding=args.encoding)
+    if response_json is None or response_json.get('result') is None:
+        emit_json({"signature": args.signature, "error": (response_json or {}).get('error', "not found")})
+        return 1
+    emit_json(response_json['result'])
+    return 0
+
+def gossip_command(args):
+    if args.sweep:
+        results, age, elapsed = gossip_sweep(concurrency=args.concurrency, timeout=args.timeout,
+                                             ttl=args.ttl, refresh=args.refresh)
+        if args.json:
+            emit_json(results)
+        else:
+            render_gossip_sweep(results, age, elapsed, limit=args.top)
+        return 0
+    if not args.json:
+        gossip_nodes(interactive=False)
+        return 0
+    response_json = rpc_client.request("getClusterNodes", [])
+    if 'result' not in response_json:
+        raise RuntimeError(f"Failed to retrieve gossip nodes. Response: {response_json}")
+    emit_json(response_json['result'])
+    return 0
+
+def endpoints_command(args):
+    summaries = rpc_client.check()
+    if args.save:
+        save_endpoints([summary["url"] for summary in summaries])
+        err_console.print(f"[bold green]Saved {len(summaries)} endpoint(s) to {RPC_ENDPOINTS_PATH}[/bold green]")
+    if args.json:
+        emit_json(summaries)
+        return 0
+
+    table = Table(title="RPC Endpoints (best first)", box=box.ROUNDED)
+    table.add_column("Endpoint", style="bold green")
+    table.add_column("Score", justify="right")
+    table.add_column("p50 ms", justify="right")
+    table.add_column("p95 ms", justify="right")
+    table.add_column("Errors", justify="right")
+    table.add_column("Slot", justify="right")
+    table.add_column("Lag", justify="right")
+    for summary in summaries:
+        table.add_row(
+            summary["url"],
+            f"{summary['score']:.3f}",
+            f"{summary['p50_ms']:.1f}" if summary["p50_ms"] is not None else "-",
+            f"{summary['p95_ms']:.1f}" if summary["p95_ms"] is not None else "-",
+            f"{summary['errors']}/{summary['requests']}",
+            str(summary["slot"]) if summary["slot"] is not None else "-",
+            str(summary["slot_lag"]),
+        )
+    console.print(Panel(table, title="Endpoint Pool", border_style="green"))
+    return 0 if any(summary["slot"] is not None for summary in summaries) else 1
+
+def add_json_flag(parser):
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of tables")
+
+def add_metrics_flag(parser):
+    parser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on 127.0.0.1:PORT/metrics")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="X1 Xolana wallet utility. Runs the interactive menu when no command is given.")
+    parser.add_argument("--url", action="append", help="JSON-RPC endpoint; repeat to pool several (default: endpoints file, else %s)" % RPC_URL)
+    parser.add_argument("--discover", action="store_true", help="Add RPC endpoints advertised in gossip to the pool")
+    parser.add_argument("--timings", action="store_true", help="Print startup and total time to stderr on exit")
+    parser.add_argument("--profile", action="store_true", help="Print a per-method RPC and command breakdown to stderr on exit")
+    parser.add_argument("--trace", metavar="FILE", help="Append every RPC call and command as a JSON line to FILE")
+    parser.add_argument("--no-cache", action="store_true", dest="no_rpc_cache",
+                        help="Always ask the node instead of reusing recent responses")
+    subparsers = parser.add_subparsers(dest="command")
+
+    balance = subparsers.add_parser("balance", help="Balance of one or more addresses")
+    balance.add_argument("addresses", nargs="*", help="Addresses (default: solana-cli keypair)")
+    balance.add_argument("--keypair", "-k", help="Keypair whose address to use when none is given")
+    add_json_flag(balance)
+    balance.set_defaults(func=balance_command)
+
+    send = subparsers.add_parser("send", help="Send xSOL and wait for confirmation")
+    send.add_argument("recipient", help="Recipient address")
+    send.add_argument("amount", help="Amount in xSOL")
+    send.add_argument("--keypair", "-k", help="Payer keypair file (default: solana-cli keypair)")
+    send.add_argument("--commitment", choices=COMMITMENT_LEVELS, default="confirmed", help="Commitment level to wait for")
+    send.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for confirmation")
+    send.add_argument("--no-wait", action="store_true", help="Return as soon as the transaction is sent")
+    add_json_flag(send)
+    send.set_defaults(func=send_command)
+
+    tx = subparsers.add_parser("tx", help="Transaction details")
+    tx.add_argument("signature", help="Transaction signature")
+    tx.add_argument("--no-cache", action="store_true", help="Bypass the local transaction cache")
+    tx.add_argument("--encoding", choices=["base64", "jsonParsed"], default=TX_ENCODING, help="Wire encoding (base64 is decoded locally)")
+    add_json_flag(tx)
+    tx.set_defaults(func=tx_command)
+
+    gossip = subparsers.add_parser("gossip", help="Cluster gossip nodes")
+    gossip.add_argument("--sweep", action="store_true", help="Probe every node's gossip, TPU and RPC endpoints")
+    gossip.add_argument("--concurrency", "-c", type=int, default=512, help="Sweep: sockets open at once")
+    gossip.add_argument("--timeout", type=float, default=2.0, help="Sweep: seconds per probe")
+    gossip.add_argument("--ttl", type=float, default=GOSSIP_SWEEP_TTL, help="Sweep: reuse results younger than this many seconds")
+    gossip.add_argument("--refresh", action="store_true", help="Sweep: ignore cached results")
+    gossip.add_argument("--top", type=int, help="Sweep: only show the N fastest nodes")
+    add_json_flag(gossip)
+    gossip.set_defaults(func=gossip_command)
+
+    scan = subparsers.add_parser("scan", help="Bulk balance scan of many addresses")
+    scan.add_argument("file", nargs="?", default="-", help="File with one address per line ('-' for stdin)")
+    scan.add_argument("--format", choices=["csv", "jsonl"], default="csv", help="Output format")
+    scan.add_argument("--output", "-o", help="Write results to this file instead of stdout")
+    scan.add_argument("--concurrency", "-c", type=int, default=8, help="Max getMultipleAccounts calls in flight")
+    scan.set_defaults(func=bulk_scan_command)
+
+    payout = subparsers.add_parser("payout", help="Send many transfers from a recipient,amount list")
+    payout.add_argument("file", help="CSV file with 'recipient,amount' rows (amount in xSOL)")
+    payout.add_argument("--keypair", "-k", help="Payer keypair file (default: solana-cli keypair)")
+    payout.add_argument("--journal", help="Resumable journal path (default: <file>.journal)")
+    payout.add_argument("--inflight", type=int, default=16, help="Max unconfirmed transactions in flight")
+    payout.add_argument("--skip-preflight", action="store_true", help="Skip preflight simulation when sending")
+    payout.add_argument("--skip-invalid", action="store_true", help="Pay valid rows even if some rows are invalid")
+    payout.add_argument("--dry-run", action="store_true", help="Only show how the payouts would be batched")
+    payout.set_defaults(func=payout_command)
+
+    confirm = subparsers.add_parser("confirm", help="Wait for signatures to confirm and report time-to-confirm")
+    confirm.add_argument("signatures", nargs="+", help="Transaction signatures to watch")
+    confirm.add_argument("--commitment", choices=COMMITMENT_LEVELS, default="confirmed", help="Commitment level to wait for")
+    confirm.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait before giving up")
+    add_json_flag(confirm)
+    confirm.set_defaults(func=confirm_command)
+
+    stake = subparsers.add_parser("stake", help="List stake accounts and run bulk stake operations")
+    stake.add_argument("action", choices=["list", *STAKE_PLANNERS], help="What to do")
+    stake.add_argument("accounts", nargs="*", help="Stake accounts to operate on (split: the source account)")
+    stake.add_argument("--all", action="store_true", help="Operate on every stake account the action applies to")
+    stake.add_argument("--validator", "-v", action="append", metavar="VOTE[:WEIGHT]", help="Target vote account; repeat to spread stake by weight (deactivate: only stake with these)")
+    stake.add_argument("--amount", help="xSOL per new account (create, split) or per withdrawal (default: whole balance)")
+    stake.add_argument("--count", type=int, default=1, help="Create/split: number of new stake accounts")
+    stake.add_argument("--to", help="Withdraw: recipient (default: the authority)")
+    stake.add_argument("--authority", help="List: staker or withdrawer to look up (default: solana-cli keypair)")
+    stake.add_argument("--keypair", "-k", help="Stake authority and fee payer keypair (default: solana-cli keypair)")
+    stake.add_argument("--inflight", type=int, default=16, help="Max unconfirmed transactions in flight")
+    stake.add_argument("--skip-preflight", action="store_true", help="Skip preflight simulation when sending")
+    stake.add_argument("--dry-run", action="store_true", help="Only show the planned operations")
+    add_json_flag(stake)
+    stake.set_defaults(func=stake_command)
+
+    monitor = subparsers.add_parser("monitor", help="Live transaction monitor over logsSubscribe")
+    monitor.add_argument("--ws-url", help="Websocket endpoint (default: derived from --url)")
+    monitor.add_argument("--mentions", help="Only stream transactions that mention this program/account")
+    monitor.add_argument("--commitment", choices=COMMITMENT_LEVELS, default="confirmed", help="Commitment level to subscribe at")
+    monitor.add_argument("--fps", type=float, default=4.0, help="Screen refreshes per second")
+    monitor.add_argument("--top", type=int, default=10, help="Number of programs to show")
+    monitor.add_argument("--logs", type=int, default=15, help="Number of recent transactions to keep on screen")
+    monitor.add_argument("--headless", action="store_true", help="No screen; write one JSON line per transaction")
+    monitor.add_argument("--output", "-o", help="JSONL output file for --headless (default: stdout)")
+    monitor.add_argument("--duration", type=float, help="Stop after this many seconds")
+    add_metrics_flag(monitor)
+    monitor.set_defaults(func=monitor_command)
+
+    telemetry = subparsers.add_parser("telemetry", help="Rolling TPS, slot time, skipped slots and confirmation lag")
+    telemetry.add_argument("--ws-url", help="Websocket endpoint (default: derived from --url)")
+    telemetry.add_argument("--window", type=int, default=600, help="Slots and roots kept in each rolling window")
+    telemetry.add_argument("--samples", type=int, default=60, help="Performance samples (one per minute) kept for TPS")
+    telemetry.add_argument("--sample-interval", type=float, default=15.0, help="Seconds between performance sample polls")
+    telemetry.add_argument("--interval", type=float, default=10.0, help="Seconds between exported rows")
+    telemetry.add_argument("--export", "-o", help="Append one CSV row (JSON line with --json) per interval to this file")
+    telemetry.add_argument("--headless", action="store_true", help="No screen; write rows to --export or stdout")
+    telemetry.add_argument("--fps", type=float, default=2.0, help="Screen refreshes per second")
+    telemetry.add_argument("--duration", type=float, help="Stop after this many seconds")
+    telemetry.add_argument("--json", action="store_true", help="Export JSON lines instead of CSV")
+    add_metrics_flag(telemetry)
+    telemetry.set_defaults(func=telemetry_command)
+
+    txcache = subparsers.add_parser("txcache", help="Manage the local cache of finalized transactions")
+    txcache.add_argument("action", choices=["stats", "prefetch", "clear"], help="What to do")
+    txcache.add_argument("file", nargs="?", help="For prefetch: file with one signature per line ('-' for stdin)")
+    txcache.add_argument("--concurrency", "-c", type=int, default=4, help="Prefetch batches in flight")
+    txcache.add_argument("--max-mb", type=int, help="Size bound for the cache in MB (LRU eviction beyond it)")
+    txcache.add_argument("--encoding", choices=["base64", "jsonParsed"], default=TX_ENCODING, help="Prefetch: wire encoding to fetch and store")
+    txcache.set_defaults(func=txcache_command)
+
+    history = subparsers.add_parser("history", help="Sync address history into a local index and query it")
+    history.add_argument("action", choices=["sync", "query"], help="Sync from the network or query the local index")
+    history.add_argument("addresses", nargs="*", help="Addresses to sync or query")
+    history.add_argument("--file", "-f", help="File with one address per line")
+    history.add_argument("--concurrency", "-c", type=int, default=8, help="Addresses synced in parallel")
+    history.add_argument("--from-slot", type=int, help="Query: lowest slot to include")
+    history.add_argument("--to-slot", type=int, help="Query: highest slot to include")
+    history.add_argument("--last", type=int, help="Query: only the newest N entries per address")
+    history.add_argument("--json", action="store_true", help="Query: print JSON instead of a table")
+    history.set_defaults(func=history_command)
+
+    validators = subparsers.add_parser("validators", help="Validator analytics: rankings, stake share, credits, skip rate")
+    validators.add_argument("--sort", choices=ValidatorAnalytics.SORT_KEYS, default="stake", help="Ranking column")
+    validators.add_argument("--ascending", action="store_true", help="Sort ascending instead of descending")
+    validators.add_argument("--top", type=int, help="Only show the first N validators")
+    validators.add_argument("--include-delinquent", action="store_true", help="Include delinquent vote accounts")
+    validators.add_argument("--min-stake", type=float, help="Minimum activated stake in xSOL")
+    validators.add_argument("--max-commission", type=int, help="Maximum commission in percent")
+    validators.add_argument("--epoch", type=int, help="Analyze a stored epoch snapshot instead of fetching")
+    validators.add_argument("--compare", type=int, help="Show stake change against a stored epoch snapshot")
+    validators.add_argument("--export", help="Write the selected rows to a .csv or .json file")
+    add_json_flag(validators)
+    validators.set_defaults(func=validators_command)
+
+    probe = subparsers.add_parser("probe", aliases=["ping"], help="Concurrent latency probes with p50/p90/p99/max")
+    probe.add_argument("--mode", choices=["rpc", "tx", "ws"], default="rpc", help="RPC round trip, transaction confirmation or websocket lag")
+    probe.add_argument("--method", action="append", help="RPC method(s) for --mode rpc (default: getSlot and getHealth)")
+    probe.add_argument("--count", "-n", type=int, default=50, help="Probes per mode/method")
+    probe.add_argument("--concurrency", "-c", type=int, default=4, help="Probes in flight at once")
+    probe.add_argument("--rate", type=float, help="Target probes per second (default: as fast as concurrency allows)")
+    probe.add_argument("--duration", type=float, help="Stop issuing probes after this many seconds")
+    probe.add_argument("--commitment", choices=COMMITMENT_LEVELS, default="confirmed", help="Commitment for --mode tx")
+    probe.add_argument("--keypair", "-k", help="Fee payer for --mode tx (default: solana-cli keypair)")
+    probe.add_argument("--export", help="Append results as JSON lines to this file")
+    add_json_flag(probe)
+    probe.set_defaults(func=probe_command)
+
+    endpoints = subparsers.add_parser("endpoints", help="Health scores of the RPC endpoint pool")
+    endpoints.add_argument("--save", action="store_true", help="Write the pool, best first, to %s" % RPC_ENDPOINTS_PATH)
+    add_json_flag(endpoints)
+    endpoints.set_defaults(func=endpoints_command)
+
+    details = subparsers.add_parser("details", help="Network and wallet dashboard")
+    details.add_argument("--address", help="Wallet address to show (default: solana-cli keypair)")
+    details.add_argument("--no-wallet", action="store_true", help="Skip the wallet balance")
+    details.add_argument("--watch", type=float, help="Auto-refresh every N seconds, re-polling only fields that are due")
+    add_json_flag(details)
+    add_metrics_flag(details)
+    details.set_defaults(func=details_command)
+
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
+    args = parse_args()
+    if args.trace:
+        metrics.open_trace(args.trace)
+    if args.url:
+        rpc_client.set_endpoints(args.url)
+    if args.no_rpc_cache:
+        rpc_client.cache.enabled = False
+    if args.discover:
+        try:
+            rpc_client.discover()
+        except RpcTransportError as e:
+            err_console.print(f"[bold red]Endpoint discovery failed: {e}[/bold red]")
+    if args.command:
+        status = 1
+        started, error = time.perf_counter(), None
+        try:
+            status = args.func(args)
+        except KeyboardInterrupt:
+            status, error = 130, "KeyboardInterrupt"
+        except Exception as e:
+            error = type(e).__name__
+            err_console.print(f"[bold red]Error: {e}[/bold red]")
+        metrics.record_command(args.command, time.perf_counter() - started, error)
+        if args.profile:
+            metrics.render_profile()
+        metrics.close()
+        if args.timings:
+            first_rpc = rpc_client.first_request_at
+            sys.stderr.write(
+                f"startup: {((first_rpc or time.perf_counter()) - _START_TIME) * 1000:.1f} ms before first RPC call, "
+                f"total: {(time.perf_counter() - _START_TIME) * 1000:.1f} ms (after interpreter start)\n"
+            )
+        sys.exit(status)
+
     try:
         main()
     except KeyboardInterrupt:
@@ -480,3 +4817,6 @@ if __name__ == "__main__":
         console.print("[bold yellow]Please report this issue to the developers.[/bold yellow]")
     finally:
         console.print("[bold green]Thank you for using X1:Xolana Wallet Manager![/bold green]")
+        if args.profile:
+            metrics.render_profile()
+        metrics.close()
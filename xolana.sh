@@ -13,6 +13,7 @@ NC='\033[0m'
 
 XOLANA_CONFIG_DIR="$HOME/.config/xolana"
 RPC_URL="http://xolana.xen.network:8899"
+RPC_ENDPOINTS_FILE="$XOLANA_CONFIG_DIR/endpoints.txt"  # Shared with xolana.py, best endpoint first
 LOG_FILE="$XOLANA_CONFIG_DIR/xolana_wallet_tool.log"
 
 mkdir -p "$XOLANA_CONFIG_DIR"
@@ -600,11 +601,14 @@ function handle_error() {
     read -p "$(echo -e "${GRAY}Press Enter to continue...${NC}")"
 }
 
+# Runs a solana CLI command and logs how long it took, so slow calls show up in the log
 function run_solana_command() {
     local command="$1"
     shift
+    local started=$(date +%s%N)
     output=$(${command} "$@" 2>&1)
     exit_code=$?
+    log "timing: ${command} $1 took $(( ($(date +%s%N) - started) / 1000000 )) ms (exit $exit_code)"
     if [ $exit_code -ne 0 ]; then
         handle_error "Failed to execute: $command $*\nError: $output"
         return $exit_code
@@ -618,8 +622,6 @@ function check_solana_cli() {
         echo -e "${CYAN}Visit https://docs.solana.com/cli/install-solana-cli-tools for installation instructions.${NC}"
         exit 1
     fi
-
-    ensure_xolana_testnet
 }
 
 function ensure_xolana_testnet() {
@@ -633,11 +635,29 @@ function ensure_xolana_testnet() {
     fi
 }
 
+# Use the first reachable endpoint from the pool file, falling back to the default
 function verify_connection() {
-    if ! solana cluster-version --url "$RPC_URL" &> /dev/null; then
-        echo -e "${RED}Unable to connect to Xolana X1 network. Please check your internet connection and try again.${NC}"
-        exit 1
+    local candidates=()
+    if [ -f "$RPC_ENDPOINTS_FILE" ]; then
+        while read -r url; do
+            url="${url%%#*}"
+            url="${url// /}"
+            [ -n "$url" ] && candidates+=("$url")
+        done < "$RPC_ENDPOINTS_FILE"
     fi
+    candidates+=("$RPC_URL")
+
+    for url in "${candidates[@]}"; do
+        if timeout 5 solana cluster-version --url "$url" &> /dev/null; then
+            RPC_URL="$url"
+            log "Using RPC endpoint $RPC_URL"
+            return 0
+        fi
+        echo -e "${YELLOW}RPC endpoint $url is not responding, trying the next one...${NC}"
+    done
+
+    echo -e "${RED}Unable to connect to Xolana X1 network. Please check your internet connection and try again.${NC}"
+    exit 1
 }
 
 function validate_address() {
@@ -660,6 +680,7 @@ function validate_amount() {
 
 check_solana_cli
 verify_connection
+ensure_xolana_testnet
 echo -e "${LIGHT_BLUE}"
 cat << "EOF"
                                            